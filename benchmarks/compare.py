@@ -0,0 +1,86 @@
+"""
+compare.py
+-------------
+Compare a benchmark results file against a baseline and fail on regressions.
+
+Usage:
+    python -m benchmarks.compare baseline.json current.json --threshold 0.15
+
+A stage regresses when its best wall time grows by more than ``--threshold``
+(relative) or, when both files carry memory figures, its peak memory grows by
+more than ``--memory-threshold``. The exit status is 1 if anything regressed.
+
+Author: Jobet Casquejo
+"""
+
+import argparse
+import json
+import sys
+
+
+def load_results(path: str) -> dict:
+    """
+    Load a results file into a ``{(stage, size): result}`` mapping.
+    """
+    with open(path, encoding="utf-8") as f:
+        document = json.load(f)
+    return {(result["stage"], result["size"]): result for result in document["results"]}
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.15, memory_threshold: float = 0.25) -> list:
+    """
+    Return one row per benchmark present in both mappings.
+
+    Each row is a dict with the stage, size, time and memory ratios (current / baseline)
+    and a ``regressed`` flag.
+    """
+    rows = []
+    for key in sorted(baseline.keys() & current.keys(), key=lambda item: (item[0], item[1])):
+        before, after = baseline[key], current[key]
+        time_ratio = after["seconds"] / before["seconds"] if before["seconds"] else None
+        memory_ratio = None
+        if before.get("peak_memory_bytes") and after.get("peak_memory_bytes"):
+            memory_ratio = after["peak_memory_bytes"] / before["peak_memory_bytes"]
+        regressed = (time_ratio is not None and time_ratio > 1 + threshold) or (
+            memory_ratio is not None and memory_ratio > 1 + memory_threshold
+        )
+        rows.append({
+            "stage": key[0],
+            "size": key[1],
+            "time_ratio": time_ratio,
+            "memory_ratio": memory_ratio,
+            "regressed": regressed,
+        })
+    return rows
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare benchmark results against a baseline.")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.15, help="Allowed relative slowdown (0.15 = 15%%)")
+    parser.add_argument("--memory-threshold", type=float, default=0.25, help="Allowed relative peak-memory growth")
+    args = parser.parse_args(argv)
+
+    baseline = load_results(args.baseline)
+    current = load_results(args.current)
+    rows = compare(baseline, current, args.threshold, args.memory_threshold)
+
+    for row in rows:
+        timing = f"{row['time_ratio']:.2f}x" if row["time_ratio"] is not None else "n/a"
+        memory = f"{row['memory_ratio']:.2f}x" if row["memory_ratio"] is not None else "n/a"
+        status = "REGRESSED" if row["regressed"] else "ok"
+        print(f"{row['stage']:<28} {row['size']:>10,}  time {timing:>6}  memory {memory:>6}  {status}")
+    missing = sorted(baseline.keys() - current.keys())
+    if missing:
+        print(f"Missing from current results: {missing}")
+
+    regressions = [row for row in rows if row["regressed"]]
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed beyond the threshold")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""
+generators.py
+-------------
+Seeded generators of realistic nested JSON records and XML documents for the
+benchmark suite.
+
+Every generator takes a ``seed`` and produces exactly the same data for the
+same arguments, so benchmark runs are comparable across machines and commits.
+Files are written incrementally, so even 10M-record inputs never have to be
+held in memory.
+
+Author: Jobet Casquejo
+"""
+
+import json
+import random
+from typing import Iterator
+from xml.sax.saxutils import escape, quoteattr
+
+WORDS = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliet"]
+COUNTRIES = ["PH", "US", "JP", "DE", "BR", "IN", "AU", "CA"]
+
+
+def _value(rng: random.Random, kind: int, null_rate: float):
+    if null_rate and rng.random() < null_rate:
+        return None
+    kind %= 6
+    if kind == 0:
+        return rng.randrange(1_000_000)
+    if kind == 1:
+        return round(rng.uniform(0, 10_000), 2)
+    if kind == 2:
+        return f"{rng.choice(WORDS)}-{rng.randrange(10_000)}"
+    if kind == 3:
+        return rng.random() < 0.5
+    if kind == 4:
+        return f"20{rng.randrange(10, 25)}-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d}"
+    return [rng.randrange(100) for _ in range(rng.randrange(4))]
+
+
+def _nested(rng: random.Random, depth: int, fields: int, null_rate: float) -> dict:
+    node = {f"attr_{i}": _value(rng, i, null_rate) for i in range(fields)}
+    if depth > 1:
+        node["child"] = _nested(rng, depth - 1, fields, null_rate)
+    return node
+
+
+def generate_records(
+    count: int,
+    seed: int = 0,
+    depth: int = 2,
+    fields: int = 8,
+    key_variability: float = 0.1,
+    null_rate: float = 0.05,
+) -> Iterator[dict]:
+    """
+    Yield ``count`` nested JSON records.
+
+    Args:
+        count (int): Number of records.
+        seed (int): Random seed.
+        depth (int): Nesting depth of the ``details`` sub-object (0 = flat records).
+        fields (int): Scalar fields per record and per nested level.
+        key_variability (float): Probability that a field is missing from a record, and that
+            a record carries one extra key from a pool of 50, so key sets differ between records.
+        null_rate (float): Probability that a value is null.
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        record = {"id": i, "country": rng.choice(COUNTRIES)}
+        for field in range(fields):
+            if key_variability and rng.random() < key_variability:
+                continue
+            record[f"field_{field}"] = _value(rng, field, null_rate)
+        if key_variability and rng.random() < key_variability:
+            record[f"extra_{rng.randrange(50)}"] = _value(rng, rng.randrange(6), null_rate)
+        if depth > 0:
+            record["details"] = _nested(rng, depth, max(1, fields // 2), null_rate)
+        yield record
+
+
+def write_json_file(path: str, count: int, seed: int = 0, **options) -> str:
+    """
+    Write ``generate_records(count, seed, **options)`` as one top-level JSON array.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("[")
+        for i, record in enumerate(generate_records(count, seed, **options)):
+            if i:
+                f.write(",\n")
+            f.write(json.dumps(record))
+        f.write("]\n")
+    return path
+
+
+def write_ndjson_file(path: str, count: int, seed: int = 0, **options) -> str:
+    """
+    Write ``generate_records(count, seed, **options)`` as newline-delimited JSON.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        for record in generate_records(count, seed, **options):
+            f.write(json.dumps(record))
+            f.write("\n")
+    return path
+
+
+def write_xml_file(
+    path: str,
+    count: int,
+    seed: int = 0,
+    record_tag: str = "record",
+    attributes: int = 2,
+    children: int = 8,
+    child_variability: float = 0.1,
+) -> str:
+    """
+    Write an XML document with ``count`` record elements under one root.
+
+    Args:
+        path (str): Output file path.
+        count (int): Number of record elements.
+        seed (int): Random seed.
+        record_tag (str): Tag of each record element.
+        attributes (int): Attributes per record element.
+        children (int): Child elements per record.
+        child_variability (float): Probability that a child element is left out.
+    """
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?>\n<records>\n')
+        for i in range(count):
+            attrs = "".join(f" a{n}={quoteattr(str(_value(rng, n, 0)))}" for n in range(attributes))
+            f.write(f"<{record_tag} id=\"{i}\"{attrs}>")
+            for child in range(children):
+                if child_variability and rng.random() < child_variability:
+                    continue
+                value = _value(rng, child, 0.05)
+                text = "" if value is None else escape(str(value))
+                f.write(f"<field_{child}>{text}</field_{child}>")
+            f.write(f"</{record_tag}>\n")
+        f.write("</records>\n")
+    return path
@@ -0,0 +1,424 @@
+"""
+run.py
+-------------
+Run the end-to-end stage benchmarks and write a machine-readable results file.
+
+Usage:
+    python -m benchmarks.run --sizes 1000,100000 --output benchmarks/baseline.json
+    python -m benchmarks.compare benchmarks/baseline.json benchmarks/current.json
+
+Every stage is run on seeded synthetic data at each requested size. Results
+record the best wall time over ``--repeat`` runs, throughput in rows per
+second and, unless ``--no-memory`` is given, the peak traced Python memory of
+one extra run. Stages named ``stage[backend]`` repeat a JSON stage with each
+installed decoder backend (see src/decoders.py) to show the per-backend speedup.
+
+Author: Jobet Casquejo
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from benchmarks.generators import generate_records, write_json_file, write_ndjson_file, write_xml_file
+from src.exporter import bulk_export_to_sql, export_chunks_to_csv, export_to_csv, export_to_excel, export_to_parquet
+from src.decoders import available_decoders, decoder_name
+from src.logger import configure_logging
+from src.parser import iter_json_records, iter_ndjson_records, load_json_file
+from src.transformer import (
+    JsonFlattener,
+    arithmetic,
+    flatten_json,
+    json_file_to_dataframe,
+    json_to_dataframe,
+    ndjson_to_dataframe,
+    regex_replace,
+    to_numeric,
+    transform_dataframe,
+    xml_to_dataframe,
+)
+from src.validator import validate_dataframe, validate_rows
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+STAGES = {}
+
+
+def stage(name: str):
+    """
+    Register a benchmark. The decorated function receives a BenchmarkContext and
+    returns the zero-argument callable that is timed.
+    """
+    def register(setup):
+        STAGES[name] = setup
+        return setup
+
+    return register
+
+
+class BenchmarkContext:
+    """
+    Lazily generated, cached inputs for one benchmark size.
+    """
+
+    def __init__(self, size: int, seed: int, workdir: str, options: dict):
+        self.size = size
+        self.seed = seed
+        self.workdir = workdir
+        self.options = options
+        self._records = None
+        self._frame = None
+        self._json_path = None
+        self._ndjson_path = None
+        self._xml_path = None
+
+    def records(self) -> list:
+        if self._records is None:
+            self._records = list(generate_records(self.size, self.seed, **self.options))
+        return self._records
+
+    def frame(self) -> pd.DataFrame:
+        if self._frame is None:
+            self._frame = json_to_dataframe(self.records())
+        return self._frame.copy()
+
+    def json_path(self) -> str:
+        if self._json_path is None:
+            self._json_path = write_json_file(
+                os.path.join(self.workdir, f"records_{self.size}.json"), self.size, self.seed, **self.options
+            )
+        return self._json_path
+
+    def ndjson_path(self) -> str:
+        if self._ndjson_path is None:
+            self._ndjson_path = write_ndjson_file(
+                os.path.join(self.workdir, f"records_{self.size}.ndjson"), self.size, self.seed, **self.options
+            )
+        return self._ndjson_path
+
+    def xml_path(self) -> str:
+        if self._xml_path is None:
+            self._xml_path = write_xml_file(os.path.join(self.workdir, f"records_{self.size}.xml"), self.size, self.seed)
+        return self._xml_path
+
+    def output_path(self, name: str) -> str:
+        return os.path.join(self.workdir, "out", name)
+
+
+# -------------------------
+# Parsing and flattening
+# -------------------------
+@stage("load_json_file")
+def bench_load_json_file(ctx):
+    path = ctx.json_path()
+    return lambda: load_json_file(path, safe=False)
+
+
+@stage("iter_json_records")
+def bench_iter_json_records(ctx):
+    path = ctx.json_path()
+    return lambda: sum(len(batch) for batch in iter_json_records(path, chunk_size=10_000, safe=False))
+
+
+@stage("flatten_json")
+def bench_flatten_json(ctx):
+    records = ctx.records()
+    return lambda: [flatten_json(record) for record in records]
+
+
+@stage("json_flattener")
+def bench_json_flattener(ctx):
+    records = ctx.records()
+    return lambda: list(map(JsonFlattener(), records))
+
+
+@stage("json_to_dataframe")
+def bench_json_to_dataframe(ctx):
+    records = ctx.records()
+    return lambda: json_to_dataframe(records)
+
+
+@stage("json_file_to_dataframe")
+def bench_json_file_to_dataframe(ctx):
+    path = ctx.json_path()
+    return lambda: json_file_to_dataframe(path)
+
+
+@stage("iter_ndjson_records")
+def bench_iter_ndjson_records(ctx):
+    path = ctx.ndjson_path()
+    return lambda: sum(len(batch) for batch in iter_ndjson_records(path, chunk_size=10_000, safe=False))
+
+
+@stage("ndjson_to_dataframe")
+def bench_ndjson_to_dataframe(ctx):
+    path = ctx.ndjson_path()
+    return lambda: ndjson_to_dataframe(path)
+
+
+@stage("ndjson_to_dataframe_parallel")
+def bench_ndjson_to_dataframe_parallel(ctx):
+    path = ctx.ndjson_path()
+    workers = min(4, os.cpu_count() or 1)
+    chunk_bytes = max(1, os.path.getsize(path) // (workers * 2))
+    return lambda: ndjson_to_dataframe(path, workers=workers, chunk_bytes=chunk_bytes)
+
+
+@stage("xml_to_dataframe")
+def bench_xml_to_dataframe(ctx):
+    path = ctx.xml_path()
+    return lambda: xml_to_dataframe(path, "record")
+
+
+@stage("xml_to_dataframe_streaming")
+def bench_xml_to_dataframe_streaming(ctx):
+    path = ctx.xml_path()
+    return lambda: xml_to_dataframe(path, "record", streaming=True)
+
+
+def _register_decoder_stages(backend: str) -> None:
+    @stage(f"load_json_file[{backend}]")
+    def bench_load_json_file_with(ctx):
+        path = ctx.json_path()
+        return lambda: load_json_file(path, safe=False, decoder=backend)
+
+    @stage(f"iter_ndjson_records[{backend}]")
+    def bench_iter_ndjson_records_with(ctx):
+        path = ctx.ndjson_path()
+        return lambda: sum(
+            len(batch) for batch in iter_ndjson_records(path, chunk_size=10_000, safe=False, decoder=backend)
+        )
+
+
+for _backend in available_decoders():
+    _register_decoder_stages(_backend)
+
+
+# -------------------------
+# Transformation and validation
+# -------------------------
+@stage("transform_vectorized")
+def bench_transform_vectorized(ctx):
+    df = ctx.frame()
+    transformations = {
+        "field_1": arithmetic("*", 100),
+        "field_2": ["str.upper", regex_replace(r"-\d+$", "")],
+        "field_0": to_numeric(errors="coerce"),
+    }
+    return lambda: transform_dataframe(df.copy(), transformations)
+
+
+@stage("transform_apply")
+def bench_transform_apply(ctx):
+    df = ctx.frame()
+    transformations = {
+        "field_1": lambda value: value * 100,
+        "field_2": lambda value: value.upper() if isinstance(value, str) else value,
+    }
+    return lambda: transform_dataframe(df.copy(), transformations)
+
+
+@stage("validate_dataframe")
+def bench_validate_dataframe(ctx):
+    df = ctx.frame()
+    return lambda: validate_dataframe(df.copy(), required_fields=["id", "country"], field_types={"id": int})
+
+
+@stage("validate_rows")
+def bench_validate_rows(ctx):
+    df = ctx.frame()
+    return lambda: validate_rows(
+        df,
+        required_fields=["id"],
+        field_types={"id": int, "field_1": float},
+        ranges={"field_1": (0, 5_000)},
+        patterns={"country": r"[A-Z]{2}"},
+        unique=["id"],
+    )
+
+
+# -------------------------
+# Export
+# -------------------------
+@stage("export_to_csv")
+def bench_export_to_csv(ctx):
+    df = ctx.frame()
+    return lambda: export_to_csv(df, ctx.output_path("out.csv"))
+
+
+@stage("export_chunks_to_csv_gzip")
+def bench_export_chunks_to_csv_gzip(ctx):
+    df = ctx.frame()
+    chunk = 50_000
+    return lambda: export_chunks_to_csv(
+        (df.iloc[start:start + chunk] for start in range(0, len(df), chunk)), ctx.output_path("out.csv.gz")
+    )
+
+
+@stage("export_to_parquet")
+def bench_export_to_parquet(ctx):
+    df = ctx.frame()
+    # Arrow holds one type per column, so the generated extra_* keys that mix
+    # lists, strings and bools within a column are stored as strings.
+    mixed = [col for col in df.columns if df[col].dtype == object and df[col].dropna().map(type).nunique() > 1]
+    df = df.astype({col: str for col in mixed}).where(df.notna(), None)
+    # Streamed in chunks, so sparse columns that are all-NaN in early chunks widen later.
+    chunk_size = max(1, len(df) // 10)
+
+    def run():
+        chunks = (df.iloc[start:start + chunk_size] for start in range(0, len(df), chunk_size))
+        return export_to_parquet(chunks, ctx.output_path("out.parquet"))
+
+    return run
+
+
+@stage("export_to_excel_write_only")
+def bench_export_to_excel_write_only(ctx):
+    df = ctx.frame().astype(str)
+    return lambda: export_to_excel(df, ctx.output_path("out.xlsx"), write_only=True)
+
+
+@stage("bulk_export_to_sql")
+def bench_bulk_export_to_sql(ctx):
+    df = ctx.frame().astype(str)
+    db_path = ctx.output_path("bench.db")
+
+    def run():
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        connection = sqlite3.connect(db_path)
+        try:
+            return bulk_export_to_sql(df, connection, "records", batch_size=50_000)
+        finally:
+            connection.close()
+
+    return run
+
+
+# -------------------------
+# Runner
+# -------------------------
+def measure(func, repeat: int, memory: bool) -> dict:
+    """
+    Time ``func`` ``repeat`` times (best run wins) and optionally trace its peak memory.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {"seconds": best, "peak_memory_bytes": peak}
+
+
+def run_benchmarks(
+    sizes: list,
+    stages: list = None,
+    repeat: int = 3,
+    seed: int = 42,
+    memory: bool = True,
+    options: dict = None,
+) -> dict:
+    """
+    Run the selected stages at every size and return the results document.
+    """
+    stages = stages or list(STAGES)
+    unknown = [name for name in stages if name not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown benchmark stages: {unknown}")
+
+    results = []
+    workdir = tempfile.mkdtemp(prefix="transformer-bench-")
+    try:
+        for size in sizes:
+            ctx = BenchmarkContext(size, seed, workdir, options or {})
+            os.makedirs(ctx.output_path(""), exist_ok=True)
+            for name in stages:
+                func = STAGES[name](ctx)
+                measured = measure(func, repeat, memory)
+                seconds = measured["seconds"]
+                results.append({
+                    "stage": name,
+                    "size": size,
+                    "seconds": round(seconds, 6),
+                    "rows_per_second": round(size / seconds, 1) if seconds else None,
+                    "peak_memory_bytes": measured["peak_memory_bytes"],
+                })
+                print(f"{name:<28} {size:>10,} rows  {seconds:9.4f}s  {size / seconds:14,.0f} rows/s", flush=True)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "json_decoder": decoder_name(),
+            "json_decoders": available_decoders(),
+            "platform": platform.platform(),
+            "seed": seed,
+            "repeat": repeat,
+            "options": options or {},
+        },
+        "results": results,
+    }
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the transformer stage benchmarks.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Comma-separated record counts, e.g. 1000,100000,10000000")
+    parser.add_argument("--stages", help="Comma-separated stage names (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage; the best is kept")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--depth", type=int, default=2, help="Nesting depth of generated records")
+    parser.add_argument("--fields", type=int, default=8, help="Scalar fields per record")
+    parser.add_argument("--key-variability", type=float, default=0.1,
+                        help="Probability of missing/extra keys per record")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the traced peak-memory run")
+    parser.add_argument("--output", help="Write results JSON to this file")
+    parser.add_argument("--list", action="store_true", help="List stage names and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(STAGES))
+        return 0
+
+    configure_logging(level="WARNING")
+    document = run_benchmarks(
+        sizes=[int(size) for size in args.sizes.split(",")],
+        stages=args.stages.split(",") if args.stages else None,
+        repeat=args.repeat,
+        seed=args.seed,
+        memory=not args.no_memory,
+        options={"depth": args.depth, "fields": args.fields, "key_variability": args.key_variability},
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
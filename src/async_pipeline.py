@@ -0,0 +1,265 @@
+"""
+async_pipeline.py
+-------------
+asyncio batch API that overlaps file reads, CPU-bound parsing and export writes.
+
+Features:
+- Reads upcoming files on an I/O thread pool while earlier files are still
+  being parsed, so slow (e.g. network-mounted) storage does not idle the CPUs
+- Parses, flattens, renames, transforms and validates on a process (or
+  thread) pool with the existing sync functions
+- Writes or inserts finished frames concurrently on the I/O pool
+- Caps both the number of files and the number of input bytes in flight
+- Results keep the input order; failures are reported per file in safe mode
+- Integrated logging
+
+Usage:
+    results = asyncio.run(process_files(files, "output", record_tag="record"))
+
+Author: Jobet Casquejo
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable
+
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_MAX_IN_FLIGHT_FILES = 8
+DEFAULT_MAX_IN_FLIGHT_BYTES = 256 * 1024 * 1024  # 256 MB
+
+# Output format -> (file suffix, exporter function name in src.exporter)
+_EXPORTERS = {
+    "csv": (".csv", "export_to_csv"),
+    "excel": (".xlsx", "export_to_excel"),
+    "parquet": (".parquet", "export_to_parquet"),
+    "feather": (".arrow", "export_to_feather"),
+}
+
+
+class ByteBudget:
+    """
+    Async counting limit on bytes in flight.
+
+    ``acquire(n)`` waits until ``n`` more bytes fit under ``limit``. A request
+    larger than the whole budget is admitted once nothing else is in flight,
+    so an oversized file is processed alone instead of blocking forever.
+    """
+
+    def __init__(self, limit: int):
+        if limit < 1:
+            raise ValueError("limit must be a positive integer")
+        self.limit = limit
+        self.in_use = 0
+        self.peak = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self, size: int) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_use == 0 or self.in_use + size <= self.limit)
+            self.in_use += size
+            self.peak = max(self.peak, self.in_use)
+
+    async def release(self, size: int) -> None:
+        async with self._condition:
+            self.in_use -= size
+            self._condition.notify_all()
+
+
+def transform_content(
+    data: bytes,
+    source: str,
+    record_tag: str = None,
+    column_mapping: dict = None,
+    transformations: dict = None,
+    required_fields: list = None,
+    field_types: dict = None,
+) -> tuple:
+    """
+    Parse already-read JSON or XML content and run it through rename, transform and validate.
+
+    Runs in a pool worker. Returns ``(df, rows_in)``.
+
+    Raises:
+        ValueError: If the file type is unsupported or ``record_tag`` is missing for XML.
+    """
+    import pandas as pd
+
+    from src.parser import parse_json_bytes, parse_xml_bytes
+    from src.transformer import json_to_dataframe, rename_columns, transform_dataframe, xml_root_to_records
+    from src.validator import validate_dataframe
+
+    suffix = Path(source).suffix.lower()
+    if suffix == ".json":
+        document = parse_json_bytes(data, source, safe=False)
+        df = json_to_dataframe(document if isinstance(document, list) else [document])
+    elif suffix == ".xml":
+        if not record_tag:
+            raise ValueError("record_tag is required for XML files")
+        df = pd.DataFrame(xml_root_to_records(parse_xml_bytes(data, source, safe=False), record_tag))
+    else:
+        raise ValueError(f"Unsupported input file type: {suffix!r}")
+    rows_in = len(df)
+
+    if column_mapping:
+        df = rename_columns(df, column_mapping)
+    if transformations:
+        df = transform_dataframe(df, transformations)
+    if required_fields or field_types:
+        df = validate_dataframe(df, required_fields, field_types)
+    return df, rows_in
+
+
+def _output_path(input_path: str, output_dir: str, output_format: str) -> str:
+    return os.path.join(output_dir, Path(input_path).stem + _EXPORTERS[output_format][0])
+
+
+def _export(df, input_path: str, output_dir: str, output_format: str) -> str:
+    from src import exporter
+
+    _, export_name = _EXPORTERS[output_format]
+    output_path = _output_path(input_path, output_dir, output_format)
+    os.makedirs(output_dir, exist_ok=True)
+    getattr(exporter, export_name)(df, output_path)
+    return output_path
+
+
+async def process_files(
+    files: list[str],
+    output_dir: str = None,
+    output_format: str = "csv",
+    record_tag: str = None,
+    column_mapping: dict = None,
+    transformations: dict = None,
+    required_fields: list = None,
+    field_types: dict = None,
+    writer: Callable = None,
+    max_in_flight_files: int = DEFAULT_MAX_IN_FLIGHT_FILES,
+    max_in_flight_bytes: int = DEFAULT_MAX_IN_FLIGHT_BYTES,
+    workers: int = None,
+    executor: str | Executor = "process",
+    io_workers: int = None,
+    safe: bool = True,
+) -> list[dict]:
+    """
+    Read, transform and export ``files`` with reads, parsing and writes overlapping.
+
+    Args:
+        files (list): JSON and XML input paths.
+        output_dir (str, optional): Directory for one ``<stem>.<format>`` export per input.
+        output_format (str): "csv", "excel", "parquet" or "feather".
+        record_tag (str, optional): Record element tag, required for XML inputs.
+        column_mapping, transformations, required_fields, field_types: Passed to
+            ``rename_columns``, ``transform_dataframe`` and ``validate_dataframe``.
+        writer (callable, optional): ``writer(df, input_path)`` used instead of the file
+            exporters, e.g. to insert into a database. It runs on an I/O thread and
+            its return value is reported as the output.
+        max_in_flight_files (int): Files between read start and write end at any time.
+        max_in_flight_bytes (int): Input bytes between read start and write end at any time.
+        workers (int, optional): Parsing pool size. Defaults to the CPU count.
+        executor (str | Executor): "process", "thread", or an existing executor to parse on.
+        io_workers (int, optional): Threads for reads and writes. Defaults to ``max_in_flight_files``.
+        safe (bool): Report failures per file instead of raising the first one.
+
+    Returns:
+        list[dict]: One result per input, in input order, with ``input``, ``output``,
+        ``rows_in``, ``rows_out``, ``seconds`` and ``error``.
+
+    Raises:
+        ValueError: If neither ``output_dir`` nor ``writer`` is given, the format is
+            unknown, or two inputs would export to the same file (e.g. ``a/x.json``
+            and ``b/x.xml`` both to ``x.csv``).
+    """
+    if writer is None and output_dir is None:
+        raise ValueError("Either output_dir or writer is required")
+    if output_format not in _EXPORTERS:
+        raise ValueError(f"Unsupported output format: {output_format!r}")
+    if max_in_flight_files < 1:
+        raise ValueError("max_in_flight_files must be a positive integer")
+
+    files = list(files)
+    if writer is None:
+        targets = {}
+        for input_path in files:
+            output_path = os.path.normcase(_output_path(input_path, output_dir, output_format))
+            targets.setdefault(output_path, []).append(input_path)
+        shared = {path: inputs for path, inputs in targets.items() if len(inputs) > 1}
+        if shared:
+            raise ValueError(f"Inputs would overwrite each other's exports: {shared}")
+    loop = asyncio.get_running_loop()
+    io_pool = ThreadPoolExecutor(max_workers=io_workers or max_in_flight_files, thread_name_prefix="async-io")
+    if isinstance(executor, Executor):
+        cpu_pool, owns_cpu_pool = executor, False
+    elif executor == "process":
+        cpu_pool, owns_cpu_pool = ProcessPoolExecutor(max_workers=workers), True
+    elif executor == "thread":
+        cpu_pool, owns_cpu_pool = ThreadPoolExecutor(max_workers=workers), True
+    else:
+        raise ValueError(f"Unsupported executor type: {executor}")
+
+    file_slots = asyncio.Semaphore(max_in_flight_files)
+    budget = ByteBudget(max_in_flight_bytes)
+    options = (record_tag, column_mapping, transformations, required_fields, field_types)
+
+    async def process_one(input_path: str) -> dict:
+        result = {"input": input_path, "output": None, "rows_in": 0, "rows_out": 0, "seconds": 0.0, "error": None}
+        start = time.perf_counter()
+        try:
+            size = await loop.run_in_executor(io_pool, os.path.getsize, input_path)
+            await budget.acquire(size)
+            try:
+                data = await loop.run_in_executor(io_pool, Path(input_path).read_bytes)
+                df, result["rows_in"] = await loop.run_in_executor(cpu_pool, transform_content, data, input_path, *options)
+                del data
+                result["rows_out"] = len(df)
+                if writer is not None:
+                    result["output"] = await loop.run_in_executor(io_pool, writer, df, input_path)
+                else:
+                    result["output"] = await loop.run_in_executor(
+                        io_pool, _export, df, input_path, output_dir, output_format
+                    )
+            finally:
+                await budget.release(size)
+        except Exception as e:
+            if not safe:
+                raise
+            logger.exception(f"Failed to process '{input_path}'")
+            result["error"] = f"{type(e).__name__}: {e}"
+        finally:
+            result["seconds"] = time.perf_counter() - start
+            file_slots.release()
+        return result
+
+    start = time.perf_counter()
+    tasks = []
+    try:
+        for input_path in files:
+            # Only start a file once a slot is free, so pending files are not all materialized as tasks.
+            await file_slots.acquire()
+            tasks.append(asyncio.ensure_future(process_one(input_path)))
+            if not safe and any(task.done() and task.exception() for task in tasks):
+                break
+        results = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    finally:
+        io_pool.shutdown(wait=False)
+        if owns_cpu_pool:
+            cpu_pool.shutdown(wait=False, cancel_futures=True)
+
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for result in results if result["error"])
+    rows = sum(result["rows_out"] for result in results)
+    logger.info(
+        f"Processed {len(results)} files asynchronously in {elapsed:.2f}s "
+        f"({failed} failed, {rows} rows, peak {budget.peak} bytes in flight)"
+    )
+    return results
@@ -0,0 +1,255 @@
+"""
+cache.py
+-------------
+Persistent on-disk cache of parsed and flattened DataFrames.
+
+Features:
+- Entries are keyed on the input's content hash plus the parse parameters
+  (record tag, flattening options) and the library/format versions, so any
+  change to the input or to how it is parsed is a miss
+- Frames are stored as LZ4-compressed Arrow IPC (Feather) files; frames whose
+  object columns hold containers or mixed types, which Arrow would reject or
+  convert, are not cached. Entries are never unpickled, so a shared cache
+  directory cannot be used to run code in the processes that read it
+- Configurable disk budget with least-recently-used eviction
+- Safe to share between worker processes: entries are published with an
+  atomic rename, and a file evicted by another process is just a miss
+- Hit/miss/write/eviction statistics
+- Integrated logging
+
+Author: Jobet Casquejo
+"""
+
+import hashlib
+import json
+import os
+import threading
+
+import pandas as pd
+
+from src.fileutils import atomic_output
+from src.logger import get_logger
+from src.manifest import file_hash
+
+logger = get_logger(__name__)
+
+CACHE_FORMAT_VERSION = 2
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GB
+_SUFFIX = ".arrow"
+_SUFFIXES = (_SUFFIX, ".pkl")  # pickle entries of format 1 are never read, only evicted
+_ARROW_SCALARS = (str, int, float, bool)
+
+
+class DataFrameCache:
+    """
+    Size-bounded LRU cache of DataFrames on disk.
+
+    Pass an instance as ``cache=`` to ``json_file_to_dataframe`` or
+    ``xml_to_dataframe``, or use ``get``/``put`` directly. Arrow does not
+    distinguish ``None`` from ``NaN`` in object columns, so missing values in
+    a cached frame may come back as either. Frames Arrow cannot store
+    unchanged are returned uncached.
+
+    Args:
+        cache_dir (str): Directory holding the entries; created on first write.
+        max_bytes (int): Disk budget. The least recently used entries are removed
+            once a write takes the cache over it.
+        compression (str): Arrow IPC compression, "lz4", "zstd" or "uncompressed".
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES, compression: str = "lz4"):
+        if max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.compression = compression
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._hashes = {}  # (path, size, mtime_ns) -> content hash
+
+    def key(self, file_path: str, **params) -> str:
+        """
+        Return the cache key for ``file_path`` parsed with ``params``.
+
+        The pandas and pyarrow versions are part of the key, so upgrading
+        either one starts from an empty cache.
+        """
+        import pyarrow
+
+        stat = os.stat(file_path)
+        stat_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+        content_hash = self._hashes.get(stat_key)
+        if content_hash is None:
+            content_hash = self._hashes[stat_key] = file_hash(file_path)
+        material = json.dumps(
+            {
+                "content": content_hash,
+                "params": params,
+                "format": CACHE_FORMAT_VERSION,
+                "pandas": pd.__version__,
+                "pyarrow": pyarrow.__version__,
+            },
+            sort_keys=True,
+            default=repr,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + _SUFFIX)
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        """
+        Return the cached frame for ``key``, or None on a miss.
+        """
+        import pyarrow.feather as feather
+
+        path = self._entry_path(key)
+        try:
+            df = feather.read_feather(path, memory_map=False)
+        except FileNotFoundError:
+            df = None
+        except Exception:
+            logger.exception(f"Discarding unreadable cache entry '{path}'")
+            self._remove(path)
+            df = None
+        if df is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        try:
+            os.utime(path)  # mark as recently used
+        except FileNotFoundError:
+            pass  # evicted by another process after we read it
+        with self._lock:
+            self.hits += 1
+        logger.debug(f"Cache hit for {key[:12]} ({path})")
+        return df
+
+    def put(self, key: str, df: pd.DataFrame) -> bool:
+        """
+        Store ``df`` under ``key``, then evict old entries if the cache is over budget.
+
+        Returns:
+            bool: False if Arrow cannot store the frame unchanged, in which case nothing is written.
+        """
+        import pyarrow as pa
+        import pyarrow.feather as feather
+
+        if not _arrow_compatible(df):
+            logger.debug(f"Not caching frame {key[:12]}: object columns hold containers or mixed types")
+            return False
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=None)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+            logger.debug(f"Not caching frame {key[:12]}: Arrow cannot store it ({e})")
+            return False
+
+        with atomic_output(self._entry_path(key)) as temp_path:
+            feather.write_feather(table, temp_path, compression=self.compression)
+        with self._lock:
+            self.writes += 1
+        self.evict()
+        return True
+
+    def get_or_create(self, key: str, create) -> pd.DataFrame:
+        """
+        Return the cached frame for ``key``, calling ``create()`` and caching its result on a miss.
+        """
+        df = self.get(key)
+        if df is None:
+            df = create()
+            try:
+                self.put(key, df)
+            except OSError:
+                logger.exception(f"Failed to write cache entry {key[:12]}")
+        return df
+
+    def _entries(self) -> list:
+        entries = []
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            if not name.endswith(_SUFFIXES) or name.startswith("."):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:  # evicted by another process
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+        return entries
+
+    def _remove(self, path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def size(self) -> int:
+        """
+        Return the total size in bytes of the cached entries.
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> int:
+        """
+        Remove least recently used entries until the cache fits in ``max_bytes``.
+
+        Returns:
+            int: Number of entries removed by this call.
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if self._remove(path):
+                removed += 1
+            total -= size
+        if removed:
+            with self._lock:
+                self.evictions += removed
+            logger.info(f"Evicted {removed} cache entries from '{self.cache_dir}' ({total} bytes kept)")
+        return removed
+
+    def clear(self) -> None:
+        """
+        Remove every cached entry.
+        """
+        for _, _, path in self._entries():
+            self._remove(path)
+
+    def stats(self) -> dict:
+        """
+        Return hit/miss/write/eviction counters and the current hit rate for this instance.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def _arrow_compatible(df: pd.DataFrame) -> bool:
+    # Arrow would turn lists into arrays and reject mixed scalar types, so only
+    # object columns holding a single scalar type round-trip unchanged.
+    for column in df.columns:
+        values = df[column]
+        if values.dtype != object:
+            continue
+        types = set(map(type, values.dropna()))
+        if len(types) > 1 or not types <= set(_ARROW_SCALARS):
+            return False
+    return True
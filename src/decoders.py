@@ -0,0 +1,151 @@
+"""
+decoders.py
+-------------
+Pluggable JSON decoding backends.
+
+Features:
+- Uses the fastest installed decoder (orjson, then simdjson, then ujson) and
+  falls back to the stdlib ``json`` module when none is installed
+- Decodes straight from bytes, so fast backends skip the UTF-8 decode to str
+- The backend can be forced by name, process-wide with set_default_decoder()
+  or through the TRANSFORMER_JSON_DECODER environment variable
+- Same results and errors as the stdlib: input a fast backend rejects is
+  decoded again with ``json``, which either accepts it (NaN, integers wider
+  than 64 bits, very deep nesting) or raises its usual ``json.JSONDecodeError``
+- Integrated logging
+
+Usage:
+    decode = get_decoder()          # or get_decoder("json") to force the stdlib
+    data = decode(path.read_bytes())
+
+Author: Jobet Casquejo
+"""
+
+import json
+import os
+from typing import Any, Callable
+
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+DECODER_ENV = "TRANSFORMER_JSON_DECODER"
+BACKENDS = ("orjson", "simdjson", "ujson", "json")  # preference order for "auto"
+
+_default = None
+_decoders = {}  # backend name -> decode function, or None when not installed
+
+
+def _stdlib_loads(data: bytes | str) -> Any:
+    if not isinstance(data, str):
+        data = str(data, "utf-8")
+    return json.loads(data)
+
+
+def _with_fallback(fast_loads: Callable, errors: tuple) -> Callable[[bytes | str], Any]:
+    def loads(data: bytes | str) -> Any:
+        try:
+            return fast_loads(data)
+        except errors:
+            # Let the stdlib decide on rejected input, so every backend accepts
+            # and rejects exactly what ``json`` does, with the same messages.
+            return _stdlib_loads(data)
+
+    return loads
+
+
+def _load_backend(name: str) -> Callable[[bytes | str], Any]:
+    if name == "json":
+        return _stdlib_loads
+    if name == "orjson":
+        import orjson
+
+        return _with_fallback(orjson.loads, (orjson.JSONDecodeError,))
+    if name == "simdjson":
+        import simdjson
+
+        return _with_fallback(simdjson.loads, (ValueError,))
+    if name == "ujson":
+        import ujson
+
+        return _with_fallback(ujson.loads, (ValueError,))
+    raise ValueError(f"Unknown JSON decoder: {name!r} (expected 'auto' or one of {BACKENDS})")
+
+
+def available_decoders() -> list[str]:
+    """
+    Return the installed backends in preference order; "json" is always last.
+    """
+    names = []
+    for name in BACKENDS:
+        try:
+            _resolve(name)
+        except ValueError:
+            continue
+        names.append(name)
+    return names
+
+
+def _resolve(name: str) -> Callable[[bytes | str], Any]:
+    if name not in _decoders:
+        try:
+            _decoders[name] = _load_backend(name)
+        except ImportError:
+            _decoders[name] = None
+    decode = _decoders[name]
+    if decode is None:
+        raise ValueError(f"JSON decoder {name!r} is not installed")
+    return decode
+
+
+def decoder_name(name: str | None = None) -> str:
+    """
+    Return the backend ``get_decoder(name)`` would use.
+
+    ``name`` defaults to the value given to set_default_decoder(), then to the
+    TRANSFORMER_JSON_DECODER environment variable, then to "auto", which picks
+    the first installed backend in ``BACKENDS``.
+    """
+    name = (name or _default or os.environ.get(DECODER_ENV) or "auto").lower()
+    if name == "auto":
+        return available_decoders()[0]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown JSON decoder: {name!r} (expected 'auto' or one of {BACKENDS})")
+    return name
+
+
+def get_decoder(name: str | None = None) -> Callable[[bytes | str], Any]:
+    """
+    Return a ``decode(data)`` function for bytes or str JSON content.
+
+    Args:
+        name (str, optional): "auto", "orjson", "simdjson", "ujson" or "json".
+            See ``decoder_name`` for the default.
+
+    Returns:
+        callable: Decodes one JSON document. Malformed content raises
+        ``json.JSONDecodeError`` (``UnicodeDecodeError`` for invalid UTF-8)
+        whichever backend is used.
+
+    Raises:
+        ValueError: If the backend is unknown or not installed.
+    """
+    return _resolve(decoder_name(name))
+
+
+def set_default_decoder(name: str | None) -> str:
+    """
+    Set the backend used in this process when no name is passed and return
+    the backend that will be used. None or "auto" restores the default.
+
+    Raises:
+        ValueError: If the backend is unknown or not installed.
+    """
+    global _default
+    default = None if name is None or name.lower() == "auto" else decoder_name(name)
+    if default is not None:
+        _resolve(default)
+    _default = default
+    resolved = decoder_name()
+    logger.debug(f"Default JSON decoder: {resolved}")
+    return resolved
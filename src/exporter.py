@@ -1,20 +1,37 @@
 """
 exporter.py
 -------------
-Handles exporting pandas DataFrames to CSV, Excel, or SQL databases.
+Handles exporting pandas DataFrames to CSV, Excel, Parquet, Feather/Arrow IPC,
+or SQL databases. CSV, Excel and the Arrow formats can also be streamed from an
+iterator of DataFrame chunks, and SQL tables can be bulk loaded in committed
+batches or upserted.
 Integrated with professional logging.
 
 Author: Jobet Casquejo
 """
 
+import gzip
+import io
+import shutil
+import tempfile
 import pandas as pd
 import os
+import sqlite3
+from contextlib import contextmanager
+from typing import Iterable, Iterator
+from src.fileutils import atomic_output, default_mode
 from src.logger import get_logger
+from src.metrics import instrument
 
 # Initialize logger
 logger = get_logger(__name__)
 
+EXCEL_MAX_ROWS = 1_048_576  # Rows per worksheet, including the header row
+EXCEL_SLICE_ROWS = 10_000  # Rows converted to Python objects at a time for Excel
+SQLITE_MAX_VARIABLES = 999  # Bound parameters per statement on older SQLite builds
 
+
+@instrument(output_arg="output_path", rows_arg="df")
 def export_to_csv(df: pd.DataFrame, output_path: str, index: bool = False) -> None:
     """
     Export DataFrame to CSV file.
@@ -41,7 +58,81 @@ def export_to_csv(df: pd.DataFrame, output_path: str, index: bool = False) -> No
         raise e
 
 
-def export_to_excel(df: pd.DataFrame, output_path: str, index: bool = False) -> None:
+@instrument(output_arg="output_path")
+def export_chunks_to_csv(
+    chunks: pd.DataFrame | Iterable[pd.DataFrame],
+    output_path: str,
+    index: bool = False,
+    compression: str | None = "infer",
+    buffer_size: int = 1024 * 1024,
+) -> int:
+    """
+    Stream DataFrame chunks into one CSV file.
+
+    The header is written once, from the first non-empty chunk; later chunks
+    are aligned to those columns and appended through a large buffered file
+    handle. Output goes to a temporary file that is renamed into place only
+    after the last chunk, so readers never see a partial file.
+
+    Args:
+        chunks (pd.DataFrame | Iterable[pd.DataFrame]): A DataFrame or an iterator of chunks.
+        output_path (str): Full file path to save CSV.
+        index (bool): Whether to write row indices. Default is False.
+        compression (str | None): "gzip", None, or "infer" (gzip when the path ends in ".gz").
+        buffer_size (int): Size in bytes of the write buffer.
+
+    Returns:
+        int: Number of rows written.
+
+    Raises:
+        ValueError: If no chunk contained any rows.
+        Exception: For any unexpected file I/O errors.
+    """
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+    if compression == "infer":
+        compression = "gzip" if output_path.endswith(".gz") else None
+    if compression not in (None, "gzip"):
+        raise ValueError(f"Unsupported compression: {compression!r}")
+
+    try:
+        with atomic_output(output_path) as temp_path:
+            with open(temp_path, "wb", buffering=buffer_size) as raw:
+                binary = gzip.GzipFile(fileobj=raw, mode="wb") if compression == "gzip" else raw
+                with io.TextIOWrapper(binary, encoding="utf-8-sig", newline="") as handle:
+                    rows = _write_csv_chunks(chunks, handle, index)
+                    if rows == 0:
+                        logger.error("Attempted to export an empty DataFrame to CSV.")
+                        raise ValueError("Cannot export an empty DataFrame.")
+        logger.info(f"{rows} rows successfully streamed to CSV: {output_path}")
+        return rows
+    except ValueError:
+        raise
+    except Exception as e:
+        logger.exception(f"Failed to stream DataFrame chunks to CSV: {output_path}")
+        raise e
+
+
+def _write_csv_chunks(chunks: Iterable[pd.DataFrame], handle, index: bool) -> int:
+    columns = None
+    rows = 0
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        if columns is None:
+            columns = list(chunk.columns)
+        elif list(chunk.columns) != columns:
+            extra = [col for col in chunk.columns if col not in columns]
+            if extra:
+                logger.warning(f"Dropping columns not present in the CSV header: {extra}")
+            chunk = chunk.reindex(columns=columns)
+        chunk.to_csv(handle, header=rows == 0, index=index)
+        rows += len(chunk)
+    return rows
+
+
+@instrument(output_arg="output_path", rows_arg="df")
+def export_to_excel(df: pd.DataFrame, output_path: str, index: bool = False, write_only: bool = False) -> None:
     """
     Export DataFrame to Excel file (.xlsx).
 
@@ -49,6 +140,8 @@ def export_to_excel(df: pd.DataFrame, output_path: str, index: bool = False) ->
         df (pd.DataFrame): DataFrame to export.
         output_path (str): Full file path to save Excel.
         index (bool): Whether to write row indices. Default is False.
+        write_only (bool): Stream rows with ``export_chunks_to_excel`` instead of building
+            the workbook in memory; large frames roll over to additional sheets.
 
     Raises:
         ValueError: If DataFrame is empty.
@@ -58,6 +151,10 @@ def export_to_excel(df: pd.DataFrame, output_path: str, index: bool = False) ->
         logger.error("Attempted to export an empty DataFrame to Excel.")
         raise ValueError("Cannot export an empty DataFrame.")
 
+    if write_only:
+        export_chunks_to_excel(df, output_path, index=index)
+        return
+
     try:
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         df.to_excel(output_path, index=index, engine='openpyxl')
@@ -67,7 +164,411 @@ def export_to_excel(df: pd.DataFrame, output_path: str, index: bool = False) ->
         raise e
 
 
-def export_to_sql(df: pd.DataFrame, db_connection, table_name: str, if_exists: str = "replace") -> None:
+@instrument(output_arg="output_path")
+def export_chunks_to_excel(
+    chunks: pd.DataFrame | Iterable[pd.DataFrame],
+    output_path: str,
+    sheet_name: str = "Sheet1",
+    index: bool = False,
+    max_rows: int = EXCEL_MAX_ROWS,
+) -> int:
+    """
+    Stream DataFrame chunks into an Excel file using openpyxl's write-only workbook.
+
+    Rows are serialized as they arrive, so memory stays flat regardless of row
+    count. When a sheet reaches ``max_rows`` (the Excel limit by default), a
+    new sheet named ``<sheet_name>_2``, ``<sheet_name>_3``, ... is started with
+    the header repeated. The workbook is saved to a temporary file and renamed
+    into place.
+
+    Args:
+        chunks (pd.DataFrame | Iterable[pd.DataFrame]): A DataFrame or an iterator of chunks.
+        output_path (str): Full file path to save Excel.
+        sheet_name (str): Name of the first worksheet.
+        index (bool): Whether to write row indices. Default is False.
+        max_rows (int): Maximum rows per sheet, including the header row.
+
+    Returns:
+        int: Number of data rows written.
+
+    Raises:
+        ValueError: If no chunk contained any rows.
+        Exception: For any unexpected file I/O errors.
+    """
+    from openpyxl import Workbook
+
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+    if max_rows < 2:
+        raise ValueError("max_rows must leave room for a header and at least one row")
+
+    try:
+        workbook = Workbook(write_only=True)
+        columns = None
+        header = None
+        sheet = None
+        sheet_rows = 0
+        rows = 0
+        for chunk in chunks:
+            if chunk.empty:
+                continue
+            if columns is None:
+                columns = list(chunk.columns)
+                header = ([chunk.index.name or ""] if index else []) + [str(col) for col in columns]
+            elif list(chunk.columns) != columns:
+                extra = [col for col in chunk.columns if col not in columns]
+                if extra:
+                    logger.warning(f"Dropping columns not present in the Excel header: {extra}")
+                chunk = chunk.reindex(columns=columns)
+            # Converted a slice at a time: a whole DataFrame passed in would otherwise
+            # be copied to object dtype at once, several times its own size.
+            for start in range(0, len(chunk), EXCEL_SLICE_ROWS):
+                part = chunk.iloc[start:start + EXCEL_SLICE_ROWS]
+                values = part.astype(object).where(part.notna(), None)
+                for row in values.itertuples(index=index, name=None):
+                    if sheet is None or sheet_rows >= max_rows:
+                        title = sheet_name if sheet is None else f"{sheet_name}_{len(workbook.worksheets) + 1}"
+                        sheet = workbook.create_sheet(title=title)
+                        sheet.append(header)
+                        sheet_rows = 1
+                    sheet.append(row)
+                    sheet_rows += 1
+                    rows += 1
+
+        if rows == 0:
+            logger.error("Attempted to export an empty DataFrame to Excel.")
+            raise ValueError("Cannot export an empty DataFrame.")
+
+        with atomic_output(output_path) as temp_path:
+            workbook.save(temp_path)
+        logger.info(
+            f"{rows} rows successfully streamed to Excel: {output_path} "
+            f"({len(workbook.worksheets)} sheet(s))"
+        )
+        return rows
+    except ValueError:
+        raise
+    except Exception as e:
+        logger.exception(f"Failed to stream DataFrame chunks to Excel: {output_path}")
+        raise e
+
+
+@instrument(output_arg="output_path")
+def export_to_parquet(
+    chunks: pd.DataFrame | Iterable[pd.DataFrame],
+    output_path: str,
+    compression: str = "snappy",
+    row_group_size: int = None,
+    partition_cols: list = None,
+    index: bool = False,
+    schema=None,
+) -> int:
+    """
+    Export a DataFrame or an iterator of chunks to Parquet.
+
+    Each chunk is written as it arrives (as one or more row groups), so the
+    full dataset never has to be in memory. With ``partition_cols`` the output
+    is a directory laid out as ``<col>=<value>/part-*.parquet``; otherwise a
+    single file. Output is written under a temporary name and moved into place
+    at the end.
+
+    Args:
+        chunks (pd.DataFrame | Iterable[pd.DataFrame]): A DataFrame or an iterator of chunks.
+        output_path (str): Parquet file path, or dataset directory when partitioning.
+        compression (str): Codec: 'snappy', 'zstd', 'gzip', 'brotli', 'lz4' or 'none'.
+        row_group_size (int, optional): Maximum rows per row group.
+        partition_cols (list, optional): Columns to partition the dataset directory by.
+        index (bool): Whether to store the DataFrame index. Default is False.
+        schema (pyarrow.Schema, optional): Arrow schema. By default it is inferred from the
+            chunks and widened when a later chunk needs it (rows already written are
+            rewritten once with the wider types).
+
+    Returns:
+        int: Number of rows written.
+
+    Raises:
+        ValueError: If no chunk contained any rows.
+        Exception: For any unexpected file I/O errors.
+    """
+    import pyarrow.parquet as pq
+
+    try:
+        rows = 0
+        if partition_cols:
+            with _atomic_directory(output_path) as temp_dir:
+                final_schema = None
+                widened = False
+                for number, table in enumerate(_iter_arrow_tables(chunks, index, schema)):
+                    widened |= final_schema is not None and not table.schema.equals(final_schema, check_metadata=False)
+                    final_schema = table.schema
+                    pq.write_to_dataset(
+                        table,
+                        root_path=temp_dir,
+                        partition_cols=partition_cols,
+                        compression=compression,
+                        basename_template=f"part-{number}-{{i}}.parquet",
+                        max_rows_per_group=row_group_size or 1024 * 1024,
+                        existing_data_behavior="overwrite_or_ignore",
+                    )
+                    rows += table.num_rows
+                _raise_if_no_rows(rows, "Parquet")
+                if widened:
+                    _conform_dataset(temp_dir, final_schema, compression)
+        else:
+            with atomic_output(output_path) as temp_path:
+                writer = None
+                try:
+                    for table in _iter_arrow_tables(chunks, index, schema):
+                        if writer is None:
+                            writer = pq.ParquetWriter(temp_path, table.schema, compression=compression)
+                        elif not table.schema.equals(written_schema, check_metadata=False):
+                            writer.close()
+                            writer = _rewrite_parquet(temp_path, table.schema, compression)
+                        written_schema = table.schema
+                        writer.write_table(table, row_group_size=row_group_size)
+                        rows += table.num_rows
+                finally:
+                    if writer is not None:
+                        writer.close()
+                _raise_if_no_rows(rows, "Parquet")
+        logger.info(f"{rows} rows successfully exported to Parquet: {output_path}")
+        return rows
+    except ValueError:
+        raise
+    except Exception as e:
+        logger.exception(f"Failed to export DataFrame to Parquet: {output_path}")
+        raise e
+
+
+@instrument(output_arg="output_path")
+def export_to_feather(
+    chunks: pd.DataFrame | Iterable[pd.DataFrame],
+    output_path: str,
+    compression: str = "lz4",
+    index: bool = False,
+    schema=None,
+) -> int:
+    """
+    Export a DataFrame or an iterator of chunks to a Feather v2 / Arrow IPC file.
+
+    Each chunk is appended as record batches as it arrives; the file is written
+    under a temporary name and moved into place at the end.
+
+    Args:
+        chunks (pd.DataFrame | Iterable[pd.DataFrame]): A DataFrame or an iterator of chunks.
+        output_path (str): Full file path to save the Feather file.
+        compression (str): 'lz4', 'zstd' or 'uncompressed'.
+        index (bool): Whether to store the DataFrame index. Default is False.
+        schema (pyarrow.Schema, optional): Arrow schema. By default it is inferred from the
+            chunks and widened when a later chunk needs it (rows already written are
+            rewritten once with the wider types).
+
+    Returns:
+        int: Number of rows written.
+
+    Raises:
+        ValueError: If no chunk contained any rows.
+        Exception: For any unexpected file I/O errors.
+    """
+    import pyarrow.ipc as ipc
+
+    options = ipc.IpcWriteOptions(compression=None if compression == "uncompressed" else compression)
+    try:
+        rows = 0
+        with atomic_output(output_path) as temp_path:
+            writer = None
+            try:
+                for table in _iter_arrow_tables(chunks, index, schema):
+                    if writer is None:
+                        writer = ipc.new_file(temp_path, table.schema, options=options)
+                    elif not table.schema.equals(written_schema, check_metadata=False):
+                        writer.close()
+                        writer = _rewrite_feather(temp_path, table.schema, options)
+                    written_schema = table.schema
+                    writer.write_table(table)
+                    rows += table.num_rows
+            finally:
+                if writer is not None:
+                    writer.close()
+            _raise_if_no_rows(rows, "Feather")
+        logger.info(f"{rows} rows successfully exported to Feather: {output_path}")
+        return rows
+    except ValueError:
+        raise
+    except Exception as e:
+        logger.exception(f"Failed to export DataFrame to Feather: {output_path}")
+        raise e
+
+
+def _iter_arrow_tables(chunks, index: bool, schema=None) -> Iterator:
+    """
+    Convert chunks to Arrow tables with one column set, fixed by the first chunk.
+
+    Without an explicit ``schema`` the column types are widened as chunks
+    arrive: a column that held only nulls so far (inferred as null or as
+    all-NaN float) takes the type of its first real values, and differing
+    types are promoted (e.g. int64 and double to double). Each yielded table
+    carries the schema as widened so far; writers that already wrote earlier
+    tables must conform them to it (see ``_conform_table``). Values that no
+    common type can hold still raise ``pyarrow.ArrowInvalid``.
+    """
+    import pyarrow as pa
+
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+    fixed = schema is not None
+    columns = None
+    typed = set()  # columns that have held a non-null value
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        if columns is None:
+            columns = [name for name in schema.names if name in chunk.columns] if fixed else list(chunk.columns)
+        if list(chunk.columns) != columns:
+            extra = [col for col in chunk.columns if col not in columns]
+            if extra:
+                logger.warning(f"Dropping columns not present in the Arrow schema: {extra}")
+            chunk = chunk.reindex(columns=columns)
+        if fixed:
+            yield pa.Table.from_pandas(chunk, schema=schema, preserve_index=index)
+            continue
+
+        table = pa.Table.from_pandas(chunk, preserve_index=index)
+        present = {name for name, column in zip(table.column_names, table.columns) if column.null_count < len(column)}
+        schema = table.schema if schema is None else _widen_schema(schema, table.schema, typed, present)
+        typed |= present
+        yield _conform_table(table, schema)
+
+
+def _widen_schema(schema, new_schema, typed: set, present: set):
+    import pyarrow as pa
+
+    fields = []
+    widened = False
+    for field in schema:
+        new_field = new_schema.field(field.name)
+        if new_field.type == field.type or field.name not in present:
+            fields.append(field)
+            continue
+        if field.name not in typed:
+            fields.append(new_field)  # first real values decide the type
+        else:
+            merged = pa.unify_schemas([pa.schema([field]), pa.schema([new_field])], promote_options="permissive")
+            fields.append(merged.field(0))
+        widened = True
+        logger.info(f"Widened Arrow column {field.name!r} from {field.type} to {fields[-1].type}")
+    if not widened:
+        return schema
+    # The latest chunk's pandas metadata describes the widened types best.
+    return pa.schema(fields, metadata=new_schema.metadata)
+
+
+def _conform_table(table, schema):
+    # Cast ``table`` to the types ``schema`` gives its columns; all-null columns can take any type.
+    import pyarrow as pa
+
+    if table.schema.equals(schema, check_metadata=False):
+        return table
+    fields = [schema.field(name) for name in table.column_names]
+    arrays = [
+        pa.nulls(len(column), field.type) if column.null_count == len(column) else column.cast(field.type)
+        for column, field in zip(table.columns, fields)
+    ]
+    return pa.Table.from_arrays(arrays, schema=pa.schema(fields, metadata=schema.metadata))
+
+
+def _rewrite_parquet(path: str, schema, compression: str):
+    """
+    Rewrite the row groups written so far with the widened ``schema`` and return
+    a writer, positioned after them, for the remaining tables.
+    """
+    import pyarrow.parquet as pq
+
+    previous = path + ".widen"
+    os.replace(path, previous)
+    try:
+        reader = pq.ParquetFile(previous)
+        writer = pq.ParquetWriter(path, schema, compression=compression)
+        for number in range(reader.num_row_groups):
+            writer.write_table(_conform_table(reader.read_row_group(number), schema))
+        reader.close()
+    finally:
+        os.remove(previous)
+    return writer
+
+
+def _rewrite_feather(path: str, schema, options):
+    """
+    Rewrite the record batches written so far with the widened ``schema`` and
+    return a writer, positioned after them, for the remaining tables.
+    """
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    previous = path + ".widen"
+    os.replace(path, previous)
+    try:
+        with pa.memory_map(previous) as source:
+            reader = ipc.open_file(source)
+            writer = ipc.new_file(path, schema, options=options)
+            for number in range(reader.num_record_batches):
+                writer.write_table(_conform_table(pa.Table.from_batches([reader.get_batch(number)]), schema))
+    finally:
+        os.remove(previous)
+    return writer
+
+
+def _conform_dataset(dataset_dir: str, schema, compression: str) -> None:
+    # Part files written before the schema was widened get the final column types.
+    import pyarrow.parquet as pq
+
+    for root, _, names in os.walk(dataset_dir):
+        for name in names:
+            if not name.endswith(".parquet"):
+                continue
+            path = os.path.join(root, name)
+            table = pq.read_table(path)
+            conformed = _conform_table(table, schema)
+            if conformed is not table:
+                pq.write_table(conformed, path, compression=compression)
+
+
+def _raise_if_no_rows(rows: int, target: str) -> None:
+    if rows == 0:
+        logger.error(f"Attempted to export an empty DataFrame to {target}.")
+        raise ValueError("Cannot export an empty DataFrame.")
+
+
+@contextmanager
+def _atomic_directory(output_dir: str):
+    # Build the dataset in a sibling directory, then swap it in with renames.
+    parent = os.path.dirname(os.path.abspath(output_dir))
+    os.makedirs(parent, exist_ok=True)
+    temp_dir = tempfile.mkdtemp(prefix=f".{os.path.basename(output_dir)}.", dir=parent)
+    try:
+        yield temp_dir
+        os.chmod(temp_dir, default_mode(directory=True))  # mkdtemp creates it owner-only
+        if os.path.exists(output_dir):
+            retired = temp_dir + ".old"
+            os.replace(output_dir, retired)
+            os.replace(temp_dir, output_dir)
+            shutil.rmtree(retired, ignore_errors=True)
+        else:
+            os.replace(temp_dir, output_dir)
+    except BaseException:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+
+
+@instrument(rows_arg="df")
+def export_to_sql(
+    df: pd.DataFrame,
+    db_connection,
+    table_name: str,
+    if_exists: str = "replace",
+    chunksize: int = None,
+    method: str = None,
+) -> None:
     """
     Export DataFrame to SQL database table.
 
@@ -76,6 +577,8 @@ def export_to_sql(df: pd.DataFrame, db_connection, table_name: str, if_exists: s
         db_connection: SQLAlchemy or sqlite3 connection object.
         table_name (str): Table name to export to.
         if_exists (str): Behavior if table exists: 'fail', 'replace', or 'append'. Default is 'replace'.
+        chunksize (int, optional): Rows per insert batch, passed to ``DataFrame.to_sql``.
+        method (str, optional): Insert method passed to ``DataFrame.to_sql`` (None or 'multi').
 
     Raises:
         ValueError: If DataFrame is empty.
@@ -86,8 +589,188 @@ def export_to_sql(df: pd.DataFrame, db_connection, table_name: str, if_exists: s
         raise ValueError("Cannot export an empty DataFrame.")
 
     try:
-        df.to_sql(name=table_name, con=db_connection, if_exists=if_exists, index=False)
+        df.to_sql(
+            name=table_name,
+            con=db_connection,
+            if_exists=if_exists,
+            index=False,
+            chunksize=chunksize,
+            method=method,
+        )
         logger.info(f"DataFrame successfully exported to SQL table: {table_name}")
     except Exception as e:
         logger.exception(f"Failed to export DataFrame to SQL table: {table_name}")
         raise e
+
+
+@instrument()
+def bulk_export_to_sql(
+    chunks: pd.DataFrame | Iterable[pd.DataFrame],
+    db_connection,
+    table_name: str,
+    if_exists: str = "append",
+    batch_size: int = 10000,
+    method: str = None,
+    dtype: dict = None,
+    upsert_keys: list = None,
+) -> int:
+    """
+    Bulk load DataFrame chunks into a SQL table in committed batches.
+
+    Every batch of ``batch_size`` rows is written with one ``to_sql`` call
+    and committed on its own, so a failure only loses the current batch and
+    the database never holds one giant transaction.
+
+    Args:
+        chunks (pd.DataFrame | Iterable[pd.DataFrame]): A DataFrame or an iterator of chunks.
+        db_connection: SQLAlchemy engine/connection or sqlite3 connection object.
+        table_name (str): Table name to export to.
+        if_exists (str): Applied to the first batch only: 'fail', 'replace', or 'append'.
+        batch_size (int): Rows per committed batch.
+        method (str, optional): None for executemany (fastest on SQLite and on SQLAlchemy 2,
+            which batches it into multi-row statements itself) or 'multi' for explicit
+            multi-row VALUES statements.
+        dtype (dict, optional): Column -> SQL type, passed to ``to_sql`` so columns
+            are not all created as TEXT.
+        upsert_keys (list, optional): Key columns for upsert mode. Rows whose keys already
+            exist are updated instead of inserted (SQLite and PostgreSQL). A unique index on
+            the keys is created when missing.
+
+    Returns:
+        int: Number of rows written.
+
+    Raises:
+        ValueError: If no chunk contained any rows, or the options are inconsistent.
+        Exception: For any unexpected SQL errors.
+    """
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+    if upsert_keys and if_exists == "replace":
+        raise ValueError("upsert mode cannot be combined with if_exists='replace'")
+
+    dialect = _sql_dialect(db_connection)
+
+    rows = 0
+    batches = 0
+    try:
+        for chunk in chunks:
+            for start in range(0, len(chunk), batch_size):
+                batch = chunk.iloc[start:start + batch_size]
+                if batches == 0 and upsert_keys:
+                    _prepare_upsert_table(batch, db_connection, table_name, upsert_keys, dtype, dialect)
+                insert_method = _upsert_method(upsert_keys, dialect) if upsert_keys else method
+                statement_rows = None
+                if insert_method == "multi" and dialect == "sqlite":
+                    statement_rows = max(1, SQLITE_MAX_VARIABLES // len(batch.columns))
+                batch.to_sql(
+                    name=table_name,
+                    con=db_connection,
+                    if_exists=if_exists if batches == 0 and not upsert_keys else "append",
+                    index=False,
+                    dtype=dtype,
+                    method=insert_method,
+                    chunksize=statement_rows,
+                )
+                _commit(db_connection)
+                rows += len(batch)
+                batches += 1
+
+        if rows == 0:
+            logger.error("Attempted to export an empty DataFrame to SQL.")
+            raise ValueError("Cannot export an empty DataFrame.")
+        mode = "upserted" if upsert_keys else "inserted"
+        logger.info(f"{rows} rows {mode} into SQL table '{table_name}' in {batches} batches")
+        return rows
+    except ValueError:
+        raise
+    except Exception as e:
+        logger.exception(f"Failed to bulk export to SQL table: {table_name} ({rows} rows committed)")
+        raise e
+
+
+def _sql_dialect(db_connection) -> str:
+    if isinstance(db_connection, sqlite3.Connection):
+        return "sqlite"
+    dialect = getattr(db_connection, "dialect", None)
+    return getattr(dialect, "name", "unknown")
+
+
+def _commit(db_connection) -> None:
+    # Engines commit inside to_sql; plain connections need an explicit commit.
+    commit = getattr(db_connection, "commit", None)
+    if commit is not None:
+        commit()
+
+
+def _quote_identifier(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _prepare_upsert_table(batch, db_connection, table_name, upsert_keys, dtype, dialect) -> None:
+    if dialect not in ("sqlite", "postgresql"):
+        raise ValueError(f"Upsert is not supported for SQL dialect: {dialect}")
+    missing = [key for key in upsert_keys if key not in batch.columns]
+    if missing:
+        raise ValueError(f"Upsert key columns not found in DataFrame: {missing}")
+
+    # Create the table from the column layout, then ensure ON CONFLICT has a unique index.
+    batch.head(0).to_sql(name=table_name, con=db_connection, if_exists="append", index=False, dtype=dtype)
+    index_name = _quote_identifier(f"ux_{table_name}_{'_'.join(map(str, upsert_keys))}")
+    columns = ", ".join(_quote_identifier(key) for key in upsert_keys)
+    statement = f"CREATE UNIQUE INDEX IF NOT EXISTS {index_name} ON {_quote_identifier(table_name)} ({columns})"
+
+    if isinstance(db_connection, sqlite3.Connection):
+        db_connection.execute(statement)
+    else:
+        from sqlalchemy import text
+
+        if hasattr(db_connection, "begin") and not hasattr(db_connection, "commit"):
+            with db_connection.begin() as connection:
+                connection.execute(text(statement))
+        else:
+            db_connection.execute(text(statement))
+    _commit(db_connection)
+
+
+def _upsert_method(upsert_keys: list, dialect: str):
+    """
+    Build a ``to_sql`` insert method issuing INSERT ... ON CONFLICT DO UPDATE.
+    """
+    def upsert(pd_table, conn, keys, data_iter):
+        rows = list(data_iter)
+        updates = [key for key in keys if key not in upsert_keys]
+
+        # pandas runs its sqlite3 fallback on a cursor of the caller's connection.
+        if isinstance(conn, (sqlite3.Connection, sqlite3.Cursor)):
+            columns = ", ".join(_quote_identifier(key) for key in keys)
+            placeholders = ", ".join("?" for _ in keys)
+            conflict = ", ".join(_quote_identifier(key) for key in upsert_keys)
+            action = (
+                "DO UPDATE SET " + ", ".join(f"{_quote_identifier(key)} = excluded.{_quote_identifier(key)}" for key in updates)
+                if updates else "DO NOTHING"
+            )
+            statement = (
+                f"INSERT INTO {_quote_identifier(pd_table.name)} ({columns}) VALUES ({placeholders}) "
+                f"ON CONFLICT ({conflict}) {action}"
+            )
+            conn.executemany(statement, rows)
+            return len(rows)
+
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        statement = insert(pd_table.table)
+        if updates:
+            statement = statement.on_conflict_do_update(
+                index_elements=upsert_keys,
+                set_={key: statement.excluded[key] for key in updates},
+            )
+        else:
+            statement = statement.on_conflict_do_nothing(index_elements=upsert_keys)
+        conn.execute(statement, [dict(zip(keys, row)) for row in rows])
+        return len(rows)
+
+    return upsert
@@ -0,0 +1,65 @@
+"""
+fileutils.py
+-------------
+Small filesystem helpers shared by the exporters and the incremental tooling.
+
+Author: Jobet Casquejo
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator
+
+
+@contextmanager
+def atomic_output(output_path: str) -> Iterator[str]:
+    """
+    Yield a temporary path in the same directory as ``output_path``.
+
+    When the block completes, the temporary file is renamed over
+    ``output_path`` in one step, so readers never see a half-written file.
+    The result gets the mode of the file it replaces, or the umask default
+    for new files, rather than the owner-only mode of the temporary file.
+    If the block raises, the temporary file is removed and the target is left
+    untouched.
+    """
+    directory = os.path.dirname(output_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{os.path.basename(output_path)}.", suffix=".tmp", dir=directory)
+    os.close(fd)
+    try:
+        yield temp_path
+        try:
+            mode = os.stat(output_path).st_mode & 0o7777
+        except FileNotFoundError:
+            mode = default_mode()
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def default_mode(directory: bool = False) -> int:
+    """
+    Return the mode ``open()`` (or ``os.mkdir()`` with ``directory=True``) would
+    give a new file under the current umask.
+    """
+    return (0o777 if directory else 0o666) & ~_umask()
+
+
+def _umask() -> int:
+    # Read from /proc where possible: os.umask() can only be queried by
+    # briefly changing it, which other threads would observe.
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+    mask = os.umask(0o022)
+    os.umask(mask)
+    return mask
@@ -1,37 +1,434 @@
+"""
+logger.py
+-------------
+Shared logging setup for all modules.
+
+Features:
+- One rotating log file plus console output, shared by every module logger
+- Nothing touches the disk until the first record is written
+- Levels and handlers can be changed at runtime with configure_logging()
+- Optional asynchronous mode: callers only enqueue records, and a background
+  QueueListener formats and writes them
+- Queued records are flushed at process exit; worker processes, which exit
+  without running atexit, write straight to the handlers instead of queueing
+- Records logged while configure_logging() swaps handlers are held back and
+  written by the new handlers, so reconfiguring never drops a record
+- Rate-limited, sampled loggers that fold repeated messages into counters
+  and emit periodic summaries
+
+Environment variables TRANSFORMER_LOG_LEVEL, TRANSFORMER_LOG_DIR and
+TRANSFORMER_LOG_ASYNC ("1"/"true") set the initial configuration.
+
+Author: Jobet Casquejo
+"""
+
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import os
+import queue
+import sys
+import threading
+import time
 
-LOG_DIR = "logs"
+LOG_DIR = os.environ.get("TRANSFORMER_LOG_DIR", "logs")
 LOG_FILE = "transformer.log"
 MAX_BYTES = 5 * 1024 * 1024  # 5 MB
 BACKUP_COUNT = 5
 
-os.makedirs(LOG_DIR, exist_ok=True)
 log_path = os.path.join(LOG_DIR, LOG_FILE)
 
+FILE_FORMAT = "[%(asctime)s] [%(levelname)s] [%(name)s] - %(message)s"
+CONSOLE_FORMAT = "[%(levelname)s] %(message)s"
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_settings = {
+    "level": os.environ.get("TRANSFORMER_LOG_LEVEL", "DEBUG"),
+    "file_level": logging.INFO,
+    "console_level": logging.DEBUG,
+    "async_mode": os.environ.get("TRANSFORMER_LOG_ASYNC", "").lower() in ("1", "true", "yes"),
+    "log_dir": LOG_DIR,
+}
+
+_lock = threading.RLock()
+_loggers = {}       # name -> logger configured through get_logger()
+_sinks = []         # file and console handlers that do the actual output
+_owned = set()      # handlers this module attached to loggers
+_queue_handler = None
+_listener = None
+_rate_limited = {}  # name -> RateLimitedLogger
+
+
+class _LazyRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that creates its directory when the file is first opened.
+    """
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class _ConsoleHandler(logging.StreamHandler):
+    """
+    StreamHandler that always writes to the current ``sys.stderr``, so records
+    emitted late (e.g. exit-time summaries) follow stream redirection.
+    """
+
+    @property
+    def stream(self):
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class _HoldingHandler(logging.Handler):
+    """
+    Handler that stands in for the real ones while they are being replaced.
+
+    Records are buffered until replay() is given the new handlers; the
+    buffer is then written to them, and any later record (from a thread
+    that picked up this handler just before the swap) is forwarded directly.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._held = []
+        self._targets = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._targets is None:
+            self._held.append(record)
+        else:
+            self._forward(record)
+
+    def replay(self, targets: list) -> None:
+        with self.lock:
+            self._targets = targets
+            held, self._held = self._held, []
+            for record in held:
+                self._forward(record)
+
+    def _forward(self, record: logging.LogRecord) -> None:
+        for handler in self._targets:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+class _DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that enqueues records untouched.
+
+    The stock handler formats the message on the calling thread; here the
+    listener thread does all formatting when a sink actually emits.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _to_level(level) -> int:
+    if isinstance(level, str):
+        value = logging.getLevelName(level.upper())
+        if not isinstance(value, int):
+            raise ValueError(f"Unknown logging level: {level!r}")
+        return value
+    return int(level)
+
+
+def _build_sinks() -> list:
+    file_handler = _LazyRotatingFileHandler(
+        os.path.join(_settings["log_dir"], LOG_FILE),
+        maxBytes=MAX_BYTES,
+        backupCount=BACKUP_COUNT,
+        encoding="utf-8",
+        delay=True,
+    )
+    file_handler.setFormatter(logging.Formatter(FILE_FORMAT, datefmt=DATE_FORMAT))
+    file_handler.setLevel(_to_level(_settings["file_level"]))
+
+    console_handler = _ConsoleHandler()
+    console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+    console_handler.setLevel(_to_level(_settings["console_level"]))
+    return [file_handler, console_handler]
+
+
+def _in_worker_process() -> bool:
+    # multiprocessing is always imported in its worker processes, and names
+    # them before unpickling the work (and so before importing this module).
+    mp = sys.modules.get("multiprocessing")
+    if mp is None:
+        return False
+    return mp.parent_process() is not None or mp.current_process().name != "MainProcess"
+
+
+def _use_queue() -> bool:
+    # Worker processes end with os._exit(), so records still queued there at
+    # exit would be lost; they write straight to the sinks instead.
+    return _settings["async_mode"] and not _in_worker_process()
+
+
+def _handlers() -> list:
+    return [_queue_handler] if _use_queue() else list(_sinks)
+
+
+def _start_listener() -> None:
+    global _queue_handler, _listener
+    record_queue = queue.SimpleQueue()
+    _queue_handler = _DeferredQueueHandler(record_queue)
+    _listener = QueueListener(record_queue, *_sinks, respect_handler_level=True)
+    _listener.start()
+
+
+def _stop_listener() -> None:
+    global _queue_handler, _listener
+    if _listener is not None:
+        _listener.stop()  # drains every queued record before returning
+    _listener = None
+    _queue_handler = None
+
+
+def _attach(logger: logging.Logger, handlers: list = None) -> None:
+    if handlers is None:
+        handlers = _handlers()
+    logger.setLevel(_to_level(_settings["level"]))
+    # Swap the whole list at once, so a concurrent record sees either the old
+    # handlers or the new ones, never neither or both.
+    logger.handlers = [handler for handler in logger.handlers if handler not in _owned] + handlers
+    _owned.update(handlers)
+
+
+def _hold_records() -> _HoldingHandler:
+    holder = _HoldingHandler()
+    for logger in _loggers.values():
+        _attach(logger, [holder])
+    _owned.clear()
+    _owned.add(holder)
+    return holder
+
+
+def _release_records(holder: _HoldingHandler) -> None:
+    handlers = _handlers()
+    for logger in _loggers.values():
+        _attach(logger, handlers)
+    _owned.discard(holder)
+    holder.replay(handlers)
+
+
+def _ensure_configured() -> None:
+    if not _sinks:
+        _sinks.extend(_build_sinks())
+    if _use_queue() and _listener is None:
+        _start_listener()
+
+
 def get_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
-
-    if not logger.handlers:
-        file_handler = RotatingFileHandler(
-            log_path, maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT, encoding="utf-8"
-        )
-        file_formatter = logging.Formatter(
-            "[%(asctime)s] [%(levelname)s] [%(name)s] - %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S",
-        )
-        file_handler.setFormatter(file_formatter)
-        file_handler.setLevel(logging.INFO)
-        logger.addHandler(file_handler)
-
-        console_handler = logging.StreamHandler()
-        console_formatter = logging.Formatter(
-            "[%(levelname)s] %(message)s"
-        )
-        console_handler.setFormatter(console_formatter)
-        console_handler.setLevel(logging.DEBUG)
-        logger.addHandler(console_handler)
-
-    return logger
\ No newline at end of file
+    with _lock:
+        _ensure_configured()
+        if name not in _loggers:
+            _loggers[name] = logger
+            _attach(logger)
+    return logger
+
+
+def configure_logging(
+    level=None,
+    file_level=None,
+    console_level=None,
+    async_mode: bool = None,
+    log_dir: str = None,
+) -> None:
+    """
+    Change logging configuration at runtime for every logger from get_logger().
+
+    Args:
+        level: Logger level (name or number); records below it are dropped before
+            any formatting happens.
+        file_level: Minimum level written to the rotating log file.
+        console_level: Minimum level written to the console.
+        async_mode (bool): Enqueue records and write them from a background thread.
+        log_dir (str): Directory for the rotating log file.
+    """
+    global log_path
+    with _lock:
+        updates = {
+            "level": level,
+            "file_level": file_level,
+            "console_level": console_level,
+            "async_mode": async_mode,
+            "log_dir": log_dir,
+        }
+        for key, value in updates.items():
+            if value is not None:
+                if key.endswith("level"):
+                    _to_level(value)
+                _settings[key] = value
+
+        holder = _hold_records()
+        _stop_listener()
+        for sink in _sinks:
+            sink.close()
+        _sinks.clear()
+        log_path = os.path.join(_settings["log_dir"], LOG_FILE)
+        _ensure_configured()
+        _release_records(holder)
+
+
+def shutdown_logging() -> None:
+    """
+    Flush queued records and close the log handlers. Registered to run at exit.
+    """
+    with _lock:
+        holder = _hold_records() if _listener is not None else None
+        _stop_listener()
+        for sink in _sinks:
+            try:
+                sink.flush()
+                sink.close()
+            except (OSError, ValueError):
+                # The stream may already be closed during interpreter shutdown.
+                pass
+        if holder is not None:
+            # Keep later records flowing through plain handlers.
+            _settings["async_mode"] = False
+            _release_records(holder)
+
+
+class RateLimitedLogger:
+    """
+    Aggregate repeated log messages per key instead of emitting every one.
+
+    Within each ``interval`` seconds, the first ``burst`` records for a key
+    are emitted normally. Later ones are only counted, except that every
+    ``sample_every``-th suppressed record is still emitted when sampling is
+    enabled. When the interval elapses (or on ``flush()``), a summary such
+    as "transform_failed:Age: 12,403 occurrences in 60s (12,398 suppressed)"
+    is logged. Messages use lazy %-style arguments, so suppressed records
+    are never formatted.
+    """
+
+    def __init__(self, logger: logging.Logger, interval: float = 60.0, burst: int = 5, sample_every: int = None):
+        self.logger = logger
+        self.interval = interval
+        self.burst = burst
+        self.sample_every = sample_every
+        self._lock = threading.Lock()
+        self._windows = {}  # key -> [window_start, total, suppressed, level]
+        self._totals = {}
+        self._next_sweep = time.monotonic() + interval
+
+    def log(self, level: int, key: str, msg: str, *args) -> None:
+        if not self.logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        with self._lock:
+            self._totals[key] = self._totals.get(key, 0) + 1
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.interval:
+                if window is not None:
+                    self._summarize(key, window, now)
+                window = self._windows[key] = [now, 0, 0, level]
+            window[1] += 1
+            window[3] = max(window[3], level)
+            emit = window[1] <= self.burst
+            if not emit:
+                window[2] += 1
+                emit = bool(self.sample_every) and window[2] % self.sample_every == 0
+            if now >= self._next_sweep:
+                self._sweep(now)
+        if emit:
+            self.logger.log(level, msg, *args)
+
+    def debug(self, key: str, msg: str, *args) -> None:
+        self.log(logging.DEBUG, key, msg, *args)
+
+    def info(self, key: str, msg: str, *args) -> None:
+        self.log(logging.INFO, key, msg, *args)
+
+    def warning(self, key: str, msg: str, *args) -> None:
+        self.log(logging.WARNING, key, msg, *args)
+
+    def error(self, key: str, msg: str, *args) -> None:
+        self.log(logging.ERROR, key, msg, *args)
+
+    def counts(self) -> dict:
+        """
+        Return the total number of records seen per key since creation.
+        """
+        with self._lock:
+            return dict(self._totals)
+
+    def flush(self) -> None:
+        """
+        Emit summaries for every key with suppressed records and start new windows.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for key, window in list(self._windows.items()):
+                self._summarize(key, window, now)
+            self._windows.clear()
+
+    def _sweep(self, now: float) -> None:
+        # Summarize keys whose window has elapsed even if they were not logged again.
+        for key, window in list(self._windows.items()):
+            if now - window[0] >= self.interval:
+                self._summarize(key, window, now)
+                del self._windows[key]
+        self._next_sweep = now + self.interval
+
+    def _summarize(self, key: str, window: list, now: float) -> None:
+        start, total, suppressed, level = window
+        if suppressed:
+            self.logger.log(
+                level,
+                "%s: %s occurrences in %.0fs (%s suppressed)",
+                key, f"{total:,}", now - start, f"{suppressed:,}",
+            )
+
+
+def get_rate_limited_logger(
+    name: str,
+    interval: float = None,
+    burst: int = None,
+    sample_every: int = None,
+) -> RateLimitedLogger:
+    """
+    Return the shared RateLimitedLogger for ``name``, updating any options given.
+    """
+    with _lock:
+        limiter = _rate_limited.get(name)
+        if limiter is None:
+            limiter = _rate_limited[name] = RateLimitedLogger(get_logger(name))
+        if interval is not None:
+            limiter.interval = interval
+        if burst is not None:
+            limiter.burst = burst
+        if sample_every is not None:
+            limiter.sample_every = sample_every or None
+        return limiter
+
+
+def _flush_rate_limited() -> None:
+    for limiter in list(_rate_limited.values()):
+        limiter.flush()
+
+
+def _reset_after_fork() -> None:
+    # The listener thread does not survive fork(), and forked workers exit
+    # without running atexit, so the child writes straight to the sinks.
+    global _lock, _queue_handler, _listener
+    _lock = threading.RLock()
+    if _settings["async_mode"]:
+        _settings["async_mode"] = False
+        _queue_handler = _listener = None
+        for logger in _loggers.values():
+            _attach(logger)
+
+
+atexit.register(shutdown_logging)
+atexit.register(_flush_rate_limited)  # atexit runs in reverse: summaries go out before shutdown
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
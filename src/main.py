@@ -0,0 +1,455 @@
+"""
+main.py
+-------------
+Headless batch runner: parse -> rename -> transform -> validate -> export for
+every input file, driven by a JSON config file.
+
+Features:
+- Discovers inputs by glob patterns under an input directory
+- Processes files on a process or thread pool with a bounded number of files
+  in flight, so huge input directories never queue up all at once
+- A failing file is logged and counted; the batch carries on
+- NDJSON (.ndjson/.jsonl) inputs: malformed lines are written with their line
+  numbers to ``<output>.rejects.ndjson`` instead of failing the file
+- Optional incremental mode (content-hash manifest) and parsed-frame cache
+- ``json_decoder`` selects the JSON backend ("auto" picks orjson etc. when installed)
+- Prints a final throughput summary: files/s, rows/s and failures
+- ``--watch`` runs as a long-lived service instead (see src/watcher.py)
+
+Usage:
+    python src/main.py --config config/config.json [--workers 8] [--input DIR] [--output DIR]
+    python src/main.py --watch
+
+Exit status is 0 when every file succeeded, 1 when any file failed and 2 for
+configuration errors. In watch mode SIGTERM/SIGINT drain the queue and exit 0.
+
+Author: Jobet Casquejo
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+
+if __package__ in (None, ""):
+    # Run as ``python src/main.py``: make the ``src`` package importable.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.logger import configure_logging, get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CONFIG_PATH = os.environ.get("TRANSFORMER_CONFIG", "config/config.json")
+
+DEFAULT_CONFIG = {
+    "input": {
+        "directory": "input",
+        "patterns": ["*.json", "*.xml", "*.ndjson", "*.jsonl"],
+        "recursive": False,
+        "record_tag": None,
+        "ndjson_workers": None,
+    },
+    "output": {
+        "directory": "output",
+        "format": "csv",
+    },
+    "workers": os.cpu_count() or 1,
+    "executor": "process",
+    "max_in_flight": None,
+    "column_mapping": {},
+    "transformations": {},
+    "validation": {
+        "required_fields": [],
+        "field_types": {},
+    },
+    "json_decoder": "auto",
+    "incremental": False,
+    "cache": {
+        "directory": None,
+        "max_bytes": 1024 * 1024 * 1024,
+    },
+    "watch": {
+        "mode": "auto",
+        "poll_interval": 1.0,
+        "settle_seconds": 2.0,
+        "queue_size": 100,
+        "manifest_save_interval": 5.0,
+    },
+    "log_level": None,
+}
+
+# Output format -> (file suffix, exporter function name in src.exporter)
+OUTPUT_FORMATS = {
+    "csv": (".csv", "export_to_csv"),
+    "excel": (".xlsx", "export_to_excel"),
+    "parquet": (".parquet", "export_to_parquet"),
+    "feather": (".arrow", "export_to_feather"),
+}
+
+FIELD_TYPE_NAMES = ("int", "float", "str", "bool", "datetime")
+MANIFEST_NAME = ".manifest.json"
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+
+
+def _merge(base: dict, overrides: dict) -> dict:
+    merged = copy.deepcopy(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict) and merged[key]:
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def load_config(config_path: str = None) -> dict:
+    """
+    Load a JSON config file and fill in defaults for every missing setting.
+
+    Raises:
+        FileNotFoundError: If an explicitly given config file does not exist.
+        ValueError: If the config is invalid.
+    """
+    overrides = {}
+    if config_path and os.path.exists(config_path):
+        with open(config_path, encoding="utf-8") as f:
+            overrides = json.load(f)
+        logger.info(f"Loaded config file: {config_path}")
+    elif config_path and config_path != DEFAULT_CONFIG_PATH:
+        raise FileNotFoundError(f"Config file not found: {config_path}")
+
+    config = _merge(DEFAULT_CONFIG, overrides)
+    if config["output"]["format"] not in OUTPUT_FORMATS:
+        raise ValueError(f"Unsupported output format: {config['output']['format']!r}")
+    if config["executor"] not in ("process", "thread"):
+        raise ValueError(f"Unsupported executor: {config['executor']!r}")
+    if config["watch"]["mode"] not in ("auto", "inotify", "poll"):
+        raise ValueError(f"Unsupported watch mode: {config['watch']['mode']!r}")
+    from src.decoders import decoder_name, get_decoder
+
+    get_decoder(config["json_decoder"])  # unknown or uninstalled backends are config errors
+    logger.info(f"JSON decoder: {decoder_name(config['json_decoder'])}")
+    if int(config["workers"]) < 1:
+        raise ValueError("workers must be a positive integer")
+    unknown = {
+        field: name for field, name in config["validation"]["field_types"].items() if name not in FIELD_TYPE_NAMES
+    }
+    if unknown:
+        raise ValueError(f"Unknown field types {unknown}; expected one of {FIELD_TYPE_NAMES}")
+    return config
+
+
+def discover_inputs(input_config: dict) -> list[str]:
+    """
+    Return the sorted input files matching the configured glob patterns.
+    """
+    directory = Path(input_config["directory"])
+    if not directory.is_dir():
+        raise FileNotFoundError(f"Input directory not found: {directory}")
+    glob = directory.rglob if input_config.get("recursive") else directory.glob
+    files = {path for pattern in input_config["patterns"] for path in glob(pattern) if path.is_file()}
+    return sorted(str(path) for path in files)
+
+
+def output_path_for(input_path: str, config: dict) -> str:
+    """
+    Return the export path for ``input_path``, mirroring its location under the input directory.
+    """
+    suffix, _ = OUTPUT_FORMATS[config["output"]["format"]]
+    relative = os.path.relpath(input_path, config["input"]["directory"])
+    return os.path.join(config["output"]["directory"], os.path.splitext(relative)[0] + suffix)
+
+
+def output_collisions(files: list, config: dict) -> dict:
+    """
+    Map every input whose export path is shared with another input (e.g. ``data.json``
+    and ``data.xml`` both export to ``data.csv``) to a ValueError naming the others.
+    """
+    targets = {}
+    for input_path in files:
+        targets.setdefault(os.path.normcase(output_path_for(input_path, config)), []).append(input_path)
+    collisions = {}
+    for output_path, inputs in targets.items():
+        if len(inputs) < 2:
+            continue
+        for input_path in inputs:
+            others = ", ".join(repr(other) for other in inputs if other != input_path)
+            collisions[input_path] = ValueError(f"Output path '{output_path}' is also the target of {others}")
+    return collisions
+
+
+def process_file(input_path: str, config: dict) -> dict:
+    """
+    Run one file through the pipeline and return a result summary.
+
+    Never raises: failures are reported in the ``error`` field, so one bad file
+    cannot stop the batch. Rows failing validation are dropped from the export
+    and written, with the failed rules, to ``<output>.invalid.csv``. A file left
+    with no rows fails, after its invalid-rows and rejects files are written.
+    """
+    from src import exporter
+    from src.decoders import set_default_decoder
+    from src.transformer import (
+        json_file_to_dataframe,
+        ndjson_to_dataframe,
+        rename_columns,
+        transform_dataframe,
+        xml_to_dataframe,
+    )
+    from src.validator import validate_rows
+
+    start = time.perf_counter()
+    result = {
+        "input": input_path,
+        "output": None,
+        "rejects": None,
+        "rows_in": 0,
+        "rows_out": 0,
+        "rejected": 0,
+        "invalid_rows": None,
+        "invalid": 0,
+        "seconds": 0.0,
+        "error": None,
+    }
+    rejects = []
+    try:
+        set_default_decoder(config["json_decoder"])
+        cache = None
+        if config["cache"]["directory"]:
+            from src.cache import DataFrameCache
+            cache = DataFrameCache(config["cache"]["directory"], config["cache"]["max_bytes"])
+
+        suffix = Path(input_path).suffix.lower()
+        if suffix == ".json":
+            df = json_file_to_dataframe(input_path, cache=cache)
+        elif suffix in NDJSON_SUFFIXES:
+            df = ndjson_to_dataframe(input_path, workers=config["input"]["ndjson_workers"], rejects=rejects)
+        elif suffix == ".xml":
+            record_tag = config["input"]["record_tag"]
+            if not record_tag:
+                raise ValueError("input.record_tag is required for XML files")
+            df = xml_to_dataframe(input_path, record_tag, cache=cache)
+        else:
+            raise ValueError(f"Unsupported input file type: {suffix!r}")
+        result["rows_in"] = len(df)
+
+        if config["column_mapping"]:
+            df = rename_columns(df, config["column_mapping"])
+        if config["transformations"]:
+            df = transform_dataframe(df, config["transformations"])
+        validation = config["validation"]
+        invalid = None
+        if validation["required_fields"] or validation["field_types"]:
+            checked = df
+            df, invalid = validate_rows(df, validation["required_fields"], validation["field_types"])
+        result["rows_out"] = len(df)
+
+        output_path = output_path_for(input_path, config)
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        # Written before the export, so they are there to explain a file with no rows left.
+        result["rejected"] = len(rejects)
+        result["rejects"] = _write_rejects(rejects, output_path)
+        if invalid is not None:
+            result["invalid_rows"] = _write_invalid_rows(checked, invalid, output_path)
+            result["invalid"] = int(invalid["row"].nunique())
+        if df.empty:
+            raise ValueError(
+                f"No rows left to export ({result['rows_in']} read, {result['invalid']} invalid, "
+                f"{result['rejected']} malformed lines rejected)"
+            )
+        _, export_name = OUTPUT_FORMATS[config["output"]["format"]]
+        getattr(exporter, export_name)(df, output_path)
+        result["output"] = output_path
+    except Exception as e:
+        logger.exception(f"Failed to process '{input_path}'")
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def _write_rejects(rejects: list, output_path: str) -> str | None:
+    from src.fileutils import atomic_output
+
+    rejects_path = os.path.splitext(output_path)[0] + ".rejects.ndjson"
+    if not rejects:
+        if os.path.exists(rejects_path):
+            os.remove(rejects_path)  # left by an earlier run; it no longer describes this input
+        return None
+    with atomic_output(rejects_path) as temp_path:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            for reject in rejects:
+                f.write(json.dumps(reject, ensure_ascii=False) + "\n")
+    logger.warning(f"Wrote {len(rejects)} rejected lines to '{rejects_path}'")
+    return rejects_path
+
+
+def _write_invalid_rows(df, invalid, output_path: str) -> str | None:
+    from src.exporter import export_chunks_to_csv
+
+    invalid_path = os.path.splitext(output_path)[0] + ".invalid.csv"
+    if invalid.empty:
+        if os.path.exists(invalid_path):
+            os.remove(invalid_path)  # left by an earlier run; it no longer describes this input
+        return None
+    errors = (invalid["field"].astype(str) + ":" + invalid["rule"]).groupby(invalid["row"], sort=False).agg("; ".join)
+    rows = df[df.index.isin(errors.index)]
+    export_chunks_to_csv([rows.assign(_errors=rows.index.map(errors))], invalid_path)
+    logger.warning(f"Wrote {len(rows)} rows that failed validation to '{invalid_path}'")
+    return invalid_path
+
+
+def run_batch(config: dict) -> dict:
+    """
+    Process every discovered input on a bounded worker pool and return the batch summary.
+    """
+    files = discover_inputs(config["input"])
+    # Checked against every input, not only the changed ones, since an unchanged
+    # input still owns its export. Colliding inputs fail without being processed.
+    collisions = output_collisions(files, config)
+    for input_path, error in collisions.items():
+        logger.error(f"Not processing '{input_path}': {error}")
+    manifest = None
+    if config["incremental"]:
+        from src.manifest import FileManifest
+        manifest = FileManifest(os.path.join(config["output"]["directory"], MANIFEST_NAME))
+        manifest.stale_outputs(files)
+        files = manifest.changed([path for path in files if path not in collisions])
+    else:
+        files = [path for path in files if path not in collisions]
+
+    workers = min(int(config["workers"]), max(1, len(files)))
+    max_in_flight = config["max_in_flight"] or workers * 2
+    logger.info(f"Processing {len(files)} files with {workers} {config['executor']} workers")
+
+    pool_class = ProcessPoolExecutor if config["executor"] == "process" else ThreadPoolExecutor
+    results = [_error_result(input_path, error) for input_path, error in collisions.items()]
+    start = time.perf_counter()
+    try:
+        with pool_class(max_workers=workers) as pool:
+            pending = {}  # future -> input path
+            for input_path in files:
+                if len(pending) >= max_in_flight:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    results.extend(_collect({future: pending.pop(future) for future in done}, manifest))
+                try:
+                    pending[pool.submit(process_file, input_path, config)] = input_path
+                except Exception as e:  # e.g. BrokenProcessPool after a worker died
+                    results.append(_error_result(input_path, e))
+            results.extend(_collect(pending, manifest))
+    finally:
+        if manifest is not None:
+            manifest.save()
+    elapsed = time.perf_counter() - start
+
+    failed = [result for result in results if result["error"]]
+    rows = sum(result["rows_out"] for result in results)
+    return {
+        "files": len(results),
+        "succeeded": len(results) - len(failed),
+        "failed": len(failed),
+        "failures": {result["input"]: result["error"] for result in failed},
+        "rows_in": sum(result["rows_in"] for result in results),
+        "rows_out": rows,
+        "rejected": sum(result.get("rejected", 0) for result in results),
+        "seconds": elapsed,
+        "files_per_second": len(results) / elapsed if elapsed else 0.0,
+        "rows_per_second": rows / elapsed if elapsed else 0.0,
+    }
+
+
+def _collect(futures: dict, manifest) -> list:
+    # ``futures`` maps each future to its input path.
+    results = []
+    for future, input_path in futures.items():
+        try:
+            result = future.result()
+        except Exception as e:  # the worker died (OOM, segfault) or the pool broke
+            logger.error(f"Worker failed while processing '{input_path}': {type(e).__name__}: {e}")
+            result = _error_result(input_path, e)
+        if result["error"] is None and manifest is not None:
+            manifest.record(result["input"], outputs=outputs_of(result))
+        results.append(result)
+    return results
+
+
+def _error_result(input_path: str, error: Exception) -> dict:
+    return {
+        "input": input_path,
+        "output": None,
+        "rows_in": 0,
+        "rows_out": 0,
+        "seconds": 0.0,
+        "error": f"{type(error).__name__}: {error}",
+    }
+
+
+def outputs_of(result: dict) -> list:
+    """
+    Return the files written for a ``process_file`` result: the export and any rejects file.
+    """
+    return [result["output"]] + [result[key] for key in ("rejects", "invalid_rows") if result.get(key)]
+
+
+def format_summary(summary: dict) -> str:
+    lines = [
+        f"Processed {summary['files']} files in {summary['seconds']:.2f}s "
+        f"({summary['succeeded']} succeeded, {summary['failed']} failed)",
+        f"Rows: {summary['rows_out']:,} written of {summary['rows_in']:,} read"
+        + (f", {summary['rejected']:,} malformed lines rejected" if summary.get("rejected") else ""),
+        f"Throughput: {summary['files_per_second']:.2f} files/s, {summary['rows_per_second']:,.0f} rows/s",
+    ]
+    lines.extend(f"FAILED {path}: {error}" for path, error in sorted(summary["failures"].items()))
+    return "\n".join(lines)
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(description="Transform JSON/XML files in batch.")
+    parser.add_argument("--config", default=DEFAULT_CONFIG_PATH, help="JSON config file")
+    parser.add_argument("--input", help="Override input.directory")
+    parser.add_argument("--output", help="Override output.directory")
+    parser.add_argument("--format", choices=sorted(OUTPUT_FORMATS), help="Override output.format")
+    parser.add_argument("--workers", type=int, help="Override workers")
+    parser.add_argument("--watch", action="store_true", help="Keep running and process files as they arrive")
+    args = parser.parse_args(argv)
+
+    try:
+        config = load_config(args.config)
+        if args.input:
+            config["input"]["directory"] = args.input
+        if args.output:
+            config["output"]["directory"] = args.output
+        if args.format:
+            config["output"]["format"] = args.format
+        if args.workers:
+            config["workers"] = args.workers
+        if config["log_level"]:
+            configure_logging(level=config["log_level"])
+        if args.watch:
+            return _watch(config)
+        summary = run_batch(config)
+    except (FileNotFoundError, ValueError, json.JSONDecodeError) as e:
+        logger.error(f"Invalid configuration: {e}")
+        return 2
+
+    print(format_summary(summary))
+    return 1 if summary["failed"] else 0
+
+
+def _watch(config: dict) -> int:
+    import signal
+
+    from src.watcher import FolderWatcher
+
+    watcher = FolderWatcher(config)
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: watcher.stop())
+    counts = watcher.run()
+    print(f"Watcher drained: {counts['processed']} processed, {counts['failed']} failed, {counts['skipped']} unchanged")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""
+manifest.py
+-------------
+Content-hash manifest for incremental runs.
+
+Features:
+- Tracks every processed input by path, size, modification time and content hash
+- Cheap change detection: size and mtime are compared first, and a file is
+  only hashed when they differ from the recorded values
+- Files whose mtime changed but whose content did not (touch, re-copy) are
+  still treated as unchanged
+- Reports outputs recorded for inputs that have since been deleted
+- Written atomically, and only on save(), so an interrupted run leaves the
+  previous manifest intact and its files are simply processed again
+- Integrated logging
+
+Author: Jobet Casquejo
+"""
+
+import hashlib
+import json
+import os
+
+from src.fileutils import atomic_output
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+MANIFEST_VERSION = 1
+HASH_BLOCK_SIZE = 1024 * 1024  # 1 MB
+
+
+def file_hash(path: str, algorithm: str = "sha256") -> str:
+    """
+    Return the hex digest of a file's content, read in 1 MB blocks.
+    """
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class FileManifest:
+    """
+    Persistent record of which input files have already been processed.
+
+    Typical use::
+
+        manifest = FileManifest("output/.manifest.json")
+        data = load_multiple_json(files, manifest=manifest)
+        ...  # export
+        manifest.save()
+
+    ``changed()`` selects the new or modified files, ``record()`` marks a file
+    as processed (optionally with the outputs produced from it), and
+    ``save()`` commits the records. Nothing is persisted before ``save()``.
+
+    Args:
+        manifest_path (str): JSON file holding the manifest. It does not need to exist yet.
+        algorithm (str): hashlib algorithm used for content hashes.
+    """
+
+    def __init__(self, manifest_path: str, algorithm: str = "sha256"):
+        self.manifest_path = manifest_path
+        self.algorithm = algorithm
+        self.entries = {}
+        self.hashed = 0
+        self._observed = {}  # path -> (size, mtime_ns, hash) seen during this run
+
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as f:
+                document = json.load(f)
+            if document.get("algorithm", algorithm) != algorithm:
+                logger.warning(
+                    f"Manifest '{manifest_path}' uses {document['algorithm']} hashes; "
+                    f"every file will be treated as changed"
+                )
+            else:
+                self.entries = document.get("files", {})
+            logger.info(f"Loaded manifest '{manifest_path}' with {len(self.entries)} entries")
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normpath(str(path))
+
+    def is_changed(self, path: str) -> bool:
+        """
+        Return True if ``path`` is new or its content differs from the recorded hash.
+
+        A file that no longer exists counts as changed, so the caller's load
+        reports it like any other missing input. The size, mtime and hash seen
+        here are what ``record()`` stores later.
+        """
+        key = self._key(path)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            logger.warning(f"Input '{path}' disappeared before it could be checked")
+            self._observed.pop(key, None)
+            return True
+        entry = self.entries.get(key)
+        if entry is not None and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+            self._observed[key] = (stat.st_size, stat.st_mtime_ns, entry["hash"])
+            return False
+
+        # New file, or size/mtime moved: only the content hash can tell.
+        content_hash = file_hash(path, self.algorithm)
+        self.hashed += 1
+        self._observed[key] = (stat.st_size, stat.st_mtime_ns, content_hash)
+        if entry is not None and entry["hash"] == content_hash:
+            # Same bytes with a new mtime; refresh the stat values so the next run skips hashing.
+            entry["size"], entry["mtime_ns"] = stat.st_size, stat.st_mtime_ns
+            return False
+        return True
+
+    def changed(self, paths: list) -> list:
+        """
+        Return the new or modified files among ``paths``, preserving their order.
+        """
+        paths = list(paths)
+        result = [path for path in paths if self.is_changed(path)]
+        logger.info(
+            f"{len(result)} of {len(paths)} files are new or changed "
+            f"({self.hashed} hashed, {len(paths) - len(result)} unchanged)"
+        )
+        return result
+
+    def signature(self, path: str) -> tuple:
+        """
+        Return ``(size, mtime_ns, hash)`` for ``path`` as it is now.
+        """
+        stat = os.stat(path)
+        self.hashed += 1
+        return stat.st_size, stat.st_mtime_ns, file_hash(path, self.algorithm)
+
+    def record(self, path: str, outputs: list = None, signature: tuple = None) -> None:
+        """
+        Mark ``path`` as processed.
+
+        The stored size, mtime and hash must describe the content that was
+        processed, so they are taken from before the file was loaded: the
+        ``signature`` given, else the one ``is_changed()`` saw, else the file
+        as it is now. If the file changed after that, the next run sees the
+        difference and processes it again.
+
+        Args:
+            path (str): Input file.
+            outputs (list, optional): Output files produced from it. Previously recorded
+                outputs are kept when omitted.
+            signature (tuple, optional): ``signature(path)`` taken before the file was loaded.
+        """
+        key = self._key(path)
+        observed = self._observed.pop(key, None)
+        if signature is None:
+            signature = observed if observed is not None else self.signature(path)
+        previous = self.entries.get(key, {})
+        self.entries[key] = {
+            "size": signature[0],
+            "mtime_ns": signature[1],
+            "hash": signature[2],
+            "outputs": list(outputs) if outputs is not None else previous.get("outputs", []),
+        }
+
+    def forget(self, path: str) -> None:
+        """
+        Drop ``path`` from the manifest.
+        """
+        self.entries.pop(self._key(path), None)
+
+    def deleted(self, paths: list = None) -> list:
+        """
+        Return recorded inputs that no longer exist.
+
+        Args:
+            paths (list, optional): The current set of inputs. When given, recorded files
+                missing from it also count as deleted, even if they still exist on disk.
+        """
+        if paths is not None:
+            current = {self._key(path) for path in paths}
+            return [key for key in self.entries if key not in current]
+        return [key for key in self.entries if not os.path.exists(key)]
+
+    def stale_outputs(self, paths: list = None) -> dict:
+        """
+        Return ``{deleted input: [outputs]}`` for deleted inputs whose outputs still exist.
+
+        Stale outputs are only reported, never removed. Call ``forget()`` once they
+        have been dealt with.
+        """
+        stale = {}
+        for key in self.deleted(paths):
+            outputs = [output for output in self.entries[key].get("outputs", []) if os.path.exists(output)]
+            if outputs:
+                stale[key] = outputs
+        if stale:
+            logger.warning(f"{len(stale)} deleted inputs left stale outputs: {stale}")
+        return stale
+
+    def save(self) -> None:
+        """
+        Atomically write the manifest to ``manifest_path``.
+        """
+        document = {"version": MANIFEST_VERSION, "algorithm": self.algorithm, "files": self.entries}
+        with atomic_output(self.manifest_path) as temp_path:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(document, f, indent=2, sort_keys=True)
+        logger.info(f"Saved manifest '{self.manifest_path}' with {len(self.entries)} entries")
@@ -0,0 +1,272 @@
+"""
+metrics.py
+-------------
+Per-stage instrumentation for the parser, transformer, validator and exporter.
+
+Features:
+- Wall time, CPU time, row counts, bytes read/written and peak memory per stage
+  (traced peak with track_memory, otherwise only the process-wide max RSS)
+- In-process API (get_metrics) plus JSON and Prometheus text-format dumps
+- Disabled by default; a disabled stage costs one flag check per call
+- Enable with enable() or the TRANSFORMER_METRICS=1 environment variable
+
+Metrics are collected per process: stages that run in worker processes are
+recorded in those workers.
+
+Author: Jobet Casquejo
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+from src.fileutils import atomic_output
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_enabled = os.environ.get("TRANSFORMER_METRICS", "").lower() in ("1", "true", "yes")
+_track_memory = False
+_lock = threading.Lock()
+_stages = {}
+_signatures = {}  # function -> inspect.Signature
+_frames = threading.local()  # per-thread stack of peaks carried by enclosing measured calls
+
+_COUNTERS = ("calls", "errors", "wall_seconds", "cpu_seconds", "rows", "bytes_read", "bytes_written")
+
+
+def enable(track_memory: bool = False) -> None:
+    """
+    Start recording stage metrics.
+
+    Args:
+        track_memory (bool): Measure peak Python allocations per call with tracemalloc.
+            This is precise but slows allocation-heavy stages noticeably; without it
+            ``peak_memory_bytes`` stays 0 and ``process_max_rss_bytes`` reports the
+            high-water mark of the whole process so far, not of the stage.
+    """
+    global _enabled, _track_memory
+    _track_memory = track_memory
+    if track_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _enabled = True
+
+
+def disable() -> None:
+    """
+    Stop recording stage metrics. Collected values are kept until reset().
+    """
+    global _enabled, _track_memory
+    _enabled = False
+    if _track_memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _track_memory = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset() -> None:
+    """
+    Discard every collected metric.
+    """
+    with _lock:
+        _stages.clear()
+
+
+def get_metrics() -> dict:
+    """
+    Return a snapshot of the collected metrics, keyed by stage name.
+    """
+    with _lock:
+        return {stage: dict(values) for stage, values in _stages.items()}
+
+
+def to_json(path: str = None) -> str:
+    """
+    Serialize the metrics as JSON, optionally writing them to ``path``.
+    """
+    text = json.dumps(get_metrics(), indent=2, sort_keys=True)
+    if path:
+        _write_text(path, text)
+    return text
+
+
+def to_prometheus(path: str = None, prefix: str = "transformer_stage") -> str:
+    """
+    Serialize the metrics in Prometheus text exposition format, optionally writing them to ``path``.
+    """
+    metrics = get_metrics()
+    lines = []
+    for counter in _COUNTERS:
+        name = f"{prefix}_{counter}_total"
+        lines.append(f"# HELP {name} Total {counter.replace('_', ' ')} per pipeline stage.")
+        lines.append(f"# TYPE {name} counter")
+        for stage, values in sorted(metrics.items()):
+            lines.append(f'{name}{{stage="{stage}"}} {values[counter]}')
+    gauges = (
+        ("peak_memory_bytes", "Peak traced memory observed during a call of the stage."),
+        ("process_max_rss_bytes", "Process max RSS since start, sampled after a call of the stage."),
+    )
+    for gauge, description in gauges:
+        name = f"{prefix}_{gauge}"
+        lines.append(f"# HELP {name} {description}")
+        lines.append(f"# TYPE {name} gauge")
+        for stage, values in sorted(metrics.items()):
+            lines.append(f'{name}{{stage="{stage}"}} {values[gauge]}')
+    text = "\n".join(lines) + "\n"
+    if path:
+        _write_text(path, text)
+    return text
+
+
+def instrument(stage: str = None, input_arg: str = None, output_arg: str = None, rows_arg: str = None):
+    """
+    Decorate a stage function so its calls are measured while metrics are enabled.
+
+    Args:
+        stage (str, optional): Stage name; defaults to the function name.
+        input_arg (str, optional): Parameter holding an input path; its size counts as bytes read.
+        output_arg (str, optional): Parameter holding an output path; its size after the call
+            counts as bytes written.
+        rows_arg (str, optional): Parameter whose length is the row count. By default rows are
+            taken from the return value (DataFrame rows, list length, or an int row count).
+    """
+    def decorator(func):
+        name = stage or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            return _measure(func, name, args, kwargs, input_arg, output_arg, rows_arg)
+
+        return wrapper
+
+    return decorator
+
+
+def _signature(func):
+    # inspect is slow to import; resolve signatures only once metrics are actually collected.
+    signature = _signatures.get(func)
+    if signature is None:
+        import inspect
+        signature = _signatures[func] = inspect.signature(func)
+    return signature
+
+
+def _measure(func, name, args, kwargs, input_arg, output_arg, rows_arg):
+    arguments = None
+    if input_arg or output_arg or rows_arg:
+        arguments = _signature(func).bind_partial(*args, **kwargs).arguments
+    bytes_read = _path_size(arguments.get(input_arg)) if input_arg else 0
+
+    track_memory = _track_memory and tracemalloc.is_tracing()
+    if track_memory:
+        stack = _peak_stack()
+        if stack:
+            # reset_peak() below also clears the enclosing call's peak; carry it over.
+            stack[-1] = max(stack[-1], tracemalloc.get_traced_memory()[1])
+        stack.append(0)
+        tracemalloc.reset_peak()
+    wall_start = time.perf_counter()
+    cpu_start = time.thread_time()
+    failed = False
+    result = None
+    try:
+        result = func(*args, **kwargs)
+        return result
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.thread_time() - cpu_start
+        peak = max_rss = 0
+        if track_memory:
+            peak = max(stack.pop(), tracemalloc.get_traced_memory()[1])
+            if stack:
+                stack[-1] = max(stack[-1], peak)
+        else:
+            max_rss = _max_rss_bytes()
+        rows = 0
+        if not failed:
+            rows = _count_rows(arguments.get(rows_arg) if rows_arg else result)
+        bytes_written = _path_size(arguments.get(output_arg)) if output_arg and not failed else 0
+        _record(name, failed, wall, cpu, rows, bytes_read, bytes_written, peak, max_rss)
+
+
+def _peak_stack() -> list:
+    stack = getattr(_frames, "peaks", None)
+    if stack is None:
+        stack = _frames.peaks = []
+    return stack
+
+
+def _record(name, failed, wall, cpu, rows, bytes_read, bytes_written, peak, max_rss) -> None:
+    with _lock:
+        values = _stages.get(name)
+        if values is None:
+            values = _stages[name] = dict.fromkeys(_COUNTERS, 0)
+            values["peak_memory_bytes"] = 0
+            values["process_max_rss_bytes"] = 0
+        values["calls"] += 1
+        values["errors"] += int(failed)
+        values["wall_seconds"] += wall
+        values["cpu_seconds"] += cpu
+        values["rows"] += rows
+        values["bytes_read"] += bytes_read
+        values["bytes_written"] += bytes_written
+        values["peak_memory_bytes"] = max(values["peak_memory_bytes"], peak)
+        values["process_max_rss_bytes"] = max(values["process_max_rss_bytes"], max_rss)
+
+
+def _count_rows(value) -> int:
+    if value is None:
+        return 0
+    shape = getattr(value, "shape", None)
+    if shape:
+        return int(shape[0])
+    if isinstance(value, dict):
+        return 1
+    if isinstance(value, (list, tuple)):
+        return len(value)
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    return 0
+
+
+def _path_size(path) -> int:
+    if not isinstance(path, (str, os.PathLike)):
+        return 0
+    try:
+        if os.path.isdir(path):
+            return sum(
+                os.path.getsize(os.path.join(root, name))
+                for root, _, names in os.walk(path)
+                for name in names
+            )
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def _max_rss_bytes() -> int:
+    if resource is None:
+        return 0
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def _write_text(path: str, text: str) -> None:
+    with atomic_output(path) as temp_path:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(text)
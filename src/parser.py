@@ -5,24 +5,51 @@ Parses JSON and XML files into Python objects for transformation.
 
 Features:
 - Load single or multiple JSON files (dict or list)
+- Pluggable JSON decoder (orjson/simdjson/ujson when installed, see src/decoders.py)
+  that decodes straight from bytes
+- Stream records from large top-level JSON arrays with bounded memory
+- Newline-delimited JSON: streaming, or parallel decoding of newline-aligned
+  byte ranges, with malformed lines collected as rejects
 - Load single or multiple XML files
+- Parse content that was already read (e.g. asynchronously) with the same checks
 - Handles empty files, BOM, whitespace, and malformed content
 - Optional safe mode: return None instead of raising exceptions
+- Parallel batch loading on a process or thread pool, preserving input order
+- Incremental batch loading that skips files unchanged since the last run
+- Fast to import: no pandas or numpy (unlike the DataFrame modules), and
+  worker pools are imported on first use
 - Integrated logging
 Author: Jobet Casquejo
 """
 
 import json
+import re
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterator
 import xml.etree.ElementTree as ET
+from src.decoders import decoder_name, get_decoder
 from src.logger import get_logger
+from src.metrics import instrument
+
+if TYPE_CHECKING:
+    # Only for annotations: the pools pull in multiprocessing, so they are imported on first use.
+    from concurrent.futures import Executor
+    from src.manifest import FileManifest
 
 logger = get_logger(__name__)
 
+READ_BLOCK_SIZE = 64 * 1024  # 64 KB
+_JSON_WHITESPACE = " \t\n\r"
+_JSON_DELIMITERS = _JSON_WHITESPACE + ",]"
+_JSON_DELIMITER_RE = re.compile(r"[ \t\n\r,\]}:]")
+_UTF8_BOM = b"\xef\xbb\xbf"
+NDJSON_CHUNK_BYTES = 16 * 1024 * 1024  # 16 MB per NDJSON byte range
+
 # -------------------------
 # JSON Parsing
 # -------------------------
-def load_json_file(file_path: str, safe: bool = True) -> dict | list | None:
+@instrument(input_arg="file_path")
+def load_json_file(file_path: str, safe: bool = True, decoder: str | None = None) -> dict | list | None:
     path = Path(file_path)
     if not path.is_file():
         msg = f"JSON file not found: {file_path}"
@@ -32,39 +59,419 @@ def load_json_file(file_path: str, safe: bool = True) -> dict | list | None:
         else:
             raise FileNotFoundError(msg)
 
+    return parse_json_bytes(path.read_bytes(), file_path, safe, decoder)
+
+
+def parse_json_bytes(
+    data: bytes | str,
+    source: str = "<bytes>",
+    safe: bool = True,
+    decoder: str | None = None,
+) -> dict | list | None:
+    """
+    Parse JSON content that has already been read, with the same BOM, empty-content
+    and error handling as ``load_json_file``. ``source`` names the input in log messages.
+    ``decoder`` forces a backend from ``src.decoders``; bytes are decoded without
+    first being copied into a str when the backend allows it.
+    """
     try:
-        content = path.read_text(encoding="utf-8-sig").strip()
-        if not content:
-            msg = f"JSON file is empty or contains only whitespace: {file_path}"
+        if isinstance(data, bytes) and data.startswith(_UTF8_BOM):
+            data = data[len(_UTF8_BOM):]
+        if not data or data.isspace():
+            msg = f"JSON file is empty or contains only whitespace: {source}"
             logger.error(msg)
             if safe:
                 return None
             else:
-                raise json.JSONDecodeError(msg, content, 0)
+                raise json.JSONDecodeError(msg, "", 0)
 
-        data = json.loads(content)
+        data = get_decoder(decoder)(data)
         return data
 
     except json.JSONDecodeError as e:
-        logger.exception(f"Failed to parse JSON file: {file_path}")
+        logger.exception(f"Failed to parse JSON file: {source}")
         if safe:
             return None
         else:
             raise e
 
 
-def load_multiple_json(files: list[str], safe: bool = True) -> list[dict | list]:
-    all_data = []
-    for file in files:
-        data = load_json_file(file, safe=safe)
-        if data is not None:
-            all_data.append(data)
-    return all_data
+def iter_json_records(
+    file_path: str,
+    chunk_size: int | None = None,
+    safe: bool = True,
+    read_size: int = READ_BLOCK_SIZE,
+) -> Iterator[dict | list]:
+    """
+    Incrementally yield the elements of a top-level JSON array.
+
+    The file is read in blocks of ``read_size`` characters and decoded one
+    element at a time, so memory stays bounded by the largest single record.
+    With ``chunk_size`` set, lists of up to that many records are yielded
+    instead of single records. A top-level object is yielded as one record.
+    Missing, empty and malformed files follow the ``safe`` semantics of
+    ``load_json_file``; records decoded before an error are still yielded,
+    and reading stops at the first malformed element.
+    """
+    path = Path(file_path)
+    if not path.is_file():
+        msg = f"JSON file not found: {file_path}"
+        logger.error(msg)
+        if safe:
+            return
+        raise FileNotFoundError(msg)
+
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+
+    batch = []
+    try:
+        for record in _iter_json_array(path, read_size):
+            if chunk_size is None:
+                yield record
+                continue
+            batch.append(record)
+            if len(batch) >= chunk_size:
+                yield batch
+                batch = []
+    except json.JSONDecodeError as e:
+        logger.exception(f"Failed to parse JSON file: {file_path}")
+        if not safe:
+            raise e
+    if batch:
+        yield batch
+
+
+def _is_truncated(error: json.JSONDecodeError, buffer: str) -> bool:
+    # A decode error can only be cured by more text when the token it points at
+    # runs to the end of the buffer. Once a delimiter follows, the element is
+    # malformed, and reading on would only pull the rest of the file into memory.
+    if error.msg.startswith("Unterminated string"):
+        return True  # points at the opening quote; the string itself may still be open
+    return _JSON_DELIMITER_RE.search(buffer, error.pos) is None
+
+
+def _iter_json_array(path: Path, read_size: int) -> Iterator[dict | list]:
+    decoder = json.JSONDecoder()
+    with path.open("r", encoding="utf-8-sig") as f:
+        buffer = ""
+        pos = 0
+        eof = False
+
+        def fill(min_size: int) -> bool:
+            # Drop consumed text and append at least ``min_size`` more characters.
+            nonlocal buffer, pos, eof
+            if eof:
+                return False
+            block = f.read(max(read_size, min_size))
+            if not block:
+                eof = True
+                return False
+            buffer = buffer[pos:] + block
+            pos = 0
+            return True
+
+        def skip_whitespace() -> bool:
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in _JSON_WHITESPACE:
+                    pos += 1
+                if pos < len(buffer):
+                    return True
+                if not fill(0):
+                    return False
+
+        if not skip_whitespace():
+            # Logged once by iter_json_records.
+            raise json.JSONDecodeError(f"JSON file is empty or contains only whitespace: {path}", buffer, 0)
+
+        if buffer[pos] != "[":
+            # Not an array: the whole document is a single record.
+            while fill(0):
+                pass
+            yield json.loads(buffer[pos:])
+            return
+
+        pos += 1
+        expect_value = True
+        first = True
+        while True:
+            if not skip_whitespace():
+                raise json.JSONDecodeError("Unterminated JSON array", buffer, pos)
+            char = buffer[pos]
+            if char == "]" and (first or not expect_value):
+                pos += 1
+                break
+            if not expect_value:
+                if char != ",":
+                    raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+                pos += 1
+                expect_value = True
+                continue
+
+            # Decode one element, reading more text while it is incomplete. A
+            # value not followed by a delimiter may be a truncated number.
+            while True:
+                try:
+                    record, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as e:
+                    if _is_truncated(e, buffer) and fill(len(buffer)):
+                        continue
+                    raise
+                if (end >= len(buffer) or buffer[end] not in _JSON_DELIMITERS) and fill(len(buffer)):
+                    continue
+                break
+            pos = end
+            expect_value = False
+            first = False
+            yield record
+
+        if skip_whitespace():
+            raise json.JSONDecodeError("Extra data", buffer, pos)
+
+
+def load_multiple_json(
+    files: list[str],
+    safe: bool = True,
+    workers: int | None = None,
+    executor: str = "process",
+    flatten: bool = False,
+    failures: list | None = None,
+    manifest: "FileManifest | None" = None,
+) -> list[dict | list]:
+    """
+    Load several JSON files, optionally in parallel.
+
+    With ``workers`` > 1 the files are parsed on a process pool (or a thread
+    pool with ``executor="thread"`` for I/O-bound batches); results keep the
+    input order. With ``flatten=True`` each file yields a list of flattened
+    record dictionaries instead of the raw document, which is cheaper to send
+    back from worker processes. Failed files are skipped in safe mode and
+    appended to ``failures`` as ``(file, exception)`` pairs when given;
+    otherwise the first failure in input order is raised.
+
+    With a ``manifest`` (see ``src.manifest.FileManifest``) only new or
+    changed files are loaded, and each successfully loaded file is recorded
+    in it; call ``manifest.save()`` once the results have been exported.
+    """
+    return _load_multiple(_load_json_task, files, (flatten,), safe, workers, executor, failures, manifest)
+
+
+# -------------------------
+# NDJSON Parsing
+# -------------------------
+def iter_ndjson_records(
+    file_path: str,
+    chunk_size: int | None = None,
+    safe: bool = True,
+    rejects: list | None = None,
+    objects_only: bool = False,
+    decoder: str | None = None,
+    quiet: bool = False,
+) -> Iterator[dict | list]:
+    """
+    Stream the records of a newline-delimited JSON (JSON Lines) file in one process.
+
+    Blank lines are skipped. A malformed line is skipped in safe mode and
+    appended to ``rejects`` as ``{"line": n, "error": msg, "content": text}``
+    (1-based line numbers); otherwise the first one raises
+    ``json.JSONDecodeError`` naming its line. With ``objects_only``, lines
+    holding an array or scalar instead of an object are rejected the same way.
+    With ``chunk_size`` set, lists of up to that many records are yielded
+    instead of single records. ``decoder`` forces a ``src.decoders`` backend.
+    ``quiet`` skips the warning about rejected lines, for callers that read the
+    file again and report them on that pass.
+    """
+    path = Path(file_path)
+    if not path.is_file():
+        msg = f"JSON file not found: {file_path}"
+        logger.error(msg)
+        if safe:
+            return
+        raise FileNotFoundError(msg)
+
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+
+    found = []
+    batch = []
+    with path.open("rb") as f:
+        if f.read(len(_UTF8_BOM)) != _UTF8_BOM:
+            f.seek(0)
+        for _, record in _decode_ndjson_lines(f, found, not safe, objects_only, decoder):
+            if chunk_size is None:
+                yield record
+                continue
+            batch.append(record)
+            if len(batch) >= chunk_size:
+                yield batch
+                batch = []
+    _report_ndjson_rejects(found, file_path, safe, rejects, quiet)
+    if batch:
+        yield batch
+
+
+def ndjson_byte_ranges(file_path: str, parts: int) -> list[tuple[int, int]]:
+    """
+    Split a file into at most ``parts`` contiguous ``(start, end)`` byte ranges
+    whose boundaries fall just after a newline, so no line spans two ranges.
+    """
+    if parts < 1:
+        raise ValueError("parts must be a positive integer")
+    size = Path(file_path).stat().st_size
+    boundaries = [0]
+    with open(file_path, "rb") as f:
+        for i in range(1, parts):
+            target = max(size * i // parts, boundaries[-1])
+            if target == 0 or target >= size:
+                continue
+            f.seek(target - 1)
+            f.readline()  # move to the start of the next line
+            boundaries.append(min(f.tell(), size))
+    boundaries.append(size)
+    return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if end > start]
+
+
+def load_ndjson(
+    file_path: str,
+    safe: bool = True,
+    workers: int | None = None,
+    executor: str = "process",
+    flatten: bool = False,
+    fields: list | None = None,
+    where=None,
+    rejects: list | None = None,
+    chunk_bytes: int = NDJSON_CHUNK_BYTES,
+    decoder: str | None = None,
+) -> list[dict | list]:
+    """
+    Load a newline-delimited JSON file, decoding byte ranges in parallel.
+
+    The file is split into newline-aligned ranges of about ``chunk_bytes``;
+    with ``workers`` > 1 they are decoded on a process (or thread) pool and
+    reassembled in file order. With ``flatten=True``, or with ``fields`` /
+    ``where`` (see ``src.transformer.RecordProjector``), records are flattened
+    and filtered in the workers, which is cheaper to send back, and lines that
+    are not JSON objects are rejected. Malformed lines follow the
+    ``safe``/``rejects`` rules of ``iter_ndjson_records``, with line numbers
+    counted from the start of the file. ``decoder`` forces a ``src.decoders``
+    backend in every worker. With the process
+    executor a callable ``where`` must be picklable (a module-level function).
+    """
+    path = Path(file_path)
+    if not path.is_file():
+        msg = f"JSON file not found: {file_path}"
+        logger.error(msg)
+        if safe:
+            return []
+        raise FileNotFoundError(msg)
+    if chunk_bytes < 1:
+        raise ValueError("chunk_bytes must be a positive integer")
+
+    size = path.stat().st_size
+    parts = max(1, -(-size // chunk_bytes))
+    if workers is not None and workers > 1:
+        parts = max(parts, workers)
+    ranges = ndjson_byte_ranges(file_path, parts)
+    projection = (fields, where) if flatten or fields is not None or where is not None else None
+    # Resolved here so worker processes use the same backend as this one.
+    args = [[arg] * len(ranges) for arg in (str(path), projection, not safe, decoder_name(decoder))]
+
+    pool = None
+    if workers is not None and workers > 1 and len(ranges) > 1:
+        pool = _create_executor(executor, min(workers, len(ranges)))
+        results = pool.map(_decode_ndjson_range, args[0], ranges, *args[1:])
+    else:
+        results = map(_decode_ndjson_range, args[0], ranges, *args[1:])
+
+    records = []
+    found = []
+    first_line = 1
+    try:
+        for range_records, range_rejects, line_count in results:
+            for reject in range_rejects:
+                reject["line"] += first_line - 1
+            found.extend(range_rejects)
+            if found and not safe:
+                break
+            records.extend(range_records)
+            first_line += line_count
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    _report_ndjson_rejects(found, file_path, safe, rejects)
+    logger.info(f"Loaded {len(records)} NDJSON records from {file_path} in {len(ranges)} ranges")
+    return records
+
+
+def _decode_ndjson_range(
+    file_path: str, byte_range: tuple, projection: tuple | None, stop_at_first: bool, decoder: str
+) -> tuple:
+    # Runs in pool workers: returns (records, rejects with range-local line numbers, line count).
+    start, end = byte_range
+    with open(file_path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    if start == 0 and data.startswith(_UTF8_BOM):
+        data = data[len(_UTF8_BOM):]
+    lines = data.split(b"\n")
+    if lines and lines[-1] == b"":
+        lines.pop()
+
+    rejects = []
+    numbered = _decode_ndjson_lines(lines, rejects, stop_at_first, projection is not None, decoder)
+    if projection is None:
+        records = [record for _, record in numbered]
+    else:
+        from src.transformer import RecordProjector
+
+        projector = RecordProjector(*projection)
+        records = [flat for flat in (projector(record) for _, record in numbered) if flat is not None]
+    return records, rejects, len(lines)
+
+
+def _decode_ndjson_lines(
+    lines, rejects: list, stop_at_first: bool, objects_only: bool = False, decoder: str | None = None
+) -> Iterator[tuple]:
+    # Yields (1-based line number, record); malformed lines go to ``rejects`` instead.
+    loads = get_decoder(decoder)
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = loads(line)
+            if objects_only and not isinstance(record, dict):
+                raise json.JSONDecodeError("Expected a JSON object", line.decode("utf-8"), 0)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            rejects.append({"line": number, "error": str(e), "content": line.decode("utf-8", "replace")})
+            if stop_at_first:
+                return
+            continue
+        yield number, record
+
+
+def _report_ndjson_rejects(
+    found: list, file_path: str, safe: bool, rejects: list | None, quiet: bool = False
+) -> None:
+    if not found:
+        return
+    if not safe:
+        first = found[0]
+        msg = f"Malformed JSON on line {first['line']} of {file_path}: {first['error']}"
+        logger.error(msg)
+        raise json.JSONDecodeError(msg, first["content"], 0)
+    if not quiet:
+        logger.warning(f"Rejected {len(found)} malformed lines in {file_path} (first on line {found[0]['line']})")
+    if rejects is not None:
+        rejects.extend(found)
 
 
 # -------------------------
 # XML Parsing
 # -------------------------
+@instrument(input_arg="file_path")
 def load_xml_file(file_path: str, safe: bool = True) -> ET.Element | None:
     path = Path(file_path)
     if not path.is_file():
@@ -75,10 +482,18 @@ def load_xml_file(file_path: str, safe: bool = True) -> ET.Element | None:
         else:
             raise FileNotFoundError(msg)
 
+    return parse_xml_bytes(path.read_bytes(), file_path, safe)
+
+
+def parse_xml_bytes(data: bytes | str, source: str = "<bytes>", safe: bool = True) -> ET.Element | None:
+    """
+    Parse XML content that has already been read, with the same BOM, empty-content
+    and error handling as ``load_xml_file``. ``source`` names the input in log messages.
+    """
     try:
-        content = path.read_text(encoding="utf-8-sig").strip()
+        content = (data.decode("utf-8-sig") if isinstance(data, bytes) else data).strip()
         if not content:
-            msg = f"XML file is empty: {file_path}"
+            msg = f"XML file is empty: {source}"
             logger.error(msg)
             if safe:
                 return None
@@ -90,17 +505,109 @@ def load_xml_file(file_path: str, safe: bool = True) -> ET.Element | None:
         return root
 
     except ET.ParseError as e:
-        logger.exception(f"Failed to parse XML file: {file_path}")
+        logger.exception(f"Failed to parse XML file: {source}")
         if safe:
             return None
         else:
             raise e
 
 
-def load_multiple_xml(files: list[str], safe: bool = True) -> list[ET.Element]:
-    all_roots = []
-    for file in files:
-        root = load_xml_file(file, safe=safe)
-        if root is not None:
-            all_roots.append(root)
-    return all_roots
+def load_multiple_xml(
+    files: list[str],
+    safe: bool = True,
+    workers: int | None = None,
+    executor: str = "process",
+    record_tag: str | None = None,
+    failures: list | None = None,
+    manifest: "FileManifest | None" = None,
+) -> list[ET.Element] | list[list[dict]]:
+    """
+    Load several XML files, optionally in parallel.
+
+    Takes the same ``workers``/``executor``/``failures``/``manifest`` options
+    as ``load_multiple_json``. Pickling ``Element`` trees back from worker
+    processes is expensive, so when ``record_tag`` is given each file is
+    instead returned as the list of its record dictionaries, as produced by
+    ``xml_to_dataframe``.
+    """
+    return _load_multiple(_load_xml_task, files, (record_tag,), safe, workers, executor, failures, manifest)
+
+
+# -------------------------
+# Batch loading
+# -------------------------
+def _load_json_task(file_path: str, flatten: bool) -> tuple:
+    try:
+        data = load_json_file(file_path, safe=False)
+        if flatten:
+            from src.transformer import JsonFlattener
+            data = list(map(JsonFlattener(), data if isinstance(data, list) else [data]))
+        return data, None
+    except Exception as e:
+        return None, e
+
+
+def _load_xml_task(file_path: str, record_tag: str | None) -> tuple:
+    try:
+        root = load_xml_file(file_path, safe=False)
+        if record_tag:
+            from src.transformer import xml_root_to_records
+            return xml_root_to_records(root, record_tag), None
+        return root, None
+    except Exception as e:
+        return None, e
+
+
+def _create_executor(executor: str, workers: int) -> "Executor":
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    if executor == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    if executor == "thread":
+        return ThreadPoolExecutor(max_workers=workers)
+    raise ValueError(f"Unsupported executor: {executor!r} (expected 'process' or 'thread')")
+
+
+def _load_multiple(
+    task: Callable,
+    files: list[str],
+    task_args: tuple,
+    safe: bool,
+    workers: int | None,
+    executor: str,
+    failures: list | None,
+    manifest: "FileManifest | None" = None,
+) -> list:
+    files = list(files)
+    if manifest is not None:
+        files = manifest.changed(files)
+    args = [[arg] * len(files) for arg in task_args]
+    pool = None
+    if workers is not None and workers > 1 and len(files) > 1:
+        pool = _create_executor(executor, min(workers, len(files)))
+        chunksize = max(1, len(files) // (workers * 4)) if executor == "process" else 1
+        results = pool.map(task, files, *args, chunksize=chunksize)
+    else:
+        results = map(task, files, *args)
+
+    all_data = []
+    failed = 0
+    try:
+        for file, (data, error) in zip(files, results):
+            if error is None:
+                all_data.append(data)
+                if manifest is not None:
+                    manifest.record(file)
+                continue
+            failed += 1
+            if failures is not None:
+                failures.append((file, error))
+            if not safe:
+                raise error
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    if failed:
+        logger.warning(f"Skipped {failed} of {len(files)} files that failed to load")
+    return all_data
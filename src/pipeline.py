@@ -0,0 +1,176 @@
+"""
+pipeline.py
+-------------
+Chunked parse -> flatten -> rename -> transform -> validate -> export pipeline.
+
+Features:
+- Streams JSON arrays, NDJSON lines and XML record elements in bounded N-row chunks
+- Malformed NDJSON lines are collected as rejects instead of stopping the run
+- Keeps a consistent column set across chunks (keys first seen late in the
+  file are still present, as NaN, in earlier chunks)
+- Releases each chunk as soon as the writer has consumed it
+- Integrated logging
+
+Author: Jobet Casquejo
+"""
+
+from pathlib import Path
+from typing import Callable, Iterator
+
+import pandas as pd
+
+from src.exporter import export_chunks_to_csv
+from src.logger import get_logger
+from src.parser import iter_json_records, iter_ndjson_records
+from src.transformer import (
+    JsonFlattener,
+    iter_xml_records,
+    json_to_dataframe,
+    rename_columns,
+    transform_dataframe,
+    xml_to_dataframe_chunks,
+)
+from src.validator import validate_dataframe
+
+logger = get_logger(__name__)
+
+DEFAULT_CHUNK_SIZE = 10000
+
+
+class ChunkedPipeline:
+    """
+    Run the transformation stages over a file in bounded N-row chunks.
+
+    Args:
+        source_path (str): JSON or XML input file.
+        source_type (str, optional): "json", "ndjson" (or "jsonl") or "xml". Inferred from the
+            file suffix by default.
+        record_tag (str, optional): Record element tag, required for XML sources.
+        chunk_size (int): Maximum number of rows per chunk.
+        column_mapping (dict, optional): Passed to ``rename_columns``.
+        transformations (dict, optional): Passed to ``transform_dataframe``.
+        required_fields (list, optional): Passed to ``validate_dataframe``.
+        field_types (dict, optional): Passed to ``validate_dataframe``.
+        columns (list, optional): Flattened source columns of every chunk. When omitted,
+            a discovery pass over the source collects them in first-appearance order.
+    """
+
+    def __init__(
+        self,
+        source_path: str,
+        source_type: str = None,
+        record_tag: str = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        column_mapping: dict = None,
+        transformations: dict = None,
+        required_fields: list = None,
+        field_types: dict = None,
+        columns: list = None,
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer")
+
+        source_type = (source_type or Path(source_path).suffix.lstrip(".")).lower()
+        if source_type == "jsonl":
+            source_type = "ndjson"
+        if source_type not in ("json", "ndjson", "xml"):
+            raise ValueError(f"Unsupported source type: {source_type!r}")
+        if source_type == "xml" and not record_tag:
+            raise ValueError("record_tag is required for XML sources")
+
+        self.source_path = source_path
+        self.source_type = source_type
+        self.record_tag = record_tag
+        self.chunk_size = chunk_size
+        self.column_mapping = column_mapping
+        self.transformations = transformations
+        self.required_fields = required_fields
+        self.field_types = field_types
+        self.columns = list(columns) if columns is not None else None
+
+        self.chunks_processed = 0
+        self.rows_in = 0
+        self.rows_out = 0
+        self.rejects = []  # malformed NDJSON lines: {"line", "error", "content"}
+
+    def discover_columns(self) -> list:
+        """
+        Scan the source once and return every flattened column in first-appearance order.
+        """
+        seen = {}
+        if self.source_type == "json":
+            flattener = JsonFlattener()
+            for record in iter_json_records(self.source_path, safe=False):
+                seen.update(dict.fromkeys(flattener(record)))
+        elif self.source_type == "ndjson":
+            flattener = JsonFlattener()
+            # Rejected lines are collected and reported by the chunked pass.
+            for record in iter_ndjson_records(self.source_path, rejects=[], objects_only=True, quiet=True):
+                seen.update(dict.fromkeys(flattener(record)))
+        else:
+            for record in iter_xml_records(self.source_path, self.record_tag):
+                seen.update(dict.fromkeys(record))
+        logger.info(f"Discovered {len(seen)} columns in '{self.source_path}'")
+        return list(seen)
+
+    def _iter_source_chunks(self) -> Iterator[pd.DataFrame]:
+        if self.source_type == "json":
+            for batch in iter_json_records(self.source_path, chunk_size=self.chunk_size, safe=False):
+                yield json_to_dataframe(batch)
+        elif self.source_type == "ndjson":
+            batches = iter_ndjson_records(
+                self.source_path, chunk_size=self.chunk_size, rejects=self.rejects, objects_only=True
+            )
+            for batch in batches:
+                yield json_to_dataframe(batch)
+        else:
+            yield from xml_to_dataframe_chunks(self.source_path, self.record_tag, self.chunk_size)
+
+    def _process_chunk(self, df: pd.DataFrame) -> pd.DataFrame:
+        unexpected = [col for col in df.columns if col not in self._column_set]
+        if unexpected:
+            logger.warning(f"Dropping columns not in the pipeline schema: {unexpected}")
+        df = df.reindex(columns=self.columns)
+
+        if self.column_mapping:
+            df = rename_columns(df, self.column_mapping)
+        if self.transformations:
+            df = transform_dataframe(df, self.transformations)
+        if self.required_fields or self.field_types:
+            df = validate_dataframe(df, self.required_fields, self.field_types)
+        return df
+
+    def iter_chunks(self) -> Iterator[pd.DataFrame]:
+        """
+        Yield processed chunks, all sharing the same columns.
+        """
+        if self.columns is None:
+            self.columns = self.discover_columns()
+        self._column_set = set(self.columns)
+
+        for raw in self._iter_source_chunks():
+            self.rows_in += len(raw)
+            chunk = self._process_chunk(raw)
+            del raw
+            self.chunks_processed += 1
+            self.rows_out += len(chunk)
+            yield chunk
+
+    def run(self, writer: Callable[[Iterator[pd.DataFrame]], None]) -> None:
+        """
+        Feed processed chunks to ``writer``, which consumes them one at a time.
+        """
+        writer(self.iter_chunks())
+        logger.info(
+            f"Pipeline finished for '{self.source_path}': {self.chunks_processed} chunks, "
+            f"{self.rows_out} of {self.rows_in} rows written"
+        )
+
+    def to_csv(self, output_path: str, index: bool = False) -> None:
+        """
+        Run the pipeline and stream each chunk to a CSV file with ``export_chunks_to_csv``.
+
+        Raises:
+            ValueError: If no rows were produced.
+        """
+        self.run(lambda chunks: export_chunks_to_csv(chunks, output_path, index=index))
@@ -1,35 +1,304 @@
+import numpy as np
 import pandas as pd
 import json
+import operator
+import re
+from itertools import islice
+from operator import itemgetter
+from typing import Callable, Iterator
 import xml.etree.ElementTree as ET
-from src.logger import get_logger
+from src.cache import DataFrameCache
+from src.logger import get_logger, get_rate_limited_logger
+from src.metrics import instrument
 
 logger = get_logger(__name__)
+# Per-column messages are keyed and rate limited so wide frames cannot flood the log
+column_logger = get_rate_limited_logger(__name__)
+
+_INT64_MIN = np.iinfo(np.int64).min
+_INT64_MAX = np.iinfo(np.int64).max
+
+# Streamed record paths: "/"-separated tags, which may carry a "{namespace}" prefix
+_XML_PATH_SEPARATOR = re.compile(r"/(?![^{]*\})")
+_XML_STEP = re.compile(r"(\{[^}]*\})?[^/{}\[\]*@()]+")
 
 
 # -------------------------
 # JSON flattening
 # -------------------------
+@instrument()
 def flatten_json(json_obj: dict, prefix: str = '') -> dict:
     """
     Flatten a nested JSON object into a single-level dictionary.
+
+    Nested objects are walked with an explicit stack rather than recursion,
+    so very deep documents do not hit the interpreter recursion limit.
     """
     flat_dict = {}
-    for key, value in json_obj.items():
-        new_key = f"{prefix}{key}" if prefix == '' else f"{prefix}.{key}"
-        if isinstance(value, dict):
-            flat_dict.update(flatten_json(value, new_key))
-        else:
+    stack = [(prefix, iter(json_obj.items()))]
+    while stack:
+        parent, items = stack[-1]
+        for key, value in items:
+            new_key = f"{parent}{key}" if parent == '' else f"{parent}.{key}"
+            if isinstance(value, dict):
+                stack.append((new_key, iter(value.items())))
+                break
             flat_dict[new_key] = value
+        else:
+            stack.pop()
     return flat_dict
 
 
-def json_to_dataframe(json_data: list) -> pd.DataFrame:
+class JsonFlattener:
+    """
+    Flatten records that share one nested shape with a compiled accessor plan.
+
+    The shape is taken from ``template`` or, when omitted, learned from the
+    first record. It is compiled once into a function that reads every leaf
+    directly and builds the flat dictionary with precomputed dotted keys.
+    Records that deviate from the shape (different keys, or a dict where a
+    leaf was expected) fall back to ``flatten_json``; the result is always
+    equal to ``flatten_json(record)``.
+    """
+
+    def __init__(self, template: dict = None):
+        self._plan = _compile_flatten_plan(template) if template is not None else None
+        self.compiled_hits = 0
+        self.fallbacks = 0
+
+    def __call__(self, record: dict) -> dict:
+        if self._plan is None and isinstance(record, dict):
+            self._plan = _compile_flatten_plan(record)
+        flat = self._plan(record) if self._plan is not None else None
+        if flat is None:
+            self.fallbacks += 1
+            return flatten_json(record)
+        self.compiled_hits += 1
+        return flat
+
+
+def _compile_flatten_plan(template: dict):
+    # Generates straight-line code such as:
+    #   if not isinstance(v0, dict) or v0.keys() != K0: return None
+    #   v1 = v0[C1]
+    #   if not isinstance(v1, dict) or v1.keys() != K1: return None
+    #   x2 = v1[C2]
+    #   if isinstance(x2, dict): return None
+    #   return {D2: x2}
+    namespace = {}
+    lines = ["def _flatten_compiled(v0):"]
+    leaves = []
+    counter = 0
+
+    def add_node(var: int, node: dict) -> None:
+        namespace[f"K{var}"] = frozenset(node)
+        lines.append(f"    if not isinstance(v{var}, dict) or v{var}.keys() != K{var}: return None")
+
+    # Walk the template in document order, mirroring flatten_json.
+    add_node(0, template)
+    stack = [(0, "", iter(template.items()))]
+    while stack:
+        var, parent, items = stack[-1]
+        for key, value in items:
+            counter += 1
+            new_key = f"{parent}{key}" if parent == '' else f"{parent}.{key}"
+            namespace[f"C{counter}"] = key
+            if isinstance(value, dict):
+                lines.append(f"    v{counter} = v{var}[C{counter}]")
+                add_node(counter, value)
+                stack.append((counter, new_key, iter(value.items())))
+                break
+            namespace[f"D{counter}"] = new_key
+            lines.append(f"    x{counter} = v{var}[C{counter}]")
+            leaves.append(counter)
+        else:
+            stack.pop()
+
+    if leaves:
+        checks = " or ".join(f"isinstance(x{leaf}, dict)" for leaf in leaves)
+        lines.append(f"    if {checks}: return None")
+    entries = ", ".join(f"D{leaf}: x{leaf}" for leaf in leaves)
+    lines.append(f"    return {{{entries}}}")
+    exec("\n".join(lines), namespace)
+    return namespace["_flatten_compiled"]
+
+
+# -------------------------
+# Projection and predicates
+# -------------------------
+_PREDICATE_OPS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "in": lambda value, operand: value in operand,
+    "not in": lambda value, operand: value not in operand,
+}
+_NULL_OPS = {"isnull": lambda value: value is None, "notnull": lambda value: value is not None}
+
+
+def _coerce_operand(value, operand):
+    # XML text (and stringly-typed JSON) compared against a number is compared numerically.
+    if isinstance(value, str) and isinstance(operand, (int, float)) and not isinstance(operand, bool):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+
+def compile_predicate(where) -> Callable[[dict], bool] | None:
+    """
+    Build a record filter from ``where``.
+
+    ``where`` is a callable taking the flat record dictionary, a predicate
+    tuple, or a list of them that must all hold. Tuples are
+    ``(field, op, value)`` with op one of ==, !=, <, <=, >, >=, in, not in,
+    or ``(field, "isnull")`` / ``(field, "notnull")``. A missing field reads as
+    None, and a comparison that cannot be made (e.g. None < 5) rejects the record.
+    """
+    if where is None:
+        return None
+    if callable(where) or isinstance(where, tuple):
+        where = [where]
+
+    checks = []
+    for predicate in where:
+        if callable(predicate):
+            checks.append(predicate)
+            continue
+        if len(predicate) == 2 and predicate[1] in _NULL_OPS:
+            field, test = predicate[0], _NULL_OPS[predicate[1]]
+            checks.append(lambda record, field=field, test=test: test(record.get(field)))
+            continue
+        if len(predicate) != 3 or predicate[1] not in _PREDICATE_OPS:
+            raise ValueError(f"Unsupported predicate: {predicate!r}")
+        field, op, operand = predicate[0], _PREDICATE_OPS[predicate[1]], predicate[2]
+        checks.append(lambda record, field=field, op=op, operand=operand: op(
+            _coerce_operand(record.get(field), operand), operand
+        ))
+
+    def matches(record: dict) -> bool:
+        try:
+            return all(check(record) for check in checks)
+        except TypeError:
+            return False
+
+    return matches
+
+
+def predicate_fields(where) -> list:
+    """
+    Return the fields referenced by tuple predicates in ``where``.
+    """
+    if where is None or callable(where):
+        return []
+    if isinstance(where, tuple):
+        where = [where]
+    return [predicate[0] for predicate in where if not callable(predicate)]
+
+
+class RecordProjector:
+    """
+    Flatten only the requested fields of each JSON record and drop records failing ``where``.
+
+    Args:
+        fields (list, optional): Dotted paths to keep. A path naming an object keeps
+            every leaf below it (``"address"`` keeps ``address.city``, ...). Subtrees
+            that are not requested are never walked. None keeps every field.
+        where: Row filter, see ``compile_predicate``. Fields used only by tuple
+            predicates are extracted for the test and then dropped. Callable
+            predicates see the projected record.
+
+    Calling the projector returns the flat record, or None when it is rejected.
+    """
+
+    def __init__(self, fields: list = None, where=None):
+        self.fields = list(fields) if fields is not None else None
+        self._predicate = compile_predicate(where)
+        self._flattener = JsonFlattener() if fields is None else None
+        self._extra = []
+        if fields is not None:
+            self._extra = [field for field in predicate_fields(where) if not _covered(field, self.fields)]
+            self._trie = _build_field_trie(self.fields + self._extra)
+        self.rejected = 0
+
+    def __call__(self, record: dict) -> dict | None:
+        if self._flattener is not None:
+            flat = self._flattener(record)
+        else:
+            flat = {}
+            if isinstance(record, dict):
+                _project_into(record, self._trie, "", flat)
+        if self._predicate is not None and not self._predicate(flat):
+            self.rejected += 1
+            return None
+        for field in self._extra:
+            flat.pop(field, None)
+        return flat
+
+
+def _covered(field: str, fields: list) -> bool:
+    return any(field == f or field.startswith(f + ".") for f in fields)
+
+
+def _build_field_trie(fields: list) -> dict:
+    # {"a": {"b": None}} selects a.b; None marks "take this value or whole subtree".
+    trie = {}
+    for field in fields:
+        node = trie
+        parts = field.split(".")
+        for i, part in enumerate(parts):
+            if i == len(parts) - 1:
+                node[part] = None
+            elif part in node and node[part] is None:
+                break  # an ancestor is already selected whole
+            else:
+                node = node.setdefault(part, {})
+    return trie
+
+
+def _project_into(obj: dict, trie: dict, prefix: str, out: dict) -> None:
+    for key, sub in trie.items():
+        if key not in obj:
+            continue
+        value = obj[key]
+        name = key if prefix == '' else f"{prefix}.{key}"
+        if sub is None:
+            if isinstance(value, dict):
+                out.update(flatten_json(value, name))
+            else:
+                out[name] = value
+        elif isinstance(value, dict):
+            _project_into(value, sub, name, out)
+
+
+def _select_columns(df: pd.DataFrame, fields: list) -> pd.DataFrame:
+    # Order columns by the requested fields and add requested leaves no record had.
+    ordered = []
+    for field in fields:
+        matched = [col for col in df.columns if col == field or str(col).startswith(field + ".")]
+        ordered.extend(col for col in (matched or [field]) if col not in ordered)
+    return df.reindex(columns=ordered)
+
+
+@instrument()
+def json_to_dataframe(json_data: list, fields: list = None, where=None) -> pd.DataFrame:
     """
     Convert a list of JSON objects (already loaded) to a flattened DataFrame.
+
+    ``fields`` (dotted paths) and ``where`` (see ``compile_predicate``) are
+    applied per record while flattening, so unrequested subtrees are never
+    flattened and rejected records never become rows. Columns then follow the
+    order of ``fields``.
     """
     try:
-        flattened_data = [flatten_json(item) for item in json_data]
-        df = pd.DataFrame(flattened_data)
+        if fields is None and where is None:
+            df = records_to_dataframe(map(JsonFlattener(), json_data))
+        else:
+            df = _project_records(json_data, fields, where)
         logger.info(f"Converted JSON data to DataFrame with shape {df.shape}")
         return df
     except Exception as e:
@@ -37,15 +306,122 @@ def json_to_dataframe(json_data: list) -> pd.DataFrame:
         raise e
 
 
-def json_file_to_dataframe(file_path: str) -> pd.DataFrame:
+def _project_records(records, fields: list, where) -> pd.DataFrame:
+    projector = RecordProjector(fields, where)
+    df = records_to_dataframe(record for record in map(projector, records) if record is not None)
+    if projector.rejected:
+        logger.info(f"Filtered out {projector.rejected} records at parse time")
+    return _select_columns(df, fields) if fields is not None else df
+
+
+def records_to_dataframe(records, batch_size: int = 4096) -> pd.DataFrame:
+    """
+    Build a DataFrame from flat record dictionaries column by column.
+
+    Values are appended straight into per-column lists (back-filled with NaN
+    for records missing a key), so pandas never has to re-scan a list of
+    dicts. Batches of records sharing one key set are filled column by
+    column without a per-record Python loop. Columns holding only ints, floats or bools become typed numpy
+    arrays directly. The result matches ``pd.DataFrame(list(records))``,
+    including column order by first appearance.
+    """
+    columns = {}
+    num_rows = 0
+    records = iter(records)
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        if not _append_uniform_batch(columns, batch, num_rows):
+            for offset, record in enumerate(batch):
+                _append_record(columns, record, num_rows + offset)
+        num_rows += len(batch)
+
+    if not columns:
+        return pd.DataFrame([{}] * num_rows)
+
+    for key, column in columns.items():
+        if len(column) < num_rows:
+            column.extend([np.nan] * (num_rows - len(column)))
+        columns[key] = _to_typed_array(column)
+    return pd.DataFrame(columns, index=pd.RangeIndex(num_rows), copy=False)
+
+
+def _column_for(columns: dict, key, num_rows: int) -> list:
+    column = columns.get(key)
+    if column is None:
+        column = columns[key] = [np.nan] * num_rows
+    elif len(column) < num_rows:
+        column.extend([np.nan] * (num_rows - len(column)))
+    return column
+
+
+def _append_record(columns: dict, record: dict, row: int) -> None:
+    for key, value in record.items():
+        _column_for(columns, key, row).append(value)
+
+
+def _append_uniform_batch(columns: dict, batch: list, num_rows: int) -> bool:
+    # Fast path: when every record has the first record's keys, each column
+    # is filled with one C-level pass over the batch.
+    keys = tuple(batch[0])
+    if set(map(len, batch)) != {len(keys)}:
+        return False
+
+    filled = []
+    try:
+        for key in keys:
+            column = _column_for(columns, key, num_rows)
+            filled.append(column)
+            column.extend(map(itemgetter(key), batch))
+    except KeyError:
+        for column in filled:
+            del column[num_rows:]
+        return False
+    return True
+
+
+def _to_typed_array(column: list):
+    kinds = set(map(type, column))
+    try:
+        if kinds == {int}:
+            return np.array(column, dtype=np.int64)
+        if kinds == {float}:
+            return np.array(column, dtype=np.float64)
+        if kinds == {int, float}:
+            # pandas keeps ints beyond the int64 range as objects
+            ints = [value for value in column if value.__class__ is int]
+            if _INT64_MIN <= min(ints) and max(ints) <= _INT64_MAX:
+                return np.array(column, dtype=np.float64)
+        if kinds == {bool}:
+            return np.array(column, dtype=np.bool_)
+    except OverflowError:
+        pass
+    return column
+
+
+@instrument(input_arg="file_path")
+def json_file_to_dataframe(
+    file_path: str,
+    cache: DataFrameCache = None,
+    fields: list = None,
+    where=None,
+) -> pd.DataFrame:
     """
     Load a JSON file from disk and convert it to a flattened DataFrame.
+
+    With ``fields`` or ``where`` (as in ``json_to_dataframe``) the file is
+    streamed record by record, so memory follows the selected data rather than
+    the whole document. Otherwise the file is decoded from bytes with the
+    default ``src.decoders`` backend. With a ``cache``, the frame is read from it while the
+    file content and the projection are unchanged; callable predicates
+    cannot be keyed, so they bypass the cache.
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            json_data = json.load(f)
-        logger.info(f"Loaded JSON file: {file_path}")
-        return json_to_dataframe(json_data)
+        if cache is not None and _cacheable(where):
+            key = cache.key(file_path, reader="json", separator=".", fields=fields, where=where)
+            return cache.get_or_create(key, lambda: _read_json_file(file_path, fields, where))
+        return _read_json_file(file_path, fields, where)
     except FileNotFoundError:
         logger.error(f"JSON file not found: {file_path}")
         raise
@@ -54,27 +430,256 @@ def json_file_to_dataframe(file_path: str) -> pd.DataFrame:
         raise e
 
 
+def _read_json_file(file_path: str, fields: list = None, where=None) -> pd.DataFrame:
+    if fields is not None or where is not None:
+        from src.parser import iter_json_records
+
+        logger.info(f"Streaming JSON file: {file_path}")
+        return json_to_dataframe(iter_json_records(file_path, safe=False), fields, where)
+
+    from src.decoders import get_decoder
+
+    with open(file_path, "rb") as f:
+        json_data = get_decoder()(f.read())
+    logger.info(f"Loaded JSON file: {file_path}")
+    return json_to_dataframe(json_data)
+
+
+@instrument(input_arg="file_path")
+def ndjson_to_dataframe(
+    file_path: str,
+    workers: int = None,
+    executor: str = "process",
+    fields: list = None,
+    where=None,
+    safe: bool = True,
+    rejects: list = None,
+    chunk_bytes: int = None,
+) -> pd.DataFrame:
+    """
+    Load a newline-delimited JSON file into a flattened DataFrame.
+
+    By default the file is streamed line by line in this process. With
+    ``workers`` > 1 it is split into newline-aligned byte ranges that are
+    decoded, flattened and projected in parallel (see ``src.parser.load_ndjson``)
+    and reassembled in file order. Malformed or non-object lines are skipped
+    and appended to ``rejects`` with their line numbers in safe mode, and raise
+    ``json.JSONDecodeError`` otherwise. ``fields`` and ``where`` work as in
+    ``json_to_dataframe``.
+    """
+    from src.parser import NDJSON_CHUNK_BYTES, iter_ndjson_records, load_ndjson
+
+    if workers is None or workers <= 1:
+        logger.info(f"Streaming NDJSON file: {file_path}")
+        records = iter_ndjson_records(file_path, safe=safe, rejects=rejects, objects_only=True)
+        return json_to_dataframe(records, fields, where)
+
+    records = load_ndjson(
+        file_path,
+        safe=safe,
+        workers=workers,
+        executor=executor,
+        flatten=True,
+        fields=fields,
+        where=where,
+        rejects=rejects,
+        chunk_bytes=chunk_bytes or NDJSON_CHUNK_BYTES,
+    )
+    df = records_to_dataframe(records)
+    logger.info(f"Converted NDJSON file to DataFrame with shape {df.shape}")
+    return _select_columns(df, fields) if fields is not None else df
+
+
+def _cacheable(where) -> bool:
+    if where is None:
+        return True
+    if callable(where):
+        return False
+    return not any(callable(predicate) for predicate in ([where] if isinstance(where, tuple) else where))
+
+
 # -------------------------
 # XML to DataFrame
 # -------------------------
-def xml_to_dataframe(xml_file_path: str, record_tag: str) -> pd.DataFrame:
+@instrument(input_arg="xml_file_path")
+def xml_to_dataframe(
+    xml_file_path: str,
+    record_tag: str,
+    streaming: bool = False,
+    cache: DataFrameCache = None,
+    fields: list = None,
+    where=None,
+) -> pd.DataFrame:
     """
     Convert XML file to pandas DataFrame.
+
+    With ``streaming=True`` the file is read with ``iterparse`` and each record
+    element is discarded as soon as its row has been extracted, instead of
+    building the whole tree first. ``fields`` (child tags) and ``where`` (see
+    ``compile_predicate``) are applied as each record is extracted. With a
+    ``cache``, the frame is read from it while the file content, ``record_tag``
+    and the projection are unchanged.
     """
     try:
+        def read():
+            return _read_xml_file(xml_file_path, record_tag, streaming, fields, where)
+
+        if cache is not None and _cacheable(where):
+            key = cache.key(xml_file_path, reader="xml", record_tag=record_tag, fields=fields, where=where)
+            return cache.get_or_create(key, read)
+        return read()
+    except Exception as e:
+        logger.exception(f"Failed to convert XML file '{xml_file_path}' to DataFrame")
+        raise e
+
+
+def _read_xml_file(
+    xml_file_path: str,
+    record_tag: str,
+    streaming: bool,
+    fields: list = None,
+    where=None,
+) -> pd.DataFrame:
+    if streaming:
+        records = list(iter_xml_records(xml_file_path, record_tag, fields, where))
+    else:
         tree = ET.parse(xml_file_path)
-        root = tree.getroot()
-        records = []
+        records = xml_root_to_records(tree.getroot(), record_tag, fields, where)
+
+    df = pd.DataFrame(records)
+    if fields is not None:
+        df = df.reindex(columns=list(dict.fromkeys(fields)))
+    logger.info(f"Converted XML file '{xml_file_path}' to DataFrame with shape {df.shape}")
+    return df
 
-        for record in root.findall(record_tag):
-            record_dict = {child.tag: child.text for child in record}
-            records.append(record_dict)
 
-        df = pd.DataFrame(records)
-        logger.info(f"Converted XML file '{xml_file_path}' to DataFrame with shape {df.shape}")
-        return df
+def xml_root_to_records(root: ET.Element, record_tag: str, fields: list = None, where=None) -> list[dict]:
+    """
+    Extract one ``{child tag: text}`` dictionary per ``record_tag`` child of an already parsed root.
+
+    ``fields`` limits the child tags read and ``where`` drops records, as in ``xml_to_dataframe``.
+    """
+    if fields is None and where is None:
+        return [{child.tag: child.text for child in record} for record in root.findall(record_tag)]
+    extract = _xml_extractor(fields, where)
+    return [record for record in map(extract, root.findall(record_tag)) if record is not None]
+
+
+def _xml_extractor(fields: list, where) -> Callable[[ET.Element], dict | None]:
+    predicate = compile_predicate(where)
+    extra = set()
+    wanted = None
+    if fields is not None:
+        extra = {field for field in predicate_fields(where) if field not in fields}
+        wanted = set(fields) | extra
+
+    def extract(element: ET.Element) -> dict | None:
+        if wanted is None:
+            record = {child.tag: child.text for child in element}
+        else:
+            record = {child.tag: child.text for child in element if child.tag in wanted}
+        if predicate is not None and not predicate(record):
+            return None
+        for field in extra:
+            record.pop(field, None)
+        return record
+
+    return extract
+
+
+def iter_xml_records(xml_file_path: str, record_tag: str, fields: list = None, where=None) -> Iterator[dict]:
+    """
+    Stream record dictionaries from an XML file using ``iterparse``.
+
+    Records are the elements ``root.findall(record_tag)`` would return, for a
+    ``record_tag`` that is a tag, a path of tags below the root such as
+    ``"items/item"``, or a descendant search such as ``".//item"``. Each
+    record is emitted when its element closes, after which the element is
+    cleared and detached so processed siblings do not accumulate. ``fields``
+    and ``where`` are applied as in ``xml_root_to_records``.
+
+    Raises:
+        ValueError: If ``record_tag`` uses any other ElementPath syntax
+            (wildcards, predicates, attributes, ``..``).
+    """
+    steps, descendant = _xml_record_path(record_tag)
+    return _iter_xml_records(xml_file_path, steps, descendant, fields, where)
+
+
+def _xml_record_path(record_tag: str) -> tuple[list, bool]:
+    path = record_tag or ""
+    descendant = path.startswith(".//")
+    path = path[3:] if descendant else path.removeprefix("./")
+    steps = _XML_PATH_SEPARATOR.split(path)
+    if not all(_XML_STEP.fullmatch(step) and step not in (".", "..") for step in steps):
+        raise ValueError(
+            f"Unsupported record_tag {record_tag!r} for streaming: use a tag, a path of tags "
+            f"such as 'items/item', or a descendant search such as './/item'"
+        )
+    return steps, descendant
+
+
+def _iter_xml_records(xml_file_path: str, steps: list, descendant: bool, fields: list, where) -> Iterator[dict]:
+    extract = _xml_extractor(fields, where) if fields is not None or where is not None else None
+    depth = len(steps)
+    root = None
+    stack = []  # open elements below the root
+    for event, elem in ET.iterparse(xml_file_path, events=("start", "end")):
+        if event == "start":
+            if root is None:
+                root = elem
+            else:
+                stack.append(elem)
+            continue
+        if elem is root:
+            break
+
+        stack.pop()
+        if descendant:
+            matched = (
+                elem.tag == steps[-1]
+                and len(stack) >= depth - 1
+                and all(ancestor.tag == step for ancestor, step in zip(stack[len(stack) - depth + 1:], steps))
+            )
+        else:
+            matched = (
+                len(stack) == depth - 1
+                and elem.tag == steps[-1]
+                and all(ancestor.tag == step for ancestor, step in zip(stack, steps))
+            )
+        if matched:
+            if extract is None:
+                yield {child.tag: child.text for child in elem}
+            else:
+                record = extract(elem)
+                if record is not None:
+                    yield record
+            if descendant and any(ancestor.tag == elem.tag for ancestor in stack):
+                continue  # may belong to an enclosing record, which still needs it as a child
+        elif stack:
+            continue  # may hold records; released with its top-level ancestor
+        elem.clear()
+        (stack[-1] if stack else root).remove(elem)
+
+
+def xml_to_dataframe_chunks(xml_file_path: str, record_tag: str, chunk_size: int = 10000) -> Iterator[pd.DataFrame]:
+    """
+    Stream an XML file as DataFrames of at most ``chunk_size`` rows.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+
+    try:
+        records = []
+        for record in iter_xml_records(xml_file_path, record_tag):
+            records.append(record)
+            if len(records) >= chunk_size:
+                yield pd.DataFrame(records)
+                records = []
+        if records:
+            yield pd.DataFrame(records)
     except Exception as e:
-        logger.exception(f"Failed to convert XML file '{xml_file_path}' to DataFrame")
+        logger.exception(f"Failed to stream XML file '{xml_file_path}' to DataFrame chunks")
         raise e
 
 
@@ -97,20 +702,192 @@ def rename_columns(df: pd.DataFrame, column_mapping: dict) -> pd.DataFrame:
 # -------------------------
 # Data transformations
 # -------------------------
+@instrument()
 def transform_dataframe(df: pd.DataFrame, transformations: dict = None) -> pd.DataFrame:
     """
     Apply optional transformations to DataFrame columns.
+
+    Each transformation is either a ``VectorizedTransform`` (see the helpers
+    below), a numpy ufunc, a mapping table (dict), a shorthand string such as
+    ``"str.upper"``, ``"to_numeric"``, ``"to_datetime"`` or ``"astype:int64"``,
+    or a list of these applied in order; all of them run as whole-column
+    operations. Any other callable is applied per element with
+    ``Series.apply``. Use ``explain_transformations`` to see which path each
+    column takes.
     """
     if not transformations:
         return df
 
-    for column, func in transformations.items():
+    for column, spec in transformations.items():
         if column in df.columns:
             try:
-                df[column] = df[column].apply(func)
-                logger.info(f"Applied transformation to column '{column}'")
+                func, vectorized = _resolve_transformation(spec)
+                df[column] = func(df[column])
+                mode = "vectorized" if vectorized else "per-element apply"
+                column_logger.info(
+                    f"transformed:{column}", "Applied transformation to column '%s' (%s)", column, mode
+                )
             except Exception as e:
-                logger.warning(f"Failed to transform column '{column}': {e}")
+                column_logger.warning(
+                    f"transform_failed:{column}", "Failed to transform column '%s': %s", column, e
+                )
         else:
-            logger.warning(f"Column '{column}' not found for transformation")
+            column_logger.warning(
+                f"transform_missing:{column}", "Column '%s' not found for transformation", column
+            )
     return df
+
+
+def explain_transformations(transformations: dict) -> dict:
+    """
+    Report how ``transform_dataframe`` will run each transformation.
+
+    Returns:
+        dict: Column name -> "vectorized" or "apply" (per-element fallback).
+    """
+    return {
+        column: "vectorized" if _resolve_transformation(spec)[1] else "apply"
+        for column, spec in transformations.items()
+    }
+
+
+class VectorizedTransform:
+    """
+    A whole-column transformation for ``transform_dataframe``.
+
+    Wraps a function that takes and returns a ``pd.Series``. Usually built
+    with ``str_method``, ``astype``, ``to_numeric``, ``arithmetic``,
+    ``regex_replace``, ``map_values``, ``to_datetime`` or ``ufunc``.
+    """
+
+    def __init__(self, func, name: str):
+        self.func = func
+        self.name = name
+
+    def __call__(self, series: pd.Series) -> pd.Series:
+        return self.func(series)
+
+    def __repr__(self) -> str:
+        return f"VectorizedTransform({self.name})"
+
+
+_ARITHMETIC_OPS = {
+    "+": "add",
+    "-": "sub",
+    "*": "mul",
+    "/": "truediv",
+    "//": "floordiv",
+    "%": "mod",
+    "**": "pow",
+}
+
+
+def str_method(method: str, *args, **kwargs) -> VectorizedTransform:
+    """
+    Call a ``Series.str`` method, e.g. ``str_method("strip")`` or ``str_method("slice", 0, 3)``.
+    """
+    return VectorizedTransform(lambda series: getattr(series.str, method)(*args, **kwargs), f"str.{method}")
+
+
+def astype(dtype) -> VectorizedTransform:
+    """
+    Cast the whole column with ``Series.astype``.
+    """
+    return VectorizedTransform(lambda series: series.astype(dtype), f"astype({dtype})")
+
+
+def to_numeric(errors: str = "raise") -> VectorizedTransform:
+    """
+    Parse the column with ``pd.to_numeric``; ``errors="coerce"`` turns bad values into NaN.
+    """
+    return VectorizedTransform(lambda series: pd.to_numeric(series, errors=errors), "to_numeric")
+
+
+def arithmetic(op: str, operand) -> VectorizedTransform:
+    """
+    Combine the column with a scalar or array, e.g. ``arithmetic("*", 100)``.
+    """
+    method = _ARITHMETIC_OPS.get(op, op)
+    if method not in _ARITHMETIC_OPS.values():
+        raise ValueError(f"Unsupported arithmetic operation: {op!r}")
+    return VectorizedTransform(lambda series: getattr(series, method)(operand), f"{method}({operand!r})")
+
+
+def regex_replace(pattern: str, repl: str, flags: int = 0) -> VectorizedTransform:
+    """
+    Replace regular expression matches in a string column.
+    """
+    return VectorizedTransform(
+        lambda series: series.str.replace(pattern, repl, regex=True, flags=flags),
+        f"regex_replace({pattern!r})",
+    )
+
+
+def map_values(mapping: dict, keep_unmapped: bool = True) -> VectorizedTransform:
+    """
+    Translate values through a lookup table. Unmapped values are kept unless
+    ``keep_unmapped`` is False, in which case they become NaN.
+    """
+    def apply_mapping(series: pd.Series) -> pd.Series:
+        mapped = series.map(mapping)
+        if keep_unmapped:
+            mapped = mapped.where(series.isin(list(mapping)), series)
+        return mapped
+
+    return VectorizedTransform(apply_mapping, "map_values")
+
+
+def to_datetime(format: str = None, errors: str = "raise", utc: bool = False) -> VectorizedTransform:
+    """
+    Parse the column with ``pd.to_datetime``.
+    """
+    return VectorizedTransform(
+        lambda series: pd.to_datetime(series, format=format, errors=errors, utc=utc),
+        "to_datetime",
+    )
+
+
+def ufunc(func: np.ufunc, *args, **kwargs) -> VectorizedTransform:
+    """
+    Apply a numpy ufunc to the whole column, e.g. ``ufunc(np.round, 2)``.
+    """
+    return VectorizedTransform(lambda series: func(series, *args, **kwargs), getattr(func, "__name__", repr(func)))
+
+
+def _resolve_transformation(spec) -> tuple:
+    """
+    Turn a transformation spec into ``(series_function, is_vectorized)``.
+    """
+    if isinstance(spec, VectorizedTransform):
+        return spec, True
+    if isinstance(spec, np.ufunc):
+        return ufunc(spec), True
+    if isinstance(spec, dict):
+        return map_values(spec), True
+    if isinstance(spec, str):
+        return _parse_transformation(spec), True
+    if isinstance(spec, (list, tuple)):
+        steps = [_resolve_transformation(step) for step in spec]
+
+        def chained(series: pd.Series) -> pd.Series:
+            for func, _ in steps:
+                series = func(series)
+            return series
+
+        return chained, all(vectorized for _, vectorized in steps)
+    if callable(spec):
+        return (lambda series: series.apply(spec)), False
+    raise TypeError(f"Unsupported transformation: {spec!r}")
+
+
+def _parse_transformation(spec: str) -> VectorizedTransform:
+    name, _, argument = spec.partition(":")
+    if name.startswith("str."):
+        return str_method(name[4:])
+    if name == "astype" and argument:
+        return astype(argument)
+    if name == "to_numeric":
+        return to_numeric(argument or "raise")
+    if name == "to_datetime":
+        return to_datetime(argument or None)
+    raise ValueError(f"Unknown transformation shorthand: {spec!r}")
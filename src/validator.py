@@ -8,16 +8,25 @@ Features:
 - Checks for empty values.
 - Logs warnings and errors using professional logging.
 - Returns a cleaned/validated DataFrame.
+- Vectorized row-level validation that splits clean rows from rejects.
 
 Author: Jobet Casquejo
 """
 
+import numpy as np
 import pandas as pd
-from src.logger import get_logger
+from src.logger import get_logger, get_rate_limited_logger
+from src.metrics import instrument
 
 logger = get_logger(__name__)
+# Per-field messages are keyed and rate limited so repeated failures cannot flood the log
+field_logger = get_rate_limited_logger(__name__)
 
+_BOOL_STRINGS = {"true": True, "false": False, "1": True, "0": False, "yes": True, "no": False}
+_TYPE_NAMES = {int: "int", float: "float", bool: "bool", str: "str", pd.Timestamp: "datetime"}
 
+
+@instrument(rows_arg="df")
 def validate_required_fields(df: pd.DataFrame, required_fields: list) -> pd.DataFrame:
     """
     Validate that all required fields exist and are not entirely empty.
@@ -48,6 +57,7 @@ def validate_required_fields(df: pd.DataFrame, required_fields: list) -> pd.Data
     return valid_rows
 
 
+@instrument(rows_arg="df")
 def validate_field_types(df: pd.DataFrame, field_types: dict) -> pd.DataFrame:
     """
     Validate that fields have the expected data types and attempt conversion if possible.
@@ -66,15 +76,24 @@ def validate_field_types(df: pd.DataFrame, field_types: dict) -> pd.DataFrame:
         if field in df.columns:
             try:
                 df[field] = df[field].astype(expected_type)
-                logger.info(f"Field '{field}' converted to {expected_type.__name__}")
+                field_logger.info(
+                    f"converted:{field}", "Field '%s' converted to %s", field, _describe_type(expected_type)
+                )
             except Exception as e:
-                logger.error(f"Failed to convert field '{field}' to {expected_type.__name__}")
+                field_logger.error(
+                    f"convert_failed:{field}", "Failed to convert field '%s' to %s", field, _describe_type(expected_type)
+                )
                 raise ValueError(f"Failed to convert field '{field}' to {expected_type}") from e
         else:
-            logger.warning(f"Field '{field}' not found in DataFrame")
+            field_logger.warning(f"field_missing:{field}", "Field '%s' not found in DataFrame", field)
     return df
 
 
+def _describe_type(expected_type) -> str:
+    return getattr(expected_type, "__name__", str(expected_type))
+
+
+@instrument(rows_arg="df")
 def validate_dataframe(df: pd.DataFrame, required_fields: list = None, field_types: dict = None) -> pd.DataFrame:
     """
     Full validation pipeline for a DataFrame:
@@ -94,3 +113,161 @@ def validate_dataframe(df: pd.DataFrame, required_fields: list = None, field_typ
     if field_types:
         df = validate_field_types(df, field_types)
     return df
+
+
+@instrument(rows_arg="df")
+def validate_rows(
+    df: pd.DataFrame,
+    required_fields: list = None,
+    field_types: dict = None,
+    ranges: dict = None,
+    patterns: dict = None,
+    unique: list = None,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Validate every row in one vectorized pass and split clean rows from rejects.
+
+    Unlike ``validate_field_types``, a bad value only rejects its own row. Each
+    rule is evaluated as a boolean mask over whole columns; no Python loop runs
+    over rows.
+
+    Args:
+        df (pd.DataFrame): DataFrame to validate.
+        required_fields (list, optional): Columns that must be non-null in every row.
+        field_types (dict, optional): Column -> int, float, bool, str or datetime (type or name).
+            Values are coerced; non-null values that cannot be coerced fail the "type" rule.
+        ranges (dict, optional): Column -> (min, max), inclusive; either bound may be None.
+        patterns (dict, optional): Column -> regular expression every non-null value must fully match.
+        unique (list, optional): Columns (or lists of columns) whose values must not repeat;
+            the first occurrence is kept.
+
+    Returns:
+        tuple[pd.DataFrame, pd.DataFrame]: The clean rows with coerced types, and a rejects
+        frame with one ``row``/``field``/``rule``/``value`` entry per failed check.
+
+    Raises:
+        ValueError: If a referenced column is missing or a type is not supported.
+    """
+    referenced = list(required_fields or []) + list(field_types or {}) + list(ranges or {}) + list(patterns or {})
+    for entry in unique or []:
+        referenced += [entry] if isinstance(entry, str) else list(entry)
+    missing_columns = [col for col in dict.fromkeys(referenced) if col not in df.columns]
+    if missing_columns:
+        logger.error(f"Missing columns for validation: {missing_columns}")
+        raise ValueError(f"Missing columns for validation: {missing_columns}")
+
+    failures = []  # (field, rule, mask)
+    coerced = {}
+    type_failed = {}
+
+    for field in required_fields or []:
+        failures.append((field, "required", df[field].isna().to_numpy()))
+
+    for field, expected_type in (field_types or {}).items():
+        values, bad = _coerce_column(df[field], expected_type)
+        coerced[field] = values
+        type_failed[field] = bad
+        failures.append((field, "type", bad))
+
+    for field, (minimum, maximum) in (ranges or {}).items():
+        values = coerced.get(field)
+        if values is None:
+            values = pd.to_numeric(df[field], errors="coerce")
+        within = np.ones(len(df), dtype=bool)
+        if minimum is not None:
+            within &= (values >= minimum).to_numpy(dtype=bool, na_value=False)
+        if maximum is not None:
+            within &= (values <= maximum).to_numpy(dtype=bool, na_value=False)
+        bad = df[field].notna().to_numpy() & ~within & ~type_failed.get(field, False)
+        failures.append((field, "range", bad))
+
+    for field, pattern in (patterns or {}).items():
+        present = df[field].notna().to_numpy()
+        matched = df[field].astype(str).str.fullmatch(pattern).to_numpy(dtype=bool, na_value=False)
+        failures.append((field, "pattern", present & ~matched))
+
+    for entry in unique or []:
+        subset = [entry] if isinstance(entry, str) else list(entry)
+        failures.append((",".join(subset), "unique", df.duplicated(subset=subset, keep="first").to_numpy()))
+
+    rejected = np.zeros(len(df), dtype=bool)
+    pieces = []
+    for field, rule, mask in failures:
+        rejected |= mask
+        positions = np.flatnonzero(mask)
+        if len(positions):
+            pieces.append(pd.DataFrame({
+                "position": positions,
+                "row": df.index[positions],
+                "field": field,
+                "rule": rule,
+                "value": _reject_values(df, field, positions),
+            }))
+
+    if pieces:
+        rejects = pd.concat(pieces, ignore_index=True).sort_values("position", kind="stable")
+        rejects = rejects.drop(columns="position").reset_index(drop=True)
+    else:
+        rejects = pd.DataFrame({"row": [], "field": [], "rule": [], "value": []})
+
+    clean = df[~rejected].copy()
+    for field, values in coerced.items():
+        clean[field] = _finalize_column(values[~rejected], field_types[field])
+
+    logger.info(
+        f"Row validation completed: {len(clean)} clean rows, {int(rejected.sum())} rejected "
+        f"({len(rejects)} rule failures) out of {len(df)}"
+    )
+    return clean, rejects
+
+
+def _type_name(expected_type) -> str:
+    name = _TYPE_NAMES.get(expected_type, expected_type)
+    if name in ("int", "float", "bool", "str", "datetime"):
+        return name
+    raise ValueError(f"Unsupported type for row validation: {expected_type!r}")
+
+
+def _coerce_column(series: pd.Series, expected_type) -> tuple:
+    """
+    Coerce a column in one pass; returns ``(values, bad_mask)`` where bad rows held
+    a non-null value that could not be converted.
+    """
+    name = _type_name(expected_type)
+    present = series.notna().to_numpy()
+    if name in ("int", "float"):
+        values = pd.to_numeric(series, errors="coerce")
+        bad = present & values.isna().to_numpy()
+        if name == "int":
+            fractional = (values.notna() & (values % 1 != 0)).to_numpy(dtype=bool, na_value=False)
+            bad |= fractional
+            values = values.mask(fractional)
+    elif name == "bool":
+        values = series.astype(str).str.strip().str.lower().map(_BOOL_STRINGS).where(series.notna())
+        bad = present & values.isna().to_numpy()
+    elif name == "datetime":
+        values = pd.to_datetime(series, errors="coerce")
+        bad = present & values.isna().to_numpy()
+    else:
+        values = series.where(series.isna(), series.astype(str))
+        bad = np.zeros(len(series), dtype=bool)
+    return values, bad
+
+
+def _finalize_column(values: pd.Series, expected_type) -> pd.Series:
+    name = _type_name(expected_type)
+    has_nulls = values.isna().any()
+    if name == "int":
+        return values.astype("Int64" if has_nulls else "int64")
+    if name == "float":
+        return values.astype("float64")
+    if name == "bool":
+        return values.astype("boolean" if has_nulls else "bool")
+    return values
+
+
+def _reject_values(df: pd.DataFrame, field: str, positions: np.ndarray) -> list:
+    if field in df.columns:
+        return df[field].iloc[positions].tolist()
+    columns = field.split(",")
+    return list(df[columns].iloc[positions].itertuples(index=False, name=None))
@@ -0,0 +1,403 @@
+"""
+watcher.py
+-------------
+Watch-folder service: process input files as soon as they land.
+
+Features:
+- Linux inotify (through ctypes, no extra dependency) with a polling fallback
+  for other platforms and for mounts that do not deliver inotify events
+- A file is only picked up once it is complete: renamed into place, or its
+  size and mtime have stayed the same for ``settle_seconds``
+- Hidden and temporary files (".name", "*.tmp", "*.part") are ignored, so
+  writers can use the write-then-rename pattern
+- Bounded queue between the watcher and the worker pool: when it is full the
+  watcher stops collecting events (backpressure) until workers catch up
+- Content-hash manifest, so restarts and re-saved identical files are skipped;
+  it is saved every ``manifest_save_interval`` seconds and on drain, not per file
+- stop() (wired to SIGTERM/SIGINT by ``python src/main.py --watch``) stops
+  watching, drains the queued files and waits for in-flight ones
+- Integrated logging
+
+Author: Jobet Casquejo
+"""
+
+import fnmatch
+import os
+import queue
+import select
+import struct
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from src.logger import get_logger
+from src.main import MANIFEST_NAME, outputs_of, process_file
+
+logger = get_logger(__name__)
+
+IGNORED_PATTERNS = (".*", "*.tmp", "*.part", "*.partial", "*.swp")
+
+# inotify(7) event masks
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+
+
+class InotifySource:
+    """
+    Minimal inotify reader built on libc through ctypes.
+
+    ``read(timeout)`` returns ``(path, moved)`` pairs for files that were closed
+    after writing or moved into a watched directory, or None when the kernel
+    queue overflowed and the caller must rescan.
+
+    Raises:
+        OSError: If inotify is not available on this system.
+    """
+
+    def __init__(self, directory: str, recursive: bool = False):
+        import ctypes
+        import ctypes.util
+
+        libc_name = ctypes.util.find_library("c")
+        if not libc_name:
+            raise OSError("libc not found")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self._ctypes = ctypes
+        self.fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self.recursive = recursive
+        self._watches = {}  # wd -> directory
+        self.add_watch(directory)
+        if recursive:
+            for root, dirs, _ in os.walk(directory):
+                for name in dirs:
+                    self.add_watch(os.path.join(root, name))
+
+    def add_watch(self, directory: str) -> None:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            errno = self._ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), directory)
+        self._watches[wd] = directory
+
+    def read(self, timeout: float) -> list | None:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+
+        events = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                return None
+            if mask & IN_IGNORED:
+                self._watches.pop(wd, None)
+                continue
+            directory = self._watches.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                if self.recursive and mask & (IN_CREATE | IN_MOVED_TO):
+                    self.add_watch(path)
+                    # Files may have landed before the watch existed.
+                    events.extend((str(p), False) for p in Path(path).rglob("*") if p.is_file())
+                continue
+            if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                events.append((path, bool(mask & IN_MOVED_TO)))
+        return events
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class FolderWatcher:
+    """
+    Watch ``config["input"]["directory"]`` and run each complete file through
+    ``process_file`` on a worker pool.
+
+    Args:
+        config (dict): Batch config from ``src.main.load_config``. The ``watch``
+            section sets ``mode`` ("auto", "inotify" or "poll"), ``poll_interval``,
+            ``settle_seconds``, ``queue_size`` and ``manifest_save_interval``.
+        handler (callable): ``handler(input_path, config) -> result dict``; defaults to
+            ``src.main.process_file``.
+    """
+
+    def __init__(self, config: dict, handler=process_file):
+        watch = config["watch"]
+        self.config = config
+        self.handler = handler
+        self.directory = config["input"]["directory"]
+        self.patterns = config["input"]["patterns"]
+        self.recursive = bool(config["input"].get("recursive"))
+        self.mode = watch["mode"]
+        self.poll_interval = float(watch["poll_interval"])
+        self.settle_seconds = float(watch["settle_seconds"])
+        self.workers = int(config["workers"])
+        self.queue = queue.Queue(maxsize=int(watch["queue_size"]))
+        self.save_interval = float(watch["manifest_save_interval"])
+
+        self.processed = 0
+        self.failed = 0
+        self.skipped = 0
+
+        self._stop = threading.Event()
+        self._pending = {}   # path -> (size, mtime_ns, stable since)
+        self._queued = {}    # path -> (size, mtime_ns) handed to the queue and not yet recorded
+        self._source = None
+        self._manifest = None
+        self._rescanning = False  # set after the startup scan
+        self._unsaved = 0
+        self._last_save = time.monotonic()
+
+    # -------------------------
+    # Lifecycle
+    # -------------------------
+    def stop(self) -> None:
+        """
+        Stop watching; queued and in-flight files are still processed before run() returns.
+        """
+        if not self._stop.is_set():
+            logger.info("Stop requested: draining queued files")
+        self._stop.set()
+
+    def run(self) -> dict:
+        """
+        Watch until stop() is called, then drain and return processing counters.
+        """
+        from src.manifest import FileManifest
+
+        if not os.path.isdir(self.directory):
+            raise FileNotFoundError(f"Input directory not found: {self.directory}")
+        self._manifest = FileManifest(os.path.join(self.config["output"]["directory"], MANIFEST_NAME))
+        self._source = self._open_source()
+
+        dispatcher = threading.Thread(target=self._dispatch, name="watch-dispatcher", daemon=True)
+        dispatcher.start()
+        try:
+            self._scan()  # files that arrived while the service was down
+            self._rescanning = True
+            self._watch()
+        finally:
+            self._stop.set()
+            dispatcher.join()
+            if self._source is not None:
+                self._source.close()
+        logger.info(f"Watcher stopped: {self.processed} processed, {self.failed} failed, {self.skipped} unchanged")
+        return {"processed": self.processed, "failed": self.failed, "skipped": self.skipped}
+
+    def _open_source(self):
+        if self.mode == "poll":
+            return None
+        try:
+            source = InotifySource(self.directory, self.recursive)
+            logger.info(f"Watching '{self.directory}' with inotify")
+            return source
+        except OSError as e:
+            if self.mode == "inotify":
+                raise
+            logger.warning(f"inotify unavailable ({e}); polling '{self.directory}' every {self.poll_interval}s")
+            return None
+
+    # -------------------------
+    # Watching
+    # -------------------------
+    def _matches(self, path: str) -> bool:
+        name = os.path.basename(path)
+        if any(fnmatch.fnmatch(name, pattern) for pattern in IGNORED_PATTERNS):
+            return False
+        return any(fnmatch.fnmatch(name, pattern) for pattern in self.patterns)
+
+    def _scan(self) -> None:
+        root = Path(self.directory)
+        paths = root.rglob("*") if self.recursive else root.iterdir()
+        for path in paths:
+            if path.is_file():
+                self._candidate(str(path))
+
+    def _candidate(self, path: str, moved: bool = False) -> None:
+        if not self._matches(path):
+            return
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self._pending.pop(path, None)
+            return
+        signature = (stat.st_size, stat.st_mtime_ns)
+        if self._queued.get(path) == signature or (self._rescanning and self._recorded(path, signature)):
+            return
+        if moved:
+            # Renamed into place: the writer is done with it.
+            self._pending[path] = (*signature, float("-inf"))
+            return
+        previous = self._pending.get(path)
+        if previous is None or previous[:2] != signature:
+            self._pending[path] = (*signature, time.monotonic())
+
+    def _recorded(self, path: str, signature: tuple) -> bool:
+        # Processed files leave _queued, so rescans rely on the manifest to skip them.
+        # The startup scan queues them anyway, so unchanged files are counted as skipped.
+        entry = self._manifest.entries.get(self._manifest._key(path))
+        return entry is not None and (entry["size"], entry["mtime_ns"]) == signature
+
+    def _prune_queued(self) -> None:
+        # Files that failed stay in _queued (so they are not retried until modified) until deleted.
+        for path in list(self._queued):
+            if not os.path.exists(path):
+                self._queued.pop(path, None)
+
+    def _ready(self) -> list:
+        now = time.monotonic()
+        ready = []
+        for path, (size, mtime_ns, since) in list(self._pending.items()):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                del self._pending[path]
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+                self._pending[path] = (stat.st_size, stat.st_mtime_ns, now)
+            elif now - since >= self.settle_seconds:
+                del self._pending[path]
+                ready.append((path, (size, mtime_ns)))
+        return ready
+
+    def _watch(self) -> None:
+        tick = min(self.poll_interval, max(self.settle_seconds / 2, 0.05))
+        next_poll = 0.0
+        next_prune = time.monotonic()
+        while not self._stop.is_set():
+            if self._source is not None:
+                events = self._source.read(tick if self._pending else self.poll_interval)
+                if events is None:
+                    logger.warning("inotify queue overflowed; rescanning the input directory")
+                    self._scan()
+                else:
+                    for path, moved in events:
+                        self._candidate(path, moved)
+            else:
+                now = time.monotonic()
+                if now >= next_poll:
+                    self._scan()
+                    next_poll = now + self.poll_interval
+                self._stop.wait(tick)
+
+            now = time.monotonic()
+            if now >= next_prune:
+                self._prune_queued()
+                next_prune = now + max(self.poll_interval, 60.0)
+
+            for path, signature in self._ready():
+                if not self._enqueue(path):
+                    return
+                self._queued[path] = signature
+
+    def _enqueue(self, path: str) -> bool:
+        # Blocking here is the backpressure: no new events are collected until a slot frees up.
+        while not self._stop.is_set():
+            try:
+                self.queue.put(path, timeout=0.5)
+                return True
+            except queue.Full:
+                logger.debug(f"Queue full ({self.queue.maxsize}); waiting to enqueue '{path}'")
+        return False
+
+    # -------------------------
+    # Processing
+    # -------------------------
+    def _new_pool(self):
+        pool_class = ProcessPoolExecutor if self.config["executor"] == "process" else ThreadPoolExecutor
+        return pool_class(max_workers=self.workers)
+
+    def _dispatch(self) -> None:
+        in_flight = {}  # future -> input path
+        pool = self._new_pool()
+        try:
+            while not (self._stop.is_set() and self.queue.empty()):
+                self._finish({future: in_flight.pop(future) for future in list(in_flight) if future.done()})
+                self._save_manifest()
+                try:
+                    path = self.queue.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+                try:
+                    changed = self._manifest.is_changed(path)
+                except FileNotFoundError:
+                    continue
+                if not changed:
+                    self.skipped += 1
+                    continue
+                if len(in_flight) >= self.workers:
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    self._finish({future: in_flight.pop(future) for future in done})
+                try:
+                    in_flight[pool.submit(self.handler, path, self.config)] = path
+                except BrokenExecutor as e:
+                    # A worker died (OOM, segfault) and took the pool down with it;
+                    # its in-flight files fail with the same error. ``path`` was not
+                    # running, so it gets one try on a fresh pool.
+                    logger.error(f"Worker pool is broken ({type(e).__name__}); starting a new one")
+                    self._finish(in_flight)
+                    in_flight = {}
+                    pool.shutdown(wait=False)
+                    pool = self._new_pool()
+                    try:
+                        in_flight[pool.submit(self.handler, path, self.config)] = path
+                    except Exception as e:
+                        logger.error(f"Failed to submit '{path}': {type(e).__name__}: {e}")
+                        self.failed += 1
+            self._finish(in_flight)
+        finally:
+            pool.shutdown(wait=True)
+            self._save_manifest(force=True)
+
+    def _save_manifest(self, force: bool = False) -> None:
+        # Saving rewrites the whole manifest, so bursts of files are batched into one write.
+        if not self._unsaved:
+            return
+        if force or time.monotonic() - self._last_save >= self.save_interval:
+            self._manifest.save()
+            self._unsaved = 0
+            self._last_save = time.monotonic()
+
+    def _finish(self, futures: dict) -> None:
+        # ``futures`` maps each future to its input path.
+        for future, path in futures.items():
+            try:
+                result = future.result()
+            except Exception as e:
+                logger.error(f"Worker failed while processing '{path}': {type(e).__name__}: {e}")
+                self.failed += 1
+                continue
+            if result["error"]:
+                self.failed += 1
+                logger.error(f"Failed '{result['input']}': {result['error']}")
+                continue
+            self.processed += 1
+            logger.info(
+                f"Processed '{result['input']}' -> '{result['output']}': "
+                f"{result['rows_out']} rows in {result['seconds']:.2f}s"
+            )
+            self._manifest.record(result["input"], outputs=outputs_of(result))
+            self._queued.pop(result["input"], None)
+            self._unsaved += 1
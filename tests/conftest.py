@@ -0,0 +1,12 @@
+import os
+import shutil
+import tempfile
+
+# Keep test runs out of the repository's logs/ directory. This runs before any
+# test module imports src.logger, which reads the variable at import time.
+_log_dir = tempfile.mkdtemp(prefix="transformer-test-logs-")
+os.environ["TRANSFORMER_LOG_DIR"] = _log_dir
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(_log_dir, ignore_errors=True)
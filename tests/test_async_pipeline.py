@@ -0,0 +1,112 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+import pandas as pd
+
+from src.async_pipeline import ByteBudget, process_files
+
+
+class TestAsyncPipeline(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output_dir = os.path.join(self.temp_dir.name, "output")
+        self.files = []
+        for i in range(6):
+            self.files.append(self._write(f"people_{i}.json", json.dumps(
+                [{"Name": f"p{i}-{n}", "Info": {"Age": n}} for n in range(i + 1)]
+            )))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    # -------------------------
+    # Processing
+    # -------------------------
+    def test_process_files_exports_in_order(self):
+        xml_path = self._write("items.xml", "<Items><Item><Name>pen</Name></Item></Items>")
+        broken = self._write("broken.json", "{not json")
+        files = self.files + [xml_path, broken]
+        results = asyncio.run(process_files(
+            files, self.output_dir, record_tag="Item", transformations={"Name": "str.upper"}, workers=2,
+        ))
+        self.assertEqual([result["input"] for result in results], files)
+        self.assertEqual([result["rows_out"] for result in results], [1, 2, 3, 4, 5, 6, 1, 0])
+        self.assertIn("JSONDecodeError", results[-1]["error"])
+
+        df = pd.read_csv(os.path.join(self.output_dir, "people_2.csv"))
+        self.assertEqual(df.columns.tolist(), ["Name", "Info.Age"])
+        self.assertEqual(df["Name"].tolist(), ["P2-0", "P2-1", "P2-2"])
+        self.assertEqual(pd.read_csv(results[6]["output"])["Name"].tolist(), ["PEN"])
+
+    def test_unsafe_mode_raises(self):
+        files = self.files + [self._write("broken.json", "")]
+        with self.assertRaises(json.JSONDecodeError):
+            asyncio.run(process_files(files, self.output_dir, executor="thread", safe=False))
+
+    def test_in_flight_limits(self):
+        lock = threading.Lock()
+        state = {"current": 0, "peak": 0, "frames": []}
+
+        def writer(df, input_path):
+            with lock:
+                state["current"] += 1
+                state["peak"] = max(state["peak"], state["current"])
+            time.sleep(0.05)
+            with lock:
+                state["current"] -= 1
+                state["frames"].append(len(df))
+            return f"memory://{os.path.basename(input_path)}"
+
+        results = asyncio.run(process_files(self.files, writer=writer, executor="thread", max_in_flight_files=3))
+        self.assertEqual(results[0]["output"], "memory://people_0.json")
+        self.assertEqual(sorted(state["frames"]), [1, 2, 3, 4, 5, 6])
+        self.assertIn(state["peak"], (2, 3))  # writes overlap, but never beyond the file cap
+
+        # Every file is larger than the byte budget, so they are admitted one at a time
+        state["peak"] = 0
+        asyncio.run(process_files(self.files, writer=writer, executor="thread", max_in_flight_bytes=1))
+        self.assertEqual(state["peak"], 1)
+
+    def test_byte_budget_admits_oversized_request_alone(self):
+        async def scenario():
+            budget = ByteBudget(10)
+            await budget.acquire(50)
+            waiter = asyncio.ensure_future(budget.acquire(1))
+            await asyncio.sleep(0.01)
+            self.assertFalse(waiter.done())
+            await budget.release(50)
+            await waiter
+            return budget.peak
+
+        self.assertEqual(asyncio.run(scenario()), 50)
+
+    def test_requires_destination(self):
+        with self.assertRaises(ValueError):
+            asyncio.run(process_files(self.files))
+
+    def test_rejects_inputs_sharing_an_export(self):
+        os.makedirs(os.path.join(self.temp_dir.name, "other"))
+        twin = self._write(os.path.join("other", "people_0.json"), "[]")
+        with self.assertRaisesRegex(ValueError, "people_0.csv"):
+            asyncio.run(process_files(self.files + [twin], self.output_dir, executor="thread"))
+        self.assertFalse(os.path.exists(self.output_dir))
+        results = asyncio.run(process_files(  # a writer decides its own destinations
+            [self.files[0], twin], executor="thread", writer=lambda df, path: path,
+        ))
+        self.assertEqual([result["output"] for result in results], [self.files[0], twin])
+
+
+if __name__ == "__main__":
+    unittest.main()
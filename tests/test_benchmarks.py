@@ -0,0 +1,103 @@
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from io import StringIO
+
+from benchmarks.compare import compare, load_results, main
+from benchmarks.generators import generate_records, write_json_file, write_xml_file
+from benchmarks.run import STAGES, run_benchmarks
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    # -------------------------
+    # Generators
+    # -------------------------
+    def test_generate_records_is_deterministic(self):
+        first = list(generate_records(50, seed=7))
+        second = list(generate_records(50, seed=7))
+        other = list(generate_records(50, seed=8))
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertEqual([record["id"] for record in first], list(range(50)))
+
+    def test_generate_records_depth_and_flat(self):
+        nested = next(generate_records(1, depth=3))
+        self.assertIn("child", nested["details"]["child"])
+        flat = next(generate_records(1, depth=0))
+        self.assertNotIn("details", flat)
+
+    def test_written_files_parse(self):
+        json_path = write_json_file(os.path.join(self.temp_dir.name, "data.json"), 20, seed=1)
+        with open(json_path, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), list(generate_records(20, seed=1)))
+
+        xml_path = write_xml_file(os.path.join(self.temp_dir.name, "data.xml"), 20, seed=1)
+        from src.transformer import xml_to_dataframe
+        self.assertEqual(len(xml_to_dataframe(xml_path, "record")), 20)
+
+    # -------------------------
+    # Runner and comparison
+    # -------------------------
+    def test_run_benchmarks_document(self):
+        document = run_benchmarks([50], stages=["json_to_dataframe", "validate_rows"], repeat=1)
+        self.assertEqual(document["meta"]["seed"], 42)
+        self.assertEqual([r["stage"] for r in document["results"]], ["json_to_dataframe", "validate_rows"])
+        for result in document["results"]:
+            self.assertEqual(result["size"], 50)
+            self.assertGreater(result["rows_per_second"], 0)
+            self.assertGreater(result["peak_memory_bytes"], 0)
+
+    def test_run_benchmarks_unknown_stage(self):
+        with self.assertRaises(ValueError):
+            run_benchmarks([10], stages=["nope"])
+
+    def test_every_stage_is_callable(self):
+        self.assertIn("bulk_export_to_sql", STAGES)
+        self.assertTrue(all(callable(setup) for setup in STAGES.values()))
+
+    def test_compare_flags_regressions(self):
+        baseline = {
+            ("parse", 1000): {"seconds": 1.0, "peak_memory_bytes": 100},
+            ("export", 1000): {"seconds": 1.0, "peak_memory_bytes": 100},
+            ("validate", 1000): {"seconds": 1.0, "peak_memory_bytes": None},
+        }
+        current = {
+            ("parse", 1000): {"seconds": 1.05, "peak_memory_bytes": 100},
+            ("export", 1000): {"seconds": 1.0, "peak_memory_bytes": 200},
+            ("validate", 1000): {"seconds": 1.5, "peak_memory_bytes": None},
+        }
+        rows = {row["stage"]: row for row in compare(baseline, current, threshold=0.1, memory_threshold=0.25)}
+        self.assertFalse(rows["parse"]["regressed"])
+        self.assertTrue(rows["export"]["regressed"])
+        self.assertTrue(rows["validate"]["regressed"])
+        self.assertIsNone(rows["validate"]["memory_ratio"])
+
+    def test_compare_main_reports_zero_baseline_time(self):
+        paths = []
+        for name, seconds in (("baseline", 0.0), ("current", 0.2)):
+            paths.append(os.path.join(self.temp_dir.name, f"{name}.json"))
+            with open(paths[-1], "w", encoding="utf-8") as f:
+                json.dump({"meta": {}, "results": [{"stage": "parse", "size": 10, "seconds": seconds}]}, f)
+        output = StringIO()
+        with redirect_stdout(output):
+            self.assertEqual(main(paths), 0)
+        self.assertIn("time    n/a", output.getvalue())
+
+    def test_load_results(self):
+        path = os.path.join(self.temp_dir.name, "results.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"meta": {}, "results": [{"stage": "parse", "size": 10, "seconds": 0.5}]}, f)
+        self.assertEqual(load_results(path)[("parse", 10)]["seconds"], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+import pandas as pd
+
+from src.cache import DataFrameCache
+from src.transformer import json_file_to_dataframe, xml_to_dataframe
+
+
+def _load_with_cache(cache_dir, json_path):
+    cache = DataFrameCache(cache_dir)
+    df = json_file_to_dataframe(json_path, cache=cache)
+    return len(df), cache.stats()["hits"]
+
+
+class TestDataFrameCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+        self.json_path = os.path.join(self.temp_dir.name, "people.json")
+        self._write_json([{"Name": "Alice", "Address": {"City": "Manila"}}, {"Name": "Bob", "Address": {"City": "Cebu"}}])
+        self.xml_path = os.path.join(self.temp_dir.name, "people.xml")
+        with open(self.xml_path, "w", encoding="utf-8") as f:
+            f.write("<People><Person><Name>Alice</Name></Person><Item><Name>Pen</Name></Item></People>")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write_json(self, records):
+        with open(self.json_path, "w", encoding="utf-8") as f:
+            json.dump(records, f)
+
+    # -------------------------
+    # Hits, misses and keys
+    # -------------------------
+    def test_json_file_round_trip(self):
+        cache = DataFrameCache(self.cache_dir)
+        first = json_file_to_dataframe(self.json_path, cache=cache)
+        second = json_file_to_dataframe(self.json_path, cache=cache)
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual(list(second.columns), ["Name", "Address.City"])
+        self.assertTrue(os.listdir(self.cache_dir)[0].endswith(".arrow"))
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "writes": 1, "evictions": 0, "hit_rate": 0.5})
+
+    def test_list_columns_are_not_cached(self):
+        self._write_json([{"Name": "Alice", "Tags": [1, 2]}, {"Name": "Bob", "Tags": "none"}])
+        cache = DataFrameCache(self.cache_dir)
+        json_file_to_dataframe(self.json_path, cache=cache)
+        df = json_file_to_dataframe(self.json_path, cache=cache)
+        self.assertEqual(df["Tags"].tolist(), [[1, 2], "none"])
+        self.assertFalse(os.path.exists(self.cache_dir) and os.listdir(self.cache_dir))
+        self.assertEqual(cache.stats()["misses"], 2)
+
+    def test_pickle_entries_are_never_loaded(self):
+        cache = DataFrameCache(self.cache_dir)
+        key = cache.key(self.json_path)
+        os.makedirs(self.cache_dir)
+        with open(os.path.join(self.cache_dir, key + ".pkl"), "wb") as f:
+            f.write(b"cos\nsystem\n(S'exit 1'\ntR.")  # would run a shell command if unpickled
+        with mock.patch("os.system") as system:
+            self.assertIsNone(cache.get(key))
+        system.assert_not_called()
+        cache.clear()  # stale entries still count towards the budget and are cleared
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_key_includes_library_versions(self):
+        cache = DataFrameCache(self.cache_dir)
+        key = cache.key(self.json_path)
+        with mock.patch.object(pd, "__version__", "0.0.0"):
+            self.assertNotEqual(cache.key(self.json_path), key)
+        with mock.patch("pyarrow.__version__", "0.0.0"):
+            self.assertNotEqual(cache.key(self.json_path), key)
+        self.assertEqual(cache.key(self.json_path), key)
+
+    def test_changed_content_is_a_miss(self):
+        cache = DataFrameCache(self.cache_dir)
+        json_file_to_dataframe(self.json_path, cache=cache)
+        self._write_json([{"Name": "Carol"}])
+        df = json_file_to_dataframe(self.json_path, cache=cache)
+        self.assertEqual(df["Name"].tolist(), ["Carol"])
+        self.assertEqual(cache.stats()["hits"], 0)
+
+    def test_xml_key_includes_record_tag(self):
+        cache = DataFrameCache(self.cache_dir)
+        people = xml_to_dataframe(self.xml_path, "Person", cache=cache)
+        items = xml_to_dataframe(self.xml_path, "Item", cache=cache)
+        cached = xml_to_dataframe(self.xml_path, "Person", streaming=True, cache=cache)
+        self.assertEqual(people["Name"].tolist(), ["Alice"])
+        self.assertEqual(items["Name"].tolist(), ["Pen"])
+        pd.testing.assert_frame_equal(people, cached)
+        self.assertEqual(cache.stats()["hits"], 1)
+
+    # -------------------------
+    # Eviction and concurrency
+    # -------------------------
+    def test_lru_eviction(self):
+        cache = DataFrameCache(self.cache_dir)
+        frames = {f"key{i}": pd.DataFrame({"value": range(i * 1000, (i + 1) * 1000)}) for i in range(3)}
+        for key, df in frames.items():
+            cache.put(key, df)
+            time.sleep(0.01)
+        self.assertIsNotNone(cache.get("key0"))  # key0 becomes the most recently used
+
+        cache.max_bytes = cache.size() - 1
+        self.assertEqual(cache.evict(), 1)
+        self.assertIsNone(cache.get("key1"))
+        pd.testing.assert_frame_equal(cache.get("key0"), frames["key0"])
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_unreadable_entry_is_a_miss(self):
+        cache = DataFrameCache(self.cache_dir)
+        os.makedirs(self.cache_dir)
+        with open(os.path.join(self.cache_dir, "broken.arrow"), "wb") as f:
+            f.write(b"not arrow")
+        self.assertIsNone(cache.get("broken"))
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+    def test_shared_between_processes(self):
+        json_file_to_dataframe(self.json_path, cache=DataFrameCache(self.cache_dir))
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(_load_with_cache, [self.cache_dir] * 4, [self.json_path] * 4))
+        self.assertEqual(results, [(2, 1)] * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
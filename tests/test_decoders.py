@@ -0,0 +1,74 @@
+import json
+import os
+import unittest
+
+from src import decoders
+from src.decoders import available_decoders, decoder_name, get_decoder, set_default_decoder
+from src.parser import parse_json_bytes
+
+
+class TestDecoders(unittest.TestCase):
+
+    def setUp(self):
+        self._env = os.environ.pop(decoders.DECODER_ENV, None)
+
+    def tearDown(self):
+        set_default_decoder(None)
+        os.environ.pop(decoders.DECODER_ENV, None)
+        if self._env is not None:
+            os.environ[decoders.DECODER_ENV] = self._env
+
+    def test_available_decoders(self):
+        names = available_decoders()
+        self.assertEqual(names[-1], "json")
+        self.assertEqual(decoder_name(), names[0])
+        self.assertEqual(decoder_name("JSON"), "json")
+
+    def test_backends_match_stdlib(self):
+        documents = [
+            b'{"a": [1, 2.5, "x\\u00e9", null, true], "b": {"c": {}}}',
+            b' [1, 2, 3]\n',
+            "élève".join(['{"name": "', '"}']).encode("utf-8"),
+            b'{"big": 123456789012345678901234567890, "nan": NaN}',  # only the stdlib accepts these
+        ]
+        malformed = [b'{"a": }', b'[1, 2', b'{"a": 1} trailing', b"\xef\xbb\xbf{}"]
+        for name in available_decoders():
+            decode = get_decoder(name)
+            for document in documents:
+                expected = json.loads(document.decode("utf-8"))
+                self.assertEqual(json.dumps(decode(document)), json.dumps(expected), name)
+            for document in malformed:
+                with self.assertRaises(json.JSONDecodeError) as expected:
+                    json.loads(document.decode("utf-8"))
+                with self.assertRaises(json.JSONDecodeError) as raised:
+                    decode(document)
+                self.assertEqual(str(raised.exception), str(expected.exception), name)
+            with self.assertRaises(UnicodeDecodeError):
+                decode(b'{"a": "\xff"}')
+
+    def test_forcing_a_backend(self):
+        os.environ[decoders.DECODER_ENV] = "json"
+        self.assertEqual(decoder_name(), "json")
+        self.assertEqual(set_default_decoder(available_decoders()[0]), available_decoders()[0])
+        self.assertEqual(decoder_name(), available_decoders()[0])  # explicit default beats the environment
+        self.assertEqual(set_default_decoder("auto"), "json")
+        with self.assertRaises(ValueError):
+            get_decoder("yaml")
+        missing = [name for name in decoders.BACKENDS if name not in available_decoders()]
+        if missing:
+            with self.assertRaisesRegex(ValueError, "not installed"):
+                set_default_decoder(missing[0])
+
+    def test_parse_json_bytes_safe_semantics(self):
+        for name in available_decoders():
+            self.assertEqual(parse_json_bytes(b'\xef\xbb\xbf {"a": 1} ', decoder=name), {"a": 1})
+            self.assertIsNone(parse_json_bytes(b" \n\t", decoder=name))
+            self.assertIsNone(parse_json_bytes(b'{"a": ', decoder=name))
+            with self.assertRaises(json.JSONDecodeError):
+                parse_json_bytes(b'{"a": ', safe=False, decoder=name)
+            with self.assertRaises(json.JSONDecodeError):
+                parse_json_bytes(b"", safe=False, decoder=name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,22 @@
 import unittest
 import os
+import json
+import gzip
+import shutil
+import sqlite3
+from unittest import mock
 import pandas as pd
-from src.exporter import export_to_csv, export_to_excel
+from src.fileutils import default_mode
+from src.exporter import (
+    export_to_csv,
+    export_to_excel,
+    export_chunks_to_csv,
+    export_chunks_to_excel,
+    export_to_sql,
+    bulk_export_to_sql,
+    export_to_parquet,
+    export_to_feather,
+)
 
 class TestExporter(unittest.TestCase):
     """Unit tests for exporter.py"""
@@ -14,6 +29,10 @@ class TestExporter(unittest.TestCase):
         })
         self.csv_path = "tests/test_output.csv"
         self.xlsx_path = "tests/test_output.xlsx"
+        self.gz_path = "tests/test_output.csv.gz"
+        self.parquet_path = "tests/test_output.parquet"
+        self.feather_path = "tests/test_output.feather"
+        self.dataset_dir = "tests/test_output_dataset"
 
         # Ensure tests folder exists
         os.makedirs("tests", exist_ok=True)
@@ -24,6 +43,10 @@ class TestExporter(unittest.TestCase):
             os.remove(self.csv_path)
         if os.path.exists(self.xlsx_path):
             os.remove(self.xlsx_path)
+        for path in (self.gz_path, self.parquet_path, self.feather_path):
+            if os.path.exists(path):
+                os.remove(path)
+        shutil.rmtree(self.dataset_dir, ignore_errors=True)
 
     def test_export_to_csv(self):
         """Test exporting DataFrame to CSV"""
@@ -53,6 +76,172 @@ class TestExporter(unittest.TestCase):
         with self.assertRaises(ValueError):
             export_to_excel(empty_df, self.xlsx_path)
 
+    def test_export_chunks_to_csv(self):
+        """Test streaming DataFrame chunks to one CSV file"""
+        chunks = (self.df.assign(Age=self.df["Age"] + i) for i in range(3))
+        rows = export_chunks_to_csv(chunks, self.csv_path)
+        self.assertEqual(rows, 6)
+        df_loaded = pd.read_csv(self.csv_path, encoding="utf-8-sig")
+        self.assertEqual(df_loaded.shape, (6, 2))
+        self.assertEqual(list(df_loaded.columns), ["Name", "Age"])
+        self.assertEqual(df_loaded["Age"].iloc[-1], 32)
+
+    def test_atomic_exports_keep_default_permissions(self):
+        export_to_csv(self.df, self.csv_path)
+        expected = os.stat(self.csv_path).st_mode & 0o777
+        os.remove(self.csv_path)
+        export_chunks_to_csv([self.df], self.csv_path)
+        self.assertEqual(os.stat(self.csv_path).st_mode & 0o777, expected)
+        export_to_parquet(self.df, self.parquet_path)
+        self.assertEqual(os.stat(self.parquet_path).st_mode & 0o777, expected)
+
+        os.chmod(self.csv_path, 0o640)  # an existing target keeps its mode
+        export_chunks_to_csv([self.df], self.csv_path)
+        self.assertEqual(os.stat(self.csv_path).st_mode & 0o777, 0o640)
+
+    def test_export_chunks_to_csv_gzip(self):
+        """Test gzip output is inferred from the file suffix"""
+        export_chunks_to_csv(iter([self.df, pd.DataFrame(), self.df]), self.gz_path)
+        with gzip.open(self.gz_path, "rt", encoding="utf-8-sig") as f:
+            self.assertEqual(f.readline().strip(), "Name,Age")
+        self.assertEqual(len(pd.read_csv(self.gz_path)), 4)
+
+    def test_export_chunks_empty_keeps_existing_file(self):
+        """Test empty input raises ValueError and leaves the previous output untouched"""
+        export_to_csv(self.df, self.csv_path)
+        with self.assertRaises(ValueError):
+            export_chunks_to_csv(iter([pd.DataFrame()]), self.csv_path)
+        self.assertEqual(len(pd.read_csv(self.csv_path)), 2)
+        self.assertEqual([name for name in os.listdir("tests") if name.endswith(".tmp")], [])
+
+    def test_export_to_excel_write_only(self):
+        """Test write-only Excel export reads back like the normal mode"""
+        export_to_excel(self.df, self.xlsx_path, write_only=True)
+        df_loaded = pd.read_excel(self.xlsx_path)
+        self.assertEqual(df_loaded.shape, self.df.shape)
+        self.assertEqual(df_loaded["Name"].tolist(), ["Alice", "Bob"])
+
+    def test_export_chunks_to_excel_sheet_rollover(self):
+        """Test rows roll over to a new sheet when the row limit is reached"""
+        chunks = iter([self.df, self.df.assign(Age=[None, 40])])
+        rows = export_chunks_to_excel(chunks, self.xlsx_path, sheet_name="Data", max_rows=3)
+        self.assertEqual(rows, 4)
+        sheets = pd.read_excel(self.xlsx_path, sheet_name=None)
+        self.assertEqual(list(sheets), ["Data", "Data_2"])
+        self.assertEqual(list(sheets["Data_2"].columns), ["Name", "Age"])
+        self.assertTrue(pd.isna(sheets["Data_2"]["Age"].iloc[0]))
+
+    def test_export_chunks_to_excel_converts_in_slices(self):
+        """Test a single large DataFrame is converted and written slice by slice"""
+        df = pd.DataFrame({"Name": [f"n{i}" for i in range(7)], "Age": [1, 2, 3, 4, 5, None, 7]})
+        with mock.patch("src.exporter.EXCEL_SLICE_ROWS", 3):
+            rows = export_chunks_to_excel(df, self.xlsx_path, sheet_name="Data", max_rows=5)
+        self.assertEqual(rows, 7)
+        sheets = pd.read_excel(self.xlsx_path, sheet_name=None)
+        loaded = pd.concat(sheets.values(), ignore_index=True)
+        self.assertEqual(loaded["Name"].tolist(), df["Name"].tolist())
+        self.assertTrue(pd.isna(loaded["Age"].iloc[5]))
+
+    def test_export_chunks_to_excel_aligns_columns(self):
+        """Test later chunks are written under the first chunk's header"""
+        swapped = pd.DataFrame({"Age": [40], "Name": ["Carol"]})
+        extra = pd.DataFrame({"Name": ["Dan"], "City": ["Cebu"], "Age": [50]})
+        with self.assertLogs("src.exporter", level="WARNING") as logs:
+            export_chunks_to_excel(iter([self.df, swapped, extra]), self.xlsx_path)
+        self.assertIn("City", "".join(logs.output))
+        df_loaded = pd.read_excel(self.xlsx_path)
+        self.assertEqual(list(df_loaded.columns), ["Name", "Age"])
+        self.assertEqual(df_loaded["Name"].tolist(), ["Alice", "Bob", "Carol", "Dan"])
+        self.assertEqual(df_loaded["Age"].tolist(), [25, 30, 40, 50])
+
+    def test_export_to_sql(self):
+        """Test exporting DataFrame to an SQLite table"""
+        connection = sqlite3.connect(":memory:")
+        export_to_sql(self.df, connection, "people", chunksize=1)
+        self.assertEqual(len(pd.read_sql("SELECT * FROM people", connection)), 2)
+        connection.close()
+
+    def test_bulk_export_to_sql_batches(self):
+        """Test bulk loading chunks in committed batches"""
+        connection = sqlite3.connect(":memory:")
+        chunks = iter([self.df, self.df.assign(Age=[35, 40])])
+        rows = bulk_export_to_sql(chunks, connection, "people", batch_size=1, method="multi", dtype={"Age": "INTEGER"})
+        self.assertEqual(rows, 4)
+        df_loaded = pd.read_sql("SELECT * FROM people", connection)
+        self.assertEqual(df_loaded["Age"].tolist(), [25, 30, 35, 40])
+        connection.close()
+
+    def test_bulk_export_to_sql_upsert(self):
+        """Test upsert mode updates existing keys and inserts new ones"""
+        connection = sqlite3.connect(":memory:")
+        bulk_export_to_sql(self.df, connection, "people", upsert_keys=["Name"])
+        update = pd.DataFrame({"Name": ["Bob", "Carol"], "Age": [31, 22]})
+        bulk_export_to_sql(update, connection, "people", upsert_keys=["Name"])
+        df_loaded = pd.read_sql("SELECT * FROM people ORDER BY Name", connection)
+        self.assertEqual(df_loaded.values.tolist(), [["Alice", 25], ["Bob", 31], ["Carol", 22]])
+        connection.close()
+
+    def test_bulk_export_empty_dataframe_sql(self):
+        """Test bulk exporting no rows raises ValueError (SQL)"""
+        connection = sqlite3.connect(":memory:")
+        with self.assertRaises(ValueError):
+            bulk_export_to_sql(iter([pd.DataFrame()]), connection, "people")
+        connection.close()
+
+    def test_export_to_parquet_row_groups(self):
+        """Test exporting chunks to Parquet writes row groups incrementally"""
+        rows = export_to_parquet(iter([self.df, self.df]), self.parquet_path, row_group_size=1, compression="zstd")
+        self.assertEqual(rows, 4)
+        df_loaded = pd.read_parquet(self.parquet_path, columns=["Age"])
+        self.assertEqual(df_loaded["Age"].tolist(), [25, 30, 25, 30])
+
+    def test_export_to_parquet_partitioned(self):
+        """Test partitioning Parquet output by a column into a directory layout"""
+        export_to_parquet(self.df, self.dataset_dir, partition_cols=["Name"])
+        self.assertEqual(sorted(os.listdir(self.dataset_dir)), ["Name=Alice", "Name=Bob"])
+        self.assertEqual(len(pd.read_parquet(self.dataset_dir)), 2)
+
+    def test_export_to_feather(self):
+        """Test exporting chunks to a Feather/Arrow IPC file"""
+        export_to_feather(iter([self.df, self.df]), self.feather_path)
+        self.assertEqual(pd.read_feather(self.feather_path).shape, (4, 2))
+
+    def test_arrow_exports_widen_late_typed_columns(self):
+        import numpy as np
+        import pyarrow.parquet as pq
+        from src.pipeline import ChunkedPipeline
+
+        first = pd.DataFrame({"Name": ["Alice", "Bob"], "Age": [25, 30], "City": [np.nan, np.nan]})
+        second = pd.DataFrame({"Name": ["Carol"], "Age": [31.5], "City": ["Cebu"]})
+        export_to_parquet(iter([first, second]), self.parquet_path)
+        export_to_feather(iter([first, second]), self.feather_path)
+        export_to_parquet(iter([first, second]), self.dataset_dir, partition_cols=["Name"])
+        for df in (
+            pd.read_parquet(self.parquet_path),
+            pd.read_feather(self.feather_path),
+            pq.read_table(self.dataset_dir).to_pandas().sort_values("Age", ignore_index=True),
+        ):
+            self.assertEqual(df["City"].tolist()[2], "Cebu")
+            self.assertTrue(df["City"].iloc[:2].isna().all())
+            self.assertEqual(df["Age"].tolist(), [25.0, 30.0, 31.5])
+        self.assertEqual(os.stat(self.dataset_dir).st_mode & 0o777, default_mode(directory=True))
+
+        # A key first seen in the last record leaves the column all-NaN in earlier chunks.
+        records = [{"Name": f"User{i}"} for i in range(5)] + [{"Name": "Late", "Email": "late@test.com"}]
+        source = "tests/test_output_late.json"
+        with open(source, "w", encoding="utf-8") as f:
+            json.dump(records, f)
+        self.addCleanup(os.remove, source)
+        pipeline = ChunkedPipeline(source, chunk_size=2)
+        self.assertEqual(export_to_parquet(pipeline.iter_chunks(), self.parquet_path), 6)
+        self.assertEqual(pd.read_parquet(self.parquet_path)["Email"].iloc[5], "late@test.com")
+
+    def test_export_empty_dataframe_parquet(self):
+        """Test exporting empty DataFrame raises ValueError (Parquet)"""
+        with self.assertRaises(ValueError):
+            export_to_parquet(pd.DataFrame(), self.parquet_path)
+        self.assertFalse(os.path.exists(self.parquet_path))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,77 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time budgets (microseconds, as reported by -X importtime).
+# They leave generous headroom for slow CI machines while still catching an
+# accidental eager import of pandas (~300 ms) or multiprocessing.
+IMPORT_BUDGETS_US = {
+    "src.parser": 150_000,
+    "src.logger": 100_000,
+}
+
+# Modules a CLI invocation or parse-only job imports before doing any work.
+# src.transformer, src.validator, src.exporter, src.cache and src.pipeline work
+# on DataFrames and import pandas and numpy at module level by design; the
+# modules below import them only inside the functions that need them.
+LIGHT_MODULES = ("src.main", "src.watcher", "src.parser", "src.decoders", "src.manifest", "src.metrics")
+
+
+def _import_profile(statement: str, cwd: str) -> dict:
+    """
+    Run ``statement`` in a fresh interpreter with ``-X importtime`` and return
+    ``{module: cumulative microseconds}`` for every module it imported.
+    """
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=cwd, env=env, capture_output=True, text=True, check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+class TestImportTime(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_parser_is_light(self):
+        profile = _import_profile("import src.parser", self.temp_dir.name)
+        for heavy in ("pandas", "numpy", "multiprocessing", "inspect"):
+            self.assertNotIn(heavy, profile)
+        self.assertLess(profile["src.parser"], IMPORT_BUDGETS_US["src.parser"])
+
+    def test_logger_is_light_and_touches_no_files(self):
+        profile = _import_profile(
+            "from src.logger import get_logger; get_logger('probe')", self.temp_dir.name
+        )
+        self.assertLess(profile["src.logger"], IMPORT_BUDGETS_US["src.logger"])
+        self.assertEqual(os.listdir(self.temp_dir.name), [])
+
+    def test_entry_points_do_not_import_pandas(self):
+        for module in LIGHT_MODULES:
+            profile = _import_profile(f"import {module}", self.temp_dir.name)
+            for heavy in ("pandas", "numpy"):
+                self.assertNotIn(heavy, profile, module)
+
+    def test_export_dependencies_load_on_export(self):
+        profile = _import_profile("import src.exporter", self.temp_dir.name)
+        for optional in ("openpyxl", "sqlalchemy"):
+            self.assertNotIn(optional, profile)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,21 @@
 import unittest
 import logging
-from src.logger import get_logger
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from logging.handlers import QueueHandler
+from src import logger as logger_module
+from src.logger import get_logger, configure_logging, shutdown_logging, RateLimitedLogger
+
+
+def _log_from_worker(message):
+    logger = get_logger("test_logger_worker")
+    logger.info(message)
+    return os.getpid(), any(isinstance(handler, QueueHandler) for handler in logger.handlers)
+
 
 class TestLogger(unittest.TestCase):
     """Unit tests for logger.py"""
@@ -23,6 +38,93 @@ class TestLogger(unittest.TestCase):
         except Exception as e:
             self.fail(f"Logging raised an exception: {e}")
 
+    def setUp(self):
+        self._log_dir = logger_module._settings["log_dir"]
+
+    def tearDown(self):
+        configure_logging(async_mode=False, log_dir=self._log_dir, console_level="DEBUG")
+
+    def _read_log(self, log_dir):
+        with open(os.path.join(log_dir, "transformer.log"), encoding="utf-8") as f:
+            return f.read()
+
+    def test_async_mode_writes_file(self):
+        """Test that async mode enqueues records and the listener writes them"""
+        log_dir = tempfile.mkdtemp()
+        configure_logging(async_mode=True, log_dir=log_dir, console_level="CRITICAL")
+        logger = get_logger("test_logger_async")
+        logger.info("Queued message %s", 42)
+        shutdown_logging()
+        self.assertIn("Queued message 42", self._read_log(log_dir))
+
+    def test_async_mode_keeps_worker_process_records(self):
+        """Test that records logged in pool worker processes reach the log file"""
+        log_dir = tempfile.mkdtemp()
+        configure_logging(async_mode=True, log_dir=log_dir, console_level="CRITICAL")
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            results = list(pool.map(_log_from_worker, [f"From worker {i}" for i in range(4)]))
+        shutdown_logging()
+        # Workers exit without running atexit, so they must not leave records in a queue
+        self.assertEqual([queued for pid, queued in results if pid != os.getpid()], [False] * 4)
+        content = self._read_log(log_dir)
+        for i in range(4):
+            self.assertIn(f"From worker {i}", content)
+
+    def test_reconfiguring_does_not_drop_records(self):
+        """Test that records logged while handlers are swapped are still written"""
+        log_dir = tempfile.mkdtemp()
+        configure_logging(async_mode=True, log_dir=log_dir, console_level="CRITICAL")
+        logger = get_logger("test_logger_reconfigure")
+        done = threading.Event()
+
+        def emit():
+            for i in range(2000):
+                logger.info("Record %s", i)
+            done.set()
+
+        thread = threading.Thread(target=emit)
+        thread.start()
+        while not done.is_set():
+            configure_logging(async_mode=not logger_module._settings["async_mode"])
+        thread.join()
+        shutdown_logging()
+        lines = [line for line in self._read_log(log_dir).splitlines() if "Record " in line]
+        self.assertEqual(len(lines), 2000)
+
+    def test_runtime_level(self):
+        """Test that levels can be changed at runtime"""
+        logger = get_logger("test_logger_runtime_level")
+        configure_logging(level="WARNING")
+        try:
+            self.assertFalse(logger.isEnabledFor(logging.INFO))
+        finally:
+            configure_logging(level="DEBUG")
+        self.assertTrue(logger.isEnabledFor(logging.DEBUG))
+
+    def test_import_does_not_create_log_dir(self):
+        """Test that importing and getting a logger does not touch the disk"""
+        log_dir = os.path.join(tempfile.mkdtemp(), "logs")
+        env = dict(os.environ, TRANSFORMER_LOG_DIR=log_dir)
+        code = "from src.logger import get_logger; get_logger('quiet')"
+        subprocess.run([sys.executable, "-c", code], check=True, env=env, cwd=os.getcwd())
+        self.assertFalse(os.path.exists(log_dir))
+
+    def test_rate_limited_logger(self):
+        """Test that repeated messages are suppressed, sampled and summarised"""
+        logger = get_logger("test_logger_rate_limited")
+        with self.assertLogs(logger, level="WARNING") as captured:
+            limiter = RateLimitedLogger(logger, interval=3600, burst=2, sample_every=5)
+            for i in range(12):
+                limiter.warning("column:Age", "Failed to convert value %s", i)
+            limiter.warning("column:Name", "Failed once")
+            limiter.flush()
+        messages = [record.getMessage() for record in captured.records]
+        self.assertEqual(messages[:3], ["Failed to convert value 0", "Failed to convert value 1", "Failed to convert value 6"])
+        self.assertIn("Failed once", messages)
+        self.assertTrue(any(message.startswith("column:Age: 12 occurrences") for message in messages))
+        self.assertFalse(any(message.startswith("column:Name:") for message in messages))
+        self.assertEqual(limiter.counts(), {"column:Age": 12, "column:Name": 1})
+
 
 if __name__ == "__main__":
     unittest.main()
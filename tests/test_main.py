@@ -0,0 +1,181 @@
+import json
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from src.main import MANIFEST_NAME, load_config, main, output_path_for, process_file, run_batch
+
+
+def _crash_on_broken(input_path, config):
+    # Simulates a worker killed by the OOM killer or a segfault.
+    if "broken" in input_path:
+        os._exit(1)
+    return process_file(input_path, config)
+
+
+class TestBatchRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.input_dir = os.path.join(self.temp_dir.name, "input")
+        self.output_dir = os.path.join(self.temp_dir.name, "output")
+        os.makedirs(os.path.join(self.input_dir, "nested"))
+        for i in range(5):
+            self._write(f"people_{i}.json", json.dumps([{"Name": f"p{i}-{n}", "Age": n} for n in range(3)]))
+        self._write("broken.json", "{not json")
+        self._write("nested/items.xml", "<Items><Item><Name>Pen</Name><Age>1</Age></Item></Items>")
+        self._write("notes.txt", "ignored")
+
+        self.config_path = os.path.join(self.temp_dir.name, "config.json")
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "input": {"directory": self.input_dir, "recursive": True, "record_tag": "Item"},
+                "output": {"directory": self.output_dir},
+                "workers": 2,
+                "max_in_flight": 2,
+                "transformations": {"Name": "str.upper"},
+                "validation": {"field_types": {"Age": "int"}},
+            }, f)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, name, content):
+        with open(os.path.join(self.input_dir, name), "w", encoding="utf-8") as f:
+            f.write(content)
+
+    # -------------------------
+    # Config
+    # -------------------------
+    def test_load_config_defaults_and_validation(self):
+        config = load_config(self.config_path)
+        self.assertEqual(config["output"]["format"], "csv")
+        self.assertEqual(config["input"]["patterns"], ["*.json", "*.xml", "*.ndjson", "*.jsonl"])
+        self.assertEqual(config["workers"], 2)
+
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump({"output": {"format": "yaml"}}, f)
+        with self.assertRaises(ValueError):
+            load_config(self.config_path)
+        with open(self.config_path, "w", encoding="utf-8") as f:
+            json.dump({"json_decoder": "yaml"}, f)
+        with self.assertRaises(ValueError):
+            load_config(self.config_path)
+        with self.assertRaises(FileNotFoundError):
+            load_config(os.path.join(self.temp_dir.name, "missing.json"))
+
+    # -------------------------
+    # Batch runs
+    # -------------------------
+    def test_run_batch_continues_past_failures(self):
+        for executor in ("process", "thread"):
+            config = load_config(self.config_path)
+            config["executor"] = executor
+            summary = run_batch(config)
+            self.assertEqual((summary["files"], summary["succeeded"], summary["failed"]), (7, 6, 1))
+            self.assertEqual(summary["rows_out"], 16)
+            self.assertIn("broken.json", next(iter(summary["failures"])))
+            self.assertGreater(summary["rows_per_second"], 0)
+
+        xml_output = output_path_for(os.path.join(self.input_dir, "nested", "items.xml"), config)
+        self.assertEqual(xml_output, os.path.join(self.output_dir, "nested", "items.csv"))
+        df = pd.read_csv(os.path.join(self.output_dir, "people_1.csv"))
+        self.assertEqual(df["Name"].tolist(), ["P1-0", "P1-1", "P1-2"])
+
+    def test_worker_crash_is_reported_per_file(self):
+        from unittest import mock
+
+        config = load_config(self.config_path)
+        config["incremental"] = True
+        with mock.patch("src.main.process_file", _crash_on_broken):
+            summary = run_batch(config)
+        self.assertEqual(summary["files"], 7)
+        self.assertGreaterEqual(summary["failed"], 1)
+        self.assertTrue(any("BrokenProcessPool" in error for error in summary["failures"].values()))
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, MANIFEST_NAME)))
+
+    def test_invalid_rows_are_written_not_fatal(self):
+        input_dir = os.path.join(self.temp_dir.name, "typed")
+        os.makedirs(input_dir)
+        records = [
+            {"Name": "a", "Active": "false", "Seen": "2024-01-02"},
+            {"Name": "b", "Active": "yes?", "Seen": "2024-01-03"},
+            {"Name": "c", "Active": "true", "Seen": "not a date"},
+        ]
+        with open(os.path.join(input_dir, "typed.json"), "w", encoding="utf-8") as f:
+            json.dump(records, f)
+        config = load_config(self.config_path)
+        config["input"]["directory"] = input_dir
+        config["executor"] = "thread"
+        config["transformations"] = {}
+        config["validation"] = {"required_fields": ["Name"], "field_types": {"Active": "bool", "Seen": "datetime"}}
+        summary = run_batch(config)
+        self.assertEqual((summary["failed"], summary["rows_out"]), (0, 1))
+
+        df = pd.read_csv(os.path.join(self.output_dir, "typed.csv"))
+        self.assertEqual(df.to_dict("records"), [{"Name": "a", "Active": False, "Seen": "2024-01-02"}])
+        invalid = pd.read_csv(os.path.join(self.output_dir, "typed.invalid.csv"))
+        self.assertEqual(invalid["Name"].tolist(), ["b", "c"])
+        self.assertEqual(invalid["_errors"].tolist(), ["Active:type", "Seen:type"])
+
+    def test_ndjson_rejects_are_written(self):
+        self._write("events.ndjson", '{"Name": "a", "Age": 1}\n{oops\n{"Name": "b", "Age": 2}\n')
+        config = load_config(self.config_path)
+        config["executor"] = "thread"
+        summary = run_batch(config)
+        self.assertEqual((summary["files"], summary["failed"], summary["rejected"]), (8, 1, 1))
+        df = pd.read_csv(os.path.join(self.output_dir, "events.csv"))
+        self.assertEqual(df["Name"].tolist(), ["A", "B"])
+        with open(os.path.join(self.output_dir, "events.rejects.ndjson"), encoding="utf-8") as f:
+            rejects = [json.loads(line) for line in f]
+        self.assertEqual([(reject["line"], reject["content"]) for reject in rejects], [(2, "{oops")])
+
+        self._write("events.ndjson", '{"Name": "a", "Age": 1}\n')
+        self.assertEqual(run_batch(config)["rejected"], 0)
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, "events.rejects.ndjson")))
+
+    def test_file_with_no_valid_rows_keeps_its_reject_files(self):
+        self._write("bad.ndjson", '{"Name": "a", "Age": "x"}\n{oops\n')
+        config = load_config(self.config_path)
+        result = process_file(os.path.join(self.input_dir, "bad.ndjson"), config)
+        self.assertIn("No rows left to export (1 read, 1 invalid, 1 malformed lines rejected)", result["error"])
+        self.assertIsNone(result["output"])
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, "bad.invalid.csv")))
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, "bad.rejects.ndjson")))
+
+    def test_inputs_sharing_an_output_fail(self):
+        self._write("people_0.xml", "<Items><Item><Name>Pen</Name><Age>1</Age></Item></Items>")
+        config = load_config(self.config_path)
+        config["executor"] = "thread"
+        config["incremental"] = True
+        for _ in range(2):  # the colliding files are failed again, not recorded as done
+            summary = run_batch(config)
+            self.assertEqual(
+                sorted(os.path.basename(path) for path in summary["failures"]),
+                ["broken.json", "people_0.json", "people_0.xml"],
+            )
+            self.assertIn("people_0.csv", summary["failures"][os.path.join(self.input_dir, "people_0.xml")])
+        self.assertFalse(os.path.exists(os.path.join(self.output_dir, "people_0.csv")))
+
+    def test_incremental_run_skips_unchanged_files(self):
+        config = load_config(self.config_path)
+        config["incremental"] = True
+        self.assertEqual(run_batch(config)["files"], 7)
+        summary = run_batch(config)
+        self.assertEqual((summary["files"], summary["failed"]), (1, 1))  # only the broken file is retried
+
+    def test_main_exit_status(self):
+        with open(os.devnull, "w") as devnull:
+            from contextlib import redirect_stdout
+            with redirect_stdout(devnull):
+                self.assertEqual(main(["--config", self.config_path, "--workers", "1"]), 1)
+                os.remove(os.path.join(self.input_dir, "broken.json"))
+                self.assertEqual(main(["--config", self.config_path, "--format", "parquet"]), 0)
+                self.assertEqual(main(["--config", self.config_path, "--input", "/nonexistent"]), 2)
+        self.assertTrue(os.path.exists(os.path.join(self.output_dir, "people_0.parquet")))
+
+
+if __name__ == "__main__":
+    unittest.main()
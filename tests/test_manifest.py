@@ -0,0 +1,122 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from src import manifest as manifest_module
+from src.manifest import FileManifest, file_hash
+
+
+class TestFileManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.manifest_path = os.path.join(self.temp_dir.name, "state", "manifest.json")
+        self.input_a = self._write("a.json", '[{"id": 1}]')
+        self.input_b = self._write("b.json", '[{"id": 2}]')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def _processed(self, paths, outputs=None):
+        manifest = FileManifest(self.manifest_path)
+        for path in manifest.changed(paths):
+            manifest.record(path, outputs)
+        manifest.save()
+        return manifest
+
+    # -------------------------
+    # Change detection
+    # -------------------------
+    def test_new_files_are_changed_until_saved(self):
+        manifest = FileManifest(self.manifest_path)
+        self.assertEqual(manifest.changed([self.input_a, self.input_b]), [self.input_a, self.input_b])
+        manifest.record(self.input_a)
+        # Not saved: a fresh manifest still sees both files as new
+        self.assertEqual(FileManifest(self.manifest_path).changed([self.input_a]), [self.input_a])
+
+    def test_unchanged_files_skip_hashing(self):
+        self._processed([self.input_a, self.input_b])
+        manifest = FileManifest(self.manifest_path)
+        with mock.patch.object(manifest_module, "file_hash", wraps=file_hash) as hashed:
+            self.assertEqual(manifest.changed([self.input_a, self.input_b]), [])
+        hashed.assert_not_called()
+
+    def test_touched_file_with_same_content_is_unchanged(self):
+        self._processed([self.input_a])
+        stat = os.stat(self.input_a)
+        os.utime(self.input_a, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        manifest = FileManifest(self.manifest_path)
+        self.assertEqual(manifest.changed([self.input_a]), [])
+        self.assertEqual(manifest.hashed, 1)
+        manifest.save()
+        # The refreshed mtime is persisted, so the next run does not hash again
+        manifest = FileManifest(self.manifest_path)
+        manifest.changed([self.input_a])
+        self.assertEqual(manifest.hashed, 0)
+
+    def test_modified_file_is_changed(self):
+        self._processed([self.input_a, self.input_b])
+        self._write("b.json", '[{"id": 3}]')
+        self.assertEqual(FileManifest(self.manifest_path).changed([self.input_a, self.input_b]), [self.input_b])
+
+    def test_file_deleted_after_discovery_is_changed(self):
+        manifest = FileManifest(self.manifest_path)
+        os.remove(self.input_b)
+        self.assertEqual(manifest.changed([self.input_a, self.input_b]), [self.input_a, self.input_b])
+
+    def test_record_keeps_the_signature_seen_before_loading(self):
+        manifest = FileManifest(self.manifest_path)
+        self.assertEqual(manifest.changed([self.input_b]), [self.input_b])
+        self._write("b.json", '[{"id": 3}, {"id": 4}]')  # modified while it was being processed
+        manifest.record(self.input_b)
+        manifest.save()
+        self.assertEqual(FileManifest(self.manifest_path).changed([self.input_b]), [self.input_b])
+
+        manifest = FileManifest(self.manifest_path)
+        signature = manifest.signature(self.input_a)
+        self._write("a.json", '[{"id": 5}]')
+        manifest.record(self.input_a, signature=signature)
+        self.assertEqual(manifest.changed([self.input_a]), [self.input_a])
+
+    # -------------------------
+    # Deleted inputs and persistence
+    # -------------------------
+    def test_stale_outputs_of_deleted_inputs(self):
+        output = self._write("a.csv", "id\n1\n")
+        self._processed([self.input_a], outputs=[output])
+        self._processed([self.input_b])
+        os.remove(self.input_a)
+
+        manifest = FileManifest(self.manifest_path)
+        self.assertEqual(manifest.deleted(), [os.path.normpath(self.input_a)])
+        self.assertEqual(manifest.stale_outputs(), {os.path.normpath(self.input_a): [output]})
+        self.assertEqual(manifest.stale_outputs([self.input_b]), {os.path.normpath(self.input_a): [output]})
+        manifest.forget(self.input_a)
+        self.assertEqual(manifest.stale_outputs(), {})
+
+    def test_save_is_atomic(self):
+        self._processed([self.input_a])
+        with open(self.manifest_path, encoding="utf-8") as before:
+            original = before.read()
+
+        manifest = FileManifest(self.manifest_path)
+        manifest.record(self.input_b)
+        with mock.patch("json.dump", side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                manifest.save()
+        with open(self.manifest_path, encoding="utf-8") as after:
+            self.assertEqual(after.read(), original)
+        self.assertEqual(os.listdir(os.path.dirname(self.manifest_path)), ["manifest.json"])
+        self.assertEqual(list(json.loads(original)["files"]), [os.path.normpath(self.input_a)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import os
+import json
+import tempfile
+import pandas as pd
+from src import metrics
+from src.transformer import json_file_to_dataframe, transform_dataframe
+from src.exporter import export_to_csv
+
+class TestMetrics(unittest.TestCase):
+    """Unit tests for metrics.py"""
+
+    def setUp(self):
+        """Enable metrics and create a small JSON input"""
+        metrics.reset()
+        metrics.enable()
+        self.temp_json = tempfile.NamedTemporaryFile(delete=False, suffix=".json", mode='w', encoding='utf-8')
+        json.dump([{"Name": "Alice", "Age": "25"}, {"Name": "Bob", "Age": "30"}], self.temp_json)
+        self.temp_json.close()
+        self.csv_path = "tests/test_metrics_output.csv"
+
+    def tearDown(self):
+        metrics.disable()
+        metrics.reset()
+        os.unlink(self.temp_json.name)
+        if os.path.exists(self.csv_path):
+            os.remove(self.csv_path)
+
+    def test_stage_metrics_recorded(self):
+        """Test rows, bytes and timings are recorded per stage"""
+        df = json_file_to_dataframe(self.temp_json.name)
+        df = transform_dataframe(df, {"Age": int})
+        export_to_csv(df, self.csv_path)
+
+        stages = metrics.get_metrics()
+        loaded = stages["json_file_to_dataframe"]
+        self.assertEqual(loaded["calls"], 1)
+        self.assertEqual(loaded["rows"], 2)
+        self.assertEqual(loaded["bytes_read"], os.path.getsize(self.temp_json.name))
+        self.assertGreater(loaded["wall_seconds"], 0)
+        self.assertEqual(stages["export_to_csv"]["bytes_written"], os.path.getsize(self.csv_path))
+        self.assertEqual(stages["transform_dataframe"]["rows"], 2)
+
+    def test_errors_counted(self):
+        """Test failing calls are counted as errors"""
+        with self.assertRaises(FileNotFoundError):
+            json_file_to_dataframe("nonexistent.json")
+        self.assertEqual(metrics.get_metrics()["json_file_to_dataframe"]["errors"], 1)
+
+    def test_disabled_records_nothing(self):
+        """Test nothing is collected while metrics are disabled"""
+        metrics.disable()
+        json_file_to_dataframe(self.temp_json.name)
+        self.assertEqual(metrics.get_metrics(), {})
+
+    def test_dumps(self):
+        """Test JSON and Prometheus text output"""
+        transform_dataframe(pd.DataFrame({"Age": ["1"]}), {"Age": int})
+        self.assertEqual(json.loads(metrics.to_json())["transform_dataframe"]["calls"], 1)
+        text = metrics.to_prometheus()
+        self.assertIn("# TYPE transformer_stage_calls_total counter", text)
+        self.assertIn('transformer_stage_rows_total{stage="transform_dataframe"} 1', text)
+
+    def test_nested_stage_keeps_outer_peak(self):
+        """Test a nested instrumented call does not hide the outer call's peak"""
+        @metrics.instrument(stage="inner")
+        def inner():
+            return len(bytearray(1_000_000))
+
+        @metrics.instrument(stage="outer")
+        def outer():
+            big = bytearray(8_000_000)
+            del big
+            return inner()
+
+        metrics.disable()
+        metrics.enable(track_memory=True)
+        outer()
+        stages = metrics.get_metrics()
+        self.assertGreaterEqual(stages["outer"]["peak_memory_bytes"], 8_000_000)
+        self.assertLess(stages["inner"]["peak_memory_bytes"], 8_000_000)
+        self.assertEqual(stages["outer"]["process_max_rss_bytes"], 0)
+
+    def test_untracked_memory_is_labelled_process_wide(self):
+        """Test max RSS is not reported as a per-stage peak"""
+        transform_dataframe(pd.DataFrame({"Age": ["1"]}), {"Age": int})
+        values = metrics.get_metrics()["transform_dataframe"]
+        self.assertEqual(values["peak_memory_bytes"], 0)
+        if metrics.resource is not None:
+            self.assertGreater(values["process_max_rss_bytes"], 0)
+        self.assertIn("transformer_stage_process_max_rss_bytes", metrics.to_prometheus())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,7 +5,11 @@ import json
 import xml.etree.ElementTree as ET
 from src.parser import (
     load_json_file,
+    iter_json_records,
+    iter_ndjson_records,
     load_multiple_json,
+    load_ndjson,
+    ndjson_byte_ranges,
     load_xml_file,
     load_multiple_xml
 )
@@ -75,6 +79,40 @@ class TestParser(unittest.TestCase):
         self.assertEqual(len(data_list), 2)
         self.assertEqual(data_list[1]["Name"], "Bob")
 
+    def test_load_multiple_json_parallel(self):
+        files = [self.temp_json.name, "nonexistent.json", self.temp_json2.name]
+        for executor in ("process", "thread"):
+            failures = []
+            data_list = load_multiple_json(files, workers=2, executor=executor, failures=failures)
+            self.assertEqual([data["Name"] for data in data_list], ["Alice", "Bob"])
+            self.assertEqual(len(failures), 1)
+            self.assertEqual(failures[0][0], "nonexistent.json")
+            self.assertIsInstance(failures[0][1], FileNotFoundError)
+        with self.assertRaises(FileNotFoundError):
+            load_multiple_json(files, safe=False, workers=2)
+
+    def test_load_multiple_json_flatten(self):
+        records = load_multiple_json([self.temp_json.name, self.temp_json2.name], workers=2, flatten=True)
+        self.assertEqual(records, [[self.sample_json], [self.sample_json2]])
+
+    def test_load_multiple_json_manifest(self):
+        from src.manifest import FileManifest
+        with tempfile.TemporaryDirectory() as temp_dir:
+            manifest_path = os.path.join(temp_dir, "manifest.json")
+            files = [self.temp_json.name, self.temp_json2.name]
+            manifest = FileManifest(manifest_path)
+            self.assertEqual(len(load_multiple_json(files, manifest=manifest)), 2)
+            manifest.save()
+
+            manifest = FileManifest(manifest_path)
+            self.assertEqual(load_multiple_json(files, manifest=manifest), [])
+            with open(self.temp_json2.name, "w", encoding="utf-8") as f:
+                json.dump({"Name": "Carol"}, f)
+            self.assertEqual(load_multiple_json(files, manifest=manifest), [{"Name": "Carol"}])
+            failures = []
+            self.assertEqual(load_multiple_json(files + ["deleted.json"], manifest=manifest, failures=failures), [])
+            self.assertEqual([file for file, _ in failures], ["deleted.json"])
+
     def test_load_json_file_not_found(self):
         # Use safe=False to force exception
         with self.assertRaises(FileNotFoundError):
@@ -88,6 +126,108 @@ class TestParser(unittest.TestCase):
             load_json_file(temp_invalid.name, safe=False)
         os.unlink(temp_invalid.name)
 
+    def test_iter_json_records(self):
+        records = [{"Name": f"User{i}", "Age": i * 1000, "Tags": ["a", {"b": i}]} for i in range(50)]
+        temp_array = tempfile.NamedTemporaryFile(delete=False, suffix=".json", mode='w', encoding='utf-8-sig')
+        json.dump(records, temp_array, indent=2)
+        temp_array.close()
+        # A tiny read size forces records and numbers to span block boundaries
+        self.assertEqual(list(iter_json_records(temp_array.name, read_size=7)), records)
+        chunks = list(iter_json_records(temp_array.name, chunk_size=20))
+        self.assertEqual([len(chunk) for chunk in chunks], [20, 20, 10])
+        self.assertEqual(chunks[2][-1], records[-1])
+        os.unlink(temp_array.name)
+
+    def test_iter_json_records_single_object(self):
+        self.assertEqual(list(iter_json_records(self.temp_json.name)), [self.sample_json])
+
+    def test_iter_json_records_empty_and_missing(self):
+        temp_empty = tempfile.NamedTemporaryFile(delete=False, suffix=".json", mode='w', encoding='utf-8')
+        temp_empty.write("   \n")
+        temp_empty.close()
+        self.assertEqual(list(iter_json_records(temp_empty.name)), [])
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_records(temp_empty.name, safe=False))
+        os.unlink(temp_empty.name)
+        self.assertEqual(list(iter_json_records("nonexistent.json")), [])
+        with self.assertRaises(FileNotFoundError):
+            list(iter_json_records("nonexistent.json", safe=False))
+
+    def test_iter_json_records_invalid(self):
+        temp_invalid = tempfile.NamedTemporaryFile(delete=False, suffix=".json", mode='w', encoding='utf-8')
+        temp_invalid.write('[{"a": 1}, {"a": 2}, {"a": ]')
+        temp_invalid.close()
+        self.assertEqual(list(iter_json_records(temp_invalid.name, read_size=4)), [{"a": 1}, {"a": 2}])
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_records(temp_invalid.name, safe=False))
+        os.unlink(temp_invalid.name)
+
+    def test_iter_json_records_stops_at_malformed_element(self):
+        temp_invalid = tempfile.NamedTemporaryFile(delete=False, suffix=".json", mode='wb')
+        # The invalid UTF-8 tail, past the text layer's read-ahead, would raise
+        # UnicodeDecodeError if the rest of the file were ever read
+        temp_invalid.write(b'[{"a": 1}, {"a": x, "b": "one, two"},' + b' ' * 65536 + b'{"a": "\xff"}]')
+        temp_invalid.close()
+        self.addCleanup(os.unlink, temp_invalid.name)
+        with self.assertLogs("src.parser", level="ERROR") as logs:
+            self.assertEqual(list(iter_json_records(temp_invalid.name, read_size=8)), [{"a": 1}])
+        self.assertEqual(len(logs.records), 1)
+        with self.assertRaises(json.JSONDecodeError):
+            list(iter_json_records(temp_invalid.name, read_size=8, safe=False))
+
+    # -------------------------
+    # NDJSON tests
+    # -------------------------
+    def _write_ndjson(self, lines):
+        temp_ndjson = tempfile.NamedTemporaryFile(delete=False, suffix=".ndjson", mode='w', encoding='utf-8')
+        temp_ndjson.write("\n".join(lines) + "\n")
+        temp_ndjson.close()
+        self.addCleanup(os.unlink, temp_ndjson.name)
+        return temp_ndjson.name
+
+    def test_ndjson_byte_ranges_align_to_lines(self):
+        path = self._write_ndjson([json.dumps({"id": i, "pad": "x" * (i % 7)}) for i in range(100)])
+        with open(path, "rb") as f:
+            content = f.read()
+        ranges = ndjson_byte_ranges(path, 8)
+        self.assertEqual(ranges[0][0], 0)
+        self.assertEqual(ranges[-1][1], len(content))
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(content[end - 1:end], b"\n")
+
+    def test_iter_ndjson_records_rejects(self):
+        path = self._write_ndjson(['{"a": 1}', "", '{"a": ', '[1, 2]', '{"a": 3}'])
+        rejects = []
+        self.assertEqual(list(iter_ndjson_records(path, rejects=rejects)), [{"a": 1}, [1, 2], {"a": 3}])
+        self.assertEqual([reject["line"] for reject in rejects], [3])
+        self.assertEqual(rejects[0]["content"], '{"a":')
+
+        rejects = []
+        self.assertEqual(list(iter_ndjson_records(path, rejects=rejects, objects_only=True)), [{"a": 1}, {"a": 3}])
+        self.assertEqual([reject["line"] for reject in rejects], [3, 4])
+        with self.assertRaisesRegex(json.JSONDecodeError, "line 3"):
+            list(iter_ndjson_records(path, safe=False))
+        self.assertEqual(list(iter_ndjson_records("nonexistent.ndjson")), [])
+
+    def test_load_ndjson_parallel_matches_streaming(self):
+        lines = [json.dumps({"id": i, "user": {"name": f"u{i}"}}) for i in range(300)]
+        lines[17] = "{broken"
+        lines[250] = '{"id": "\xff'
+        path = self._write_ndjson(lines)
+        streamed_rejects = []
+        streamed = list(iter_ndjson_records(path, rejects=streamed_rejects))
+        for executor in ("process", "thread"):
+            rejects = []
+            records = load_ndjson(path, workers=3, executor=executor, rejects=rejects, chunk_bytes=512)
+            self.assertEqual(records, streamed)
+            self.assertEqual([reject["line"] for reject in rejects], [18, 251])
+            self.assertEqual(rejects, streamed_rejects)
+        flat = load_ndjson(path, workers=2, flatten=True, chunk_bytes=512)
+        self.assertEqual(flat[0], {"id": 0, "user.name": "u0"})
+        with self.assertRaisesRegex(json.JSONDecodeError, "line 18"):
+            load_ndjson(path, safe=False, workers=2, chunk_bytes=512)
+
     # -------------------------
     # XML tests
     # -------------------------
@@ -105,6 +245,14 @@ class TestParser(unittest.TestCase):
         self.assertEqual(roots[0].tag, "People")
         self.assertEqual(len(roots[1].findall("Person")), 2)
 
+    def test_load_multiple_xml_parallel_records(self):
+        files = [self.temp_xml.name, self.temp_xml2.name]
+        records = load_multiple_xml(files, workers=2, record_tag="Person")
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[1][1], {"Name": "Bob", "Age": "30", "Email": "bob@test.com"})
+        roots = load_multiple_xml(files, workers=2, executor="thread")
+        self.assertEqual(roots[0].tag, "People")
+
     def test_load_xml_file_not_found(self):
         with self.assertRaises(FileNotFoundError):
             load_xml_file("nonexistent.xml", safe=False)
@@ -0,0 +1,83 @@
+import unittest
+import tempfile
+import os
+import json
+import pandas as pd
+from src.pipeline import ChunkedPipeline
+
+class TestPipeline(unittest.TestCase):
+    """Unit tests for pipeline.py"""
+
+    def setUp(self):
+        """Set up temporary JSON and XML files with a key that appears late"""
+        self.json_data = [{"Name": f"User{i}", "Details": {"Age": str(20 + i)}} for i in range(7)]
+        self.json_data[6]["Details"]["Email"] = "late@test.com"
+        self.temp_json = tempfile.NamedTemporaryFile(delete=False, suffix=".json", mode='w', encoding='utf-8')
+        json.dump(self.json_data, self.temp_json)
+        self.temp_json.close()
+
+        people = "".join(f"<Person><Name>P{i}</Name><Age>{i}</Age></Person>" for i in range(5))
+        self.temp_xml = tempfile.NamedTemporaryFile(delete=False, suffix=".xml", mode='w', encoding='utf-8')
+        self.temp_xml.write(f"<People>{people}<Person><Name>Q</Name><City>Cebu</City></Person></People>")
+        self.temp_xml.close()
+
+        self.csv_path = "tests/test_pipeline_output.csv"
+
+    def tearDown(self):
+        os.unlink(self.temp_json.name)
+        os.unlink(self.temp_xml.name)
+        if os.path.exists(self.csv_path):
+            os.remove(self.csv_path)
+
+    def test_json_chunks_share_columns(self):
+        pipeline = ChunkedPipeline(
+            self.temp_json.name,
+            chunk_size=3,
+            column_mapping={"Details.Age": "Age"},
+            transformations={"Age": int},
+            required_fields=["Name"],
+        )
+        chunks = list(pipeline.iter_chunks())
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 3, 1])
+        for chunk in chunks:
+            self.assertEqual(list(chunk.columns), ["Name", "Age", "Details.Email"])
+        self.assertEqual(chunks[0]["Age"].iloc[0], 20)
+        self.assertEqual(pipeline.rows_out, 7)
+
+    def test_xml_to_csv(self):
+        pipeline = ChunkedPipeline(self.temp_xml.name, record_tag="Person", chunk_size=2)
+        pipeline.to_csv(self.csv_path)
+        df_loaded = pd.read_csv(self.csv_path)
+        self.assertEqual(df_loaded.shape, (6, 3))
+        self.assertEqual(list(df_loaded.columns), ["Name", "Age", "City"])
+        self.assertEqual(df_loaded["City"].iloc[5], "Cebu")
+
+    def test_explicit_columns(self):
+        pipeline = ChunkedPipeline(self.temp_json.name, chunk_size=4, columns=["Name"])
+        chunks = list(pipeline.iter_chunks())
+        self.assertTrue(all(list(chunk.columns) == ["Name"] for chunk in chunks))
+
+    def test_ndjson_chunks_collect_rejects(self):
+        lines = [json.dumps(record) for record in self.json_data]
+        lines.insert(2, "{not json")
+        temp_ndjson = tempfile.NamedTemporaryFile(delete=False, suffix=".jsonl", mode='w', encoding='utf-8')
+        temp_ndjson.write("\n".join(lines))
+        temp_ndjson.close()
+        self.addCleanup(os.unlink, temp_ndjson.name)
+
+        pipeline = ChunkedPipeline(temp_ndjson.name, chunk_size=3)
+        with self.assertLogs("src.parser", level="WARNING") as logs:
+            chunks = list(pipeline.iter_chunks())
+        self.assertEqual(len([line for line in logs.output if "Rejected 1 malformed" in line]), 1)
+        self.assertEqual(pipeline.source_type, "ndjson")
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 3, 1])
+        self.assertEqual(list(chunks[0].columns), ["Name", "Details.Age", "Details.Email"])
+        self.assertEqual([reject["line"] for reject in pipeline.rejects], [3])
+
+    def test_xml_requires_record_tag(self):
+        with self.assertRaises(ValueError):
+            ChunkedPipeline(self.temp_xml.name)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,15 +1,24 @@
 import unittest
+import numpy as np
 import pandas as pd
 import tempfile
 import os
 import json
 from src.transformer import (
     flatten_json,
+    JsonFlattener,
     json_to_dataframe,
     json_file_to_dataframe,
+    ndjson_to_dataframe,
+    records_to_dataframe,
     xml_to_dataframe,
+    xml_to_dataframe_chunks,
     rename_columns,
-    transform_dataframe
+    transform_dataframe,
+    explain_transformations,
+    arithmetic,
+    regex_replace,
+    to_numeric,
 )
 
 class TestTransformer(unittest.TestCase):
@@ -65,12 +74,105 @@ class TestTransformer(unittest.TestCase):
         expected = {"A.B": 1, "A.C.D": 2, "E": 3}
         self.assertEqual(flat, expected)
 
+    def test_flatten_json_deep_document(self):
+        nested = {}
+        current = nested
+        for _ in range(5000):
+            current["k"] = {}
+            current = current["k"]
+        current["v"] = 1
+        flat = flatten_json(nested)
+        self.assertEqual(list(flat.values()), [1])
+        self.assertTrue(next(iter(flat)).endswith("k.v"))
+
+    def test_json_flattener(self):
+        flattener = JsonFlattener()
+        records = [
+            {"A": {"B": 1, "C": {"D": 2}}, "E": 3},
+            {"E": 4, "A": {"C": {"D": 5}, "B": 6}},
+            {"A": {"B": 7, "C": {"D": {"X": 8}}}, "E": 9},
+            {"A": {"B": 10}, "E": 11},
+        ]
+        for record in records:
+            self.assertEqual(flattener(record), flatten_json(record))
+        self.assertEqual(list(flattener(records[0])), ["A.B", "A.C.D", "E"])
+        self.assertEqual((flattener.compiled_hits, flattener.fallbacks), (3, 2))
+
+        given = JsonFlattener(template={"A": {"B": None}, "E": None})
+        self.assertEqual(given({"A": {"B": 1}, "E": 2}), {"A.B": 1, "E": 2})
+        self.assertEqual(given.fallbacks, 0)
+
     def test_json_to_dataframe(self):
         df = json_to_dataframe(self.json_data)
         self.assertIsInstance(df, pd.DataFrame)
         self.assertIn("Details.Age", df.columns)
         self.assertEqual(df.shape[0], 2)
 
+    def test_records_to_dataframe_matches_pandas(self):
+        records = [
+            {"id": 1, "name": "a", "score": 1.5, "flag": True},
+            {"id": 2, "name": "b", "score": 2.5, "flag": False},
+            {"id": 3, "extra": None, "score": 3},
+            {"name": "d", "tags": [1, 2], "big": 2 ** 70},
+            {"id": 5, "name": "e", "score": 5.5, "flag": True},
+        ]
+        for batch_size in (1, 2, 4096):
+            df = records_to_dataframe(iter(records), batch_size=batch_size)
+            pd.testing.assert_frame_equal(df, pd.DataFrame(records))
+        self.assertEqual(list(df.columns), ["id", "name", "score", "flag", "extra", "tags", "big"])
+        uniform = records_to_dataframe([{"id": 1, "score": 0.5}, {"id": 2, "score": 1.0}])
+        self.assertEqual(str(uniform["id"].dtype), "int64")
+        self.assertEqual(str(uniform["score"].dtype), "float64")
+
+    def test_json_projection_and_predicates(self):
+        records = [
+            {"id": 1, "name": "a", "address": {"city": "Manila", "geo": {"lat": 1.0}}, "blob": {"x": 1}},
+            {"id": 2, "name": "b", "address": {"city": "Cebu"}},
+            {"id": 3, "address": "unknown"},
+            {"id": 4, "name": "d", "address": {"city": "Manila", "geo": {"lat": 4.0}}},
+        ]
+        df = json_to_dataframe(records, fields=["name", "address.geo", "missing"], where=("id", ">=", 2))
+        self.assertEqual(df.columns.tolist(), ["name", "address.geo.lat", "missing"])
+        self.assertEqual(df["name"].tolist()[::2], ["b", "d"])
+        self.assertEqual(df["address.geo.lat"].tolist()[2], 4.0)
+        self.assertTrue(df["missing"].isna().all())
+
+        manila = json_to_dataframe(records, where=[("address.city", "==", "Manila"), ("name", "notnull")])
+        self.assertEqual(manila["id"].tolist(), [1, 4])
+        self.assertIn("blob.x", manila.columns)
+        cities = json_to_dataframe(records, fields=["id"], where=lambda record: record["id"] % 2 == 0)
+        self.assertEqual(cities.to_dict("list"), {"id": [2, 4]})
+        with self.assertRaises(ValueError):
+            json_to_dataframe(records, where=("id", "~", 1))
+
+        streamed = json_file_to_dataframe(self.temp_json.name, fields=["Details.Age"], where=("Name", "==", "Bob"))
+        self.assertEqual(streamed.to_dict("list"), {"Details.Age": ["30"]})
+
+    def test_ndjson_to_dataframe(self):
+        lines = [json.dumps({"id": i, "user": {"name": f"u{i}", "age": i % 50}}) for i in range(200)]
+        lines[42] = '{"id": 42,'
+        lines[99] = "[1, 2, 3]"
+        temp_ndjson = tempfile.NamedTemporaryFile(delete=False, suffix=".ndjson", mode='w', encoding='utf-8')
+        temp_ndjson.write("\n".join(lines))
+        temp_ndjson.close()
+        self.addCleanup(os.unlink, temp_ndjson.name)
+
+        streamed_rejects, parallel_rejects = [], []
+        streamed = ndjson_to_dataframe(temp_ndjson.name, rejects=streamed_rejects)
+        parallel = ndjson_to_dataframe(temp_ndjson.name, workers=3, rejects=parallel_rejects, chunk_bytes=1024)
+        self.assertEqual(streamed.shape, (198, 3))
+        pd.testing.assert_frame_equal(parallel, streamed)
+        self.assertEqual([reject["line"] for reject in parallel_rejects], [43, 100])
+        self.assertEqual(parallel_rejects, streamed_rejects)
+
+        projected = ndjson_to_dataframe(
+            temp_ndjson.name, workers=2, fields=["user.name"], where=("user.age", "<", 2), chunk_bytes=1024
+        )
+        self.assertEqual(projected.columns.tolist(), ["user.name"])
+        self.assertEqual(projected["user.name"].tolist()[:3], ["u0", "u1", "u50"])
+        with self.assertRaises(json.JSONDecodeError):
+            ndjson_to_dataframe(temp_ndjson.name, safe=False)
+
     # -------------------------
     # XML tests
     # -------------------------
@@ -80,6 +182,51 @@ class TestTransformer(unittest.TestCase):
         self.assertIn("Name", df.columns)
         self.assertEqual(df.shape[0], 2)
 
+    def test_xml_to_dataframe_streaming(self):
+        df = xml_to_dataframe(self.temp_xml.name, record_tag="Person", streaming=True)
+        expected = xml_to_dataframe(self.temp_xml.name, record_tag="Person")
+        pd.testing.assert_frame_equal(df, expected)
+
+    def test_xml_streaming_record_paths(self):
+        temp_xml = tempfile.NamedTemporaryFile(delete=False, suffix=".xml", mode='w', encoding='utf-8')
+        temp_xml.write(
+            '<root xmlns:n="http://example.com/ns"><items><item><id>1</id></item><item><id>2</id></item></items>'
+            '<item><id>3</id></item><group><items><item><id>4</id></item></items></group>'
+            '<n:item><id>5</id></n:item></root>'
+        )
+        temp_xml.close()
+        self.addCleanup(os.unlink, temp_xml.name)
+        for record_tag in ("items/item", "./items/item", ".//item", ".//items/item", "{http://example.com/ns}item"):
+            expected = xml_to_dataframe(temp_xml.name, record_tag)
+            self.assertGreater(len(expected), 0, record_tag)
+            streamed = xml_to_dataframe(temp_xml.name, record_tag, streaming=True)
+            pd.testing.assert_frame_equal(streamed, expected, obj=record_tag)
+        self.assertEqual(
+            [len(chunk) for chunk in xml_to_dataframe_chunks(temp_xml.name, ".//item", chunk_size=3)], [3, 1]
+        )
+        for record_tag in ("*", "item[1]", "items//item", "../item", "item/@id", ""):
+            with self.assertRaises(ValueError, msg=record_tag):
+                xml_to_dataframe(temp_xml.name, record_tag, streaming=True)
+
+    def test_xml_projection_and_predicates(self):
+        for streaming in (False, True):
+            df = xml_to_dataframe(
+                self.temp_xml.name, "Person", streaming=streaming, fields=["Email", "Name"], where=("Age", ">", 26)
+            )
+            self.assertEqual(df.to_dict("list"), {"Email": ["bob@test.com"], "Name": ["Bob"]})
+        none = xml_to_dataframe(self.temp_xml.name, "Person", fields=["Name"], where=("Age", "in", ["99"]))
+        self.assertEqual((none.shape, none.columns.tolist()), ((0, 1), ["Name"]))
+
+    def test_xml_to_dataframe_chunks(self):
+        people = "".join(f"<Person><Name>P{i}</Name><Age>{i}</Age></Person>" for i in range(5))
+        temp_xml = tempfile.NamedTemporaryFile(delete=False, suffix=".xml", mode='w', encoding='utf-8')
+        temp_xml.write(f"<People>{people}<Meta><Person><Name>nested</Name></Person></Meta></People>")
+        temp_xml.close()
+        chunks = list(xml_to_dataframe_chunks(temp_xml.name, record_tag="Person", chunk_size=2))
+        os.unlink(temp_xml.name)
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        self.assertEqual(chunks[2]["Name"].iloc[0], "P4")
+
     # -------------------------
     # Column and transformation tests
     # -------------------------
@@ -98,6 +245,38 @@ class TestTransformer(unittest.TestCase):
         self.assertEqual(df_transformed["Age"].iloc[0], 26)
         self.assertEqual(df_transformed["Age"].iloc[1], 31)
 
+    def test_transform_dataframe_vectorized(self):
+        df = pd.DataFrame({
+            "Name": [" alice ", "BOB"],
+            "Age": ["25", "x"],
+            "Score": [4.0, 9.0],
+            "Phone": ["(555) 123", "555-999"],
+            "Country": ["PH", "US"],
+        })
+        transformations = {
+            "Name": ["str.strip", "str.title"],
+            "Age": to_numeric(errors="coerce"),
+            "Score": [np.sqrt, arithmetic("*", 10)],
+            "Phone": regex_replace(r"\D", ""),
+            "Country": {"PH": "Philippines"},
+        }
+        df = transform_dataframe(df, transformations)
+        self.assertEqual(list(df["Name"]), ["Alice", "Bob"])
+        self.assertEqual(df["Age"].iloc[0], 25)
+        self.assertTrue(pd.isna(df["Age"].iloc[1]))
+        self.assertEqual(list(df["Score"]), [20.0, 30.0])
+        self.assertEqual(list(df["Phone"]), ["555123", "555999"])
+        self.assertEqual(list(df["Country"]), ["Philippines", "US"])
+
+    def test_explain_transformations(self):
+        report = explain_transformations({
+            "Name": "str.upper",
+            "Age": int,
+            "Score": [np.log1p, lambda x: x + 1],
+            "Date": "to_datetime",
+        })
+        self.assertEqual(report, {"Name": "vectorized", "Age": "apply", "Score": "apply", "Date": "vectorized"})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 import pandas as pd
-from src.validator import validate_required_fields, validate_field_types, validate_dataframe
+from src.validator import validate_required_fields, validate_field_types, validate_dataframe, validate_rows
 
 class TestValidator(unittest.TestCase):
     """Unit tests for validator.py"""
@@ -61,6 +61,41 @@ class TestValidator(unittest.TestCase):
         self.assertEqual(len(df_valid), 2)
         self.assertTrue(pd.api.types.is_integer_dtype(df_valid["Age"]))
 
+    # -------------------------
+    # Test row-level validation
+    # -------------------------
+    def test_validate_rows_splits_rejects(self):
+        """Should keep clean rows and record which rule each bad row failed"""
+        df = pd.DataFrame({
+            "ID": ["1", "2", "2", "4", "5"],
+            "Age": ["25", "thirty", "40", "200", None],
+            "Email": ["a@test.com", "b@test.com", "c@test.com", "bad", "e@test.com"],
+        })
+        clean, rejects = validate_rows(
+            df,
+            required_fields=["Age"],
+            field_types={"ID": int, "Age": "int"},
+            ranges={"Age": (0, 120)},
+            patterns={"Email": r"[^@]+@[^@]+\.\w+"},
+            unique=["ID"],
+        )
+        self.assertEqual(list(clean.index), [0])
+        self.assertTrue(pd.api.types.is_integer_dtype(clean["Age"]))
+        failed = list(rejects[["row", "rule"]].itertuples(index=False, name=None))
+        self.assertEqual(failed, [(1, "type"), (2, "unique"), (3, "range"), (3, "pattern"), (4, "required")])
+
+    def test_validate_rows_missing_column(self):
+        """Should raise ValueError if a rule references a missing column"""
+        with self.assertRaises(ValueError):
+            validate_rows(self.df, field_types={"Salary": float})
+
+    def test_validate_rows_all_clean(self):
+        """Should return an empty rejects frame when every row passes"""
+        clean, rejects = validate_rows(self.df, field_types={"Age": float})
+        self.assertEqual(len(clean), 3)
+        self.assertTrue(rejects.empty)
+        self.assertEqual(list(rejects.columns), ["row", "field", "rule", "value"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,199 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from src.main import load_config
+from src.manifest import FileManifest
+from src.watcher import FolderWatcher
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _slow_handler(input_path, config):
+    from src.main import process_file
+    time.sleep(0.2)
+    return process_file(input_path, config)
+
+
+def _crash_on_crash(input_path, config):
+    # Simulates a worker killed by the OOM killer or a segfault.
+    from src.main import process_file
+    if "crash" in os.path.basename(input_path):
+        os._exit(1)
+    return process_file(input_path, config)
+
+
+class TestFolderWatcher(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.input_dir = os.path.join(self.temp_dir.name, "input")
+        self.output_dir = os.path.join(self.temp_dir.name, "output")
+        os.makedirs(self.input_dir)
+        self.config = load_config(None)
+        self.config["input"]["directory"] = self.input_dir
+        self.config["output"]["directory"] = self.output_dir
+        self.config["workers"] = 2
+        self.config["executor"] = "thread"
+        self.config["watch"].update(poll_interval=0.05, settle_seconds=0.1, queue_size=2)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _drop(self, name, rows=2, rename=True):
+        # Write-then-rename, the way producers should deliver files
+        path = os.path.join(self.input_dir, name)
+        temp_path = path + ".part"
+        with open(temp_path if rename else path, "w", encoding="utf-8") as f:
+            json.dump([{"Name": f"{name}-{i}"} for i in range(rows)], f)
+        if rename:
+            os.rename(temp_path, path)
+
+    def _wait_for(self, predicate, timeout=10):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if predicate():
+                return True
+            time.sleep(0.02)
+        return False
+
+    def _outputs(self):
+        return sorted(name for name in os.listdir(self.output_dir) if name.endswith(".csv")) \
+            if os.path.isdir(self.output_dir) else []
+
+    def _start(self, watcher):
+        result = {}
+        thread = threading.Thread(target=lambda: result.update(watcher.run()))
+        thread.start()
+        return thread, result
+
+    # -------------------------
+    # Detection
+    # -------------------------
+    def test_processes_existing_and_new_files(self):
+        for mode in ("poll", "auto"):
+            with self.subTest(mode=mode):
+                self.config["watch"]["mode"] = mode
+                self._drop(f"existing_{mode}.json")
+                watcher = FolderWatcher(self.config)
+                thread, result = self._start(watcher)
+                self.assertTrue(self._wait_for(lambda: f"existing_{mode}.csv" in self._outputs()))
+                self._drop(f"new_{mode}.json")
+                self._drop(f"plain_{mode}.json", rename=False)
+                self.assertTrue(self._wait_for(lambda: {f"new_{mode}.csv", f"plain_{mode}.csv"} <= set(self._outputs())))
+                watcher.stop()
+                thread.join(10)
+                self.assertFalse(thread.is_alive())
+                self.assertEqual(result["failed"], 0)
+
+    def test_growing_file_waits_until_stable(self):
+        self.config["watch"].update(mode="poll", settle_seconds=0.5)
+        watcher = FolderWatcher(self.config)
+        thread, _ = self._start(watcher)
+        path = os.path.join(self.input_dir, "growing.json")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write('[{"Name": "a"}')
+            f.flush()
+            time.sleep(0.3)
+            self.assertEqual(self._outputs(), [])
+            f.write(', {"Name": "b"}]')
+        self.assertTrue(self._wait_for(lambda: self._outputs() == ["growing.csv"]))
+        watcher.stop()
+        thread.join(10)
+        self.assertEqual(watcher.failed, 0)
+
+    # -------------------------
+    # Backpressure and draining
+    # -------------------------
+    def test_stop_drains_queue_and_skips_unchanged_on_restart(self):
+        self.config["watch"]["mode"] = "poll"
+        for i in range(8):
+            self._drop(f"batch_{i}.json")
+        watcher = FolderWatcher(self.config, handler=_slow_handler)
+        thread, result = self._start(watcher)
+        self.assertTrue(self._wait_for(lambda: watcher.queue.full()))
+        watcher.stop()
+        thread.join(10)
+        self.assertLessEqual(result["processed"], 8)
+        self.assertEqual(len(self._outputs()), result["processed"])
+
+        watcher = FolderWatcher(self.config)
+        thread, result = self._start(watcher)
+        self.assertTrue(self._wait_for(lambda: len(self._outputs()) == 8))
+        self.assertTrue(self._wait_for(lambda: watcher.processed + watcher.skipped == 8))
+        watcher.stop()
+        thread.join(10)
+        self.assertEqual(result["processed"] + result["skipped"], 8)
+
+    def test_manifest_saves_are_batched_and_queued_is_pruned(self):
+        self.config["watch"].update(mode="poll", queue_size=20, manifest_save_interval=60)
+        for i in range(6):
+            self._drop(f"burst_{i}.json")
+        saves = []
+        save = FileManifest.save
+        with mock.patch.object(FileManifest, "save", autospec=True,
+                               side_effect=lambda manifest: saves.append(save(manifest))):
+            watcher = FolderWatcher(self.config)
+            thread, result = self._start(watcher)
+            self.assertTrue(self._wait_for(lambda: watcher.processed == 6))
+            time.sleep(0.3)  # a few more polls must not queue the recorded files again
+            self.assertEqual(watcher._queued, {})
+            self.assertEqual(saves, [])
+            watcher.stop()
+            thread.join(10)
+        self.assertEqual(len(saves), 1)  # saved once, on drain
+        self.assertEqual((result["processed"], result["skipped"]), (6, 0))
+        self.assertEqual(len(FileManifest(watcher._manifest.manifest_path).entries), 6)
+
+    def test_keeps_dispatching_after_a_worker_dies(self):
+        self.config["executor"] = "process"
+        self.config["workers"] = 1
+        self.config["watch"].update(mode="poll", queue_size=20)
+        watcher = FolderWatcher(self.config, handler=_crash_on_crash)
+        thread, result = self._start(watcher)
+        self._drop("crash_0.json")
+        self.assertTrue(self._wait_for(lambda: watcher.failed >= 1))
+        for i in range(3):
+            self._drop(f"after_{i}.json")
+        self.assertTrue(self._wait_for(lambda: watcher.processed == 3))
+        watcher.stop()
+        thread.join(10)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual((result["processed"], result["failed"]), (3, 1))
+        self.assertEqual(len(FileManifest(watcher._manifest.manifest_path).entries), 3)
+
+    def test_sigterm_drains_and_exits(self):
+        config_path = os.path.join(self.temp_dir.name, "config.json")
+        with open(config_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "input": {"directory": self.input_dir},
+                "output": {"directory": self.output_dir},
+                "workers": 1,
+                "watch": {"poll_interval": 0.05, "settle_seconds": 0.1},
+                "log_level": "WARNING",
+            }, f)
+        process = subprocess.Popen(
+            [sys.executable, os.path.join(REPO_ROOT, "src", "main.py"), "--config", config_path, "--watch"],
+            cwd=self.temp_dir.name, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        )
+        try:
+            self._drop("signal.json")
+            self.assertTrue(self._wait_for(lambda: self._outputs() == ["signal.csv"], timeout=30))
+            process.send_signal(signal.SIGTERM)
+            stdout, _ = process.communicate(timeout=30)
+        finally:
+            if process.poll() is None:
+                process.kill()
+        self.assertEqual(process.returncode, 0)
+        self.assertIn("1 processed", stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()